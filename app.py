@@ -6,7 +6,6 @@ from flask_login import LoginManager, login_required, current_user
 from flask_babel import Babel
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
-from flask_caching import Cache
 from flask_wtf.csrf import CSRFProtect
 from dotenv import load_dotenv
 from datetime import datetime
@@ -14,8 +13,14 @@ from extensions import limiter, cache, csrf   # ← import from neutral module
 from blueprints.chatbot.routes import chatbot_bp
 
 from config import config
-from database import init_neo4j, get_neo4j_db, safe_run, _node_to_dict
+from database import init_neo4j, get_neo4j_db, safe_run, _node_to_dict, read
 from models import User
+from migrations import run_migrations, register_cli as register_migrations_cli
+from gemini_client import init_gemini
+from retrieval_index import init_app as init_retrieval_index
+from chat_history import init_app as init_chat_history
+from realtime import init_app as init_realtime
+from notification_writer import init_app as init_notification_writer
 
 # Load environment variables
 load_dotenv()
@@ -51,10 +56,6 @@ limiter = Limiter(
     key_func=get_remote_address,
     storage_uri="memory://"  # Use in-memory storage
 )
-cache = Cache(config={
-    "CACHE_TYPE": "SimpleCache",  # Simple in-memory cache
-    "CACHE_DEFAULT_TIMEOUT": 300  # Default timeout of 5 minutes
-})
 csrf = CSRFProtect()
 
 def init_csrf(app):
@@ -79,27 +80,24 @@ def load_user(user_id):
         return None
 
     try:
-        db = get_neo4j_db()
-        with db.session() as session:
-            result = safe_run(
-                session,
-                """
-                MATCH (u:User)
-                WHERE u.id = $user_id
-                RETURN u
-                """,
-                {"user_id": user_id}
-            )
+        result = read(
+            """
+            MATCH (u:User)
+            WHERE u.id = $user_id
+            RETURN u
+            """,
+            {"user_id": user_id}
+        )
 
-            if not result:
-                logger.warning(f"No user found with ID {user_id}")
-                return None
+        if not result:
+            logger.warning(f"No user found with ID {user_id}")
+            return None
 
-            node = result[0]["u"]               # raw Neo4j node
-            user_data = {k: v for k, v in node.items()}  # turn properties into dict
-            user = User(**user_data)
-            logger.info(f"User loaded: {user.email} (ID: {user.id}, Role: {user.role})")
-            return user
+        node = result[0]["u"]               # raw Neo4j node
+        user_data = {k: v for k, v in node.items()}  # turn properties into dict
+        user = User(**user_data)
+        logger.info(f"User loaded: {user.email} (ID: {user.id}, Role: {user.role})")
+        return user
 
     except Exception as e:
         logger.error(f"Error loading user {user_id}: {str(e)}", exc_info=True)
@@ -153,6 +151,7 @@ def create_app(config_name='default'):
     
     # Initialize database
     init_neo4j(app)
+    register_migrations_cli(app)
     
     # Import blueprints
     from blueprints.admin import admin_bp
@@ -236,6 +235,21 @@ def create_app(config_name='default'):
     # Safe to create the driver now (real worker process)
     # ------------------------------------------------------------------
     init_neo4j(app)
+    init_gemini(app)
+    init_retrieval_index(app)
+    init_chat_history(app)
+    init_realtime(app)
+    init_notification_writer(app)
+    
+    # Bring constraints and indexes up to date before serving traffic
+    if app.config.get('NEO4J_AUTO_MIGRATE'):
+        with app.app_context():
+            try:
+                applied = run_migrations(get_neo4j_db())
+                if applied:
+                    app.logger.info(f"Applied schema migrations: {applied}")
+            except Exception as e:
+                app.logger.warning(f"Schema migrations skipped: {e}")
     
     # Create admin account if not exists
     with app.app_context():
@@ -0,0 +1,228 @@
+"""
+Latency benchmark for the AI endpoints, against the offline Gemini backend.
+
+Runs every scenario with GEMINI_BACKEND=fake (gemini_fake.py), so no API key
+or quota is used, and drives it from --concurrency threads. Inputs are drawn
+with a skewed distribution, as real traffic repeats popular categories and
+queries, which is what exercises the response cache and single-flight.
+Per scenario it reports throughput, p50/p95/p99 latency, how many requests
+were answered, refused by the rate governor or failed, and how many calls
+reached the (fake) API, were cache hits, were coalesced or were rejected by
+the governor (calls, including retries).
+
+By default each scenario replays its endpoint's Gemini call path in-process
+(same client function, caching and governor priority). With --app the real
+endpoints are requested through the Flask test client instead; that needs
+Neo4j running and --user-id of an existing job seeker to log in as.
+
+Usage:
+    python benchmarks/bench_ai_endpoints.py [--requests 200] [--concurrency 16]
+        [--latency-ms 300] [--jitter-ms 200] [--error-429 0] [--error-503 0]
+        [--safety 0] [--rate-per-minute 6000] [--no-cache] [--app --user-id ID]
+        [--scenarios chatbot registration-tips ...] [--verbose]
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ['GEMINI_BACKEND'] = 'fake'
+
+from seed import CATEGORIES, JOB_TITLES, LOCATIONS
+
+import gemini_client
+from gemini_cache import response_cache
+from gemini_client import GeminiChat, GeminiError, get_gemini_response, single_flight
+from gemini_fake import fake_client
+from gemini_governor import PRIORITY_BACKGROUND, governor
+from resume_ai import run_batch
+
+# Replies that mean the request was not answered
+REFUSED = ("Too many requests", "busy right now")
+FAILED = ("temporarily unavailable", "unable to generate", "Unable to generate", "error occurred",
+          "having trouble", "Unable to process", "incomplete answer")
+
+with open(os.path.join(ROOT, 'benchmarks', 'chat_messages.txt'), encoding='utf-8') as f:
+    CHAT_MESSAGES = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+
+RESUMES = [f"{title}\nSkills: customer service, {category}\nLocation: {location}"
+           for title, category, location in zip(JOB_TITLES, CATEGORIES * 5, LOCATIONS * 5)]
+
+
+def _chat(message):
+    return GeminiChat().send_message(message)
+
+
+def _resume_batch(resume):
+    results, errors = run_batch(['analysis', 'suggestions', 'completion'], resume=resume)
+    if not results:
+        raise GeminiError(next(iter(errors.values())))
+    return 'ok'
+
+
+# name -> (inputs, in-process call, (method, path, json body) for --app)
+SCENARIOS = {
+    'registration-tips': (
+        CATEGORIES,
+        lambda v: get_gemini_response(f"Give 5 tips for registering a {v} business.", priority=PRIORITY_BACKGROUND),
+        lambda v: ('POST', '/gemini/registration-tips', {'category': v, 'language': 'English'})),
+    'improve-description': (
+        JOB_TITLES,
+        lambda v: get_gemini_response(f"Improve this business description: We hire {v}s.", use_cache=False),
+        lambda v: ('POST', '/gemini/improve-business-description',
+                   {'description': f"We hire {v}s.", 'category': 'Services'})),
+    'ai-search': (
+        JOB_TITLES,
+        lambda v: get_gemini_response(f'The user is searching for jobs with this query: "{v}"',
+                                      temperature=0.3, priority=PRIORITY_BACKGROUND),
+        lambda v: ('GET', f"/jobs/api/ai-search?q={v}", None)),
+    'location-suggest': (
+        LOCATIONS,
+        lambda v: get_gemini_response(f'User\'s location search query: "{v}"', priority=PRIORITY_BACKGROUND),
+        lambda v: ('POST', '/api/location/ai-suggest-locations', {'query': v})),
+    'chatbot': (
+        CHAT_MESSAGES,
+        _chat,
+        lambda v: ('POST', '/chatbot/message', {'message': v})),
+    'resume-batch': (
+        RESUMES,
+        _resume_batch,
+        lambda v: ('POST', '/jobs/resume-ai-batch',
+                   {'analyses': ['analysis', 'suggestions', 'completion'], 'resume': v})),
+}
+
+
+def outcome(text):
+    if any(marker in text for marker in REFUSED):
+        return 'refused'
+    if any(marker in text for marker in FAILED):
+        return 'failed'
+    return 'ok'
+
+
+def direct_request(call):
+    def request(value):
+        try:
+            return outcome(str(call(value)))
+        except GeminiError as e:
+            return outcome(str(e)) if outcome(str(e)) == 'refused' else 'failed'
+    return request
+
+
+def app_request(app, user_id, spec):
+    local = threading.local()
+
+    def request(value):
+        if not hasattr(local, 'client'):
+            local.client = app.test_client()
+            with local.client.session_transaction() as session:
+                session['_user_id'] = user_id
+                session['_fresh'] = True
+        method, path, body = spec(value)
+        response = local.client.open(path, method=method, json=body)
+        if response.status_code != 200:
+            return 'refused' if response.status_code in (429, 503) else 'failed'
+        return outcome(response.get_data(as_text=True))
+    return request
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_scenario(request, inputs, args, rng):
+    weights = [1 / (rank + 1) for rank in range(len(inputs))]
+    values = rng.choices(inputs, weights=weights, k=args.requests)
+    latencies, outcomes = [], []
+    lock = threading.Lock()
+
+    def timed(value):
+        start = time.perf_counter()
+        result = request(value)
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed * 1000)
+            outcomes.append(result)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(timed, values))
+    wall = time.perf_counter() - start
+    latencies.sort()
+    return {
+        'throughput': len(values) / wall,
+        'p50': percentile(latencies, 0.50),
+        'p95': percentile(latencies, 0.95),
+        'p99': percentile(latencies, 0.99),
+        **{name: outcomes.count(name) for name in ('ok', 'refused', 'failed')},
+    }
+
+
+def reset(args):
+    fake_client.configure(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_429=args.error_429,
+                          error_503=args.error_503, safety_block=args.safety, retry_delay=1, seed=args.seed)
+    response_cache.configure(enabled=not args.no_cache)
+    governor.configure(rate_per_minute=args.rate_per_minute, burst=args.burst, cooldown=1, max_cooldown=5)
+    governor.reset()
+    return dict(single_flight.stats())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--latency-ms', type=float, default=300)
+    parser.add_argument('--jitter-ms', type=float, default=200)
+    parser.add_argument('--error-429', type=float, default=0.0)
+    parser.add_argument('--error-503', type=float, default=0.0)
+    parser.add_argument('--safety', type=float, default=0.0)
+    parser.add_argument('--rate-per-minute', type=float, default=6000,
+                        help='governor budget; the production default is 30')
+    parser.add_argument('--burst', type=int, default=100)
+    parser.add_argument('--no-cache', action='store_true')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--app', action='store_true', help='request the real endpoints (needs Neo4j)')
+    parser.add_argument('--user-id', help='existing job seeker to log in as with --app')
+    parser.add_argument('--scenarios', nargs='+', choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument('--verbose', action='store_true', help='show the app log (injected errors are logged)')
+    args = parser.parse_args()
+    if not args.verbose:
+        logging.disable(logging.CRITICAL)
+
+    app = None
+    if args.app:
+        if not args.user_id:
+            parser.error('--app needs --user-id')
+        from app import create_app
+        app = create_app('development')
+        app.config.update({'WTF_CSRF_ENABLED': False, 'RATELIMIT_ENABLED': False})
+    gemini_client._client_settings['backend'] = 'fake'
+
+    print(f"{args.requests} requests per scenario, {args.concurrency} threads, fake latency "
+          f"{args.latency_ms:g}+{args.jitter_ms:g} ms, 429/503/safety {args.error_429:g}/{args.error_503:g}/"
+          f"{args.safety:g}, governor {args.rate_per_minute:g}/min, cache {'off' if args.no_cache else 'on'}\n")
+    print(f"{'scenario':<20} {'req/s':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'ok':>5} {'refused':>8} "
+          f"{'failed':>7} {'api':>5} {'cached':>7} {'coalesced':>10} {'rejected':>9}")
+    for name in args.scenarios:
+        inputs, call, spec = SCENARIOS[name]
+        flights = reset(args)
+        request = app_request(app, args.user_id, spec) if app else direct_request(call)
+        result = run_scenario(request, inputs, args, random.Random(args.seed))
+        cache = response_cache.stats()
+        coalesced = single_flight.stats()['shared'] - flights['shared']
+        print(f"{name:<20} {result['throughput']:>7.1f} {result['p50']:>8.0f} {result['p95']:>8.0f} "
+              f"{result['p99']:>8.0f} {result['ok']:>5} {result['refused']:>8} {result['failed']:>7} "
+              f"{fake_client.stats()['calls']:>5} {cache['memory_hits'] + cache['disk_hits']:>7} "
+              f"{coalesced:>10} {sum(governor.snapshot()['rejects'].values()):>9}")
+
+
+if __name__ == '__main__':
+    main()
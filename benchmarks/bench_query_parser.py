@@ -0,0 +1,123 @@
+"""
+Benchmark for the chatbot query parser in query_parser.py.
+
+Parses a corpus of chat messages (benchmarks/chat_messages.txt by default)
+with the previous regex-based GeminiChat.extract_search_params and with
+parse_query, and reports parse time, how often a real municipality was
+recognised, and the context hit rate against listings shaped like seed.py's
+data: the legacy path runs its whole-query CONTAINS match, the new one a
+retrieval-index lookup with the parsed filters.
+
+Usage:
+    python benchmarks/bench_query_parser.py [--messages FILE] [--repeat 200]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from seed import BUSINESS_NAMES, CATEGORIES, JOB_TITLES, LOCATIONS
+
+from blueprints.api.location_search import CATANDUANES_LOCATIONS
+from query_parser import has_filters, parse_query, search_kinds
+from retrieval_index import BUSINESS, JOB, RetrievalIndex
+
+
+def legacy_extract_search_params(message):
+    """GeminiChat.extract_search_params as it was before query_parser"""
+    params = {}
+    for pattern in [r"category[:\s]+(\w+)", r"in the (\w+) category", r"related to (\w+)", r"about (\w+)"]:
+        match = re.search(pattern, message.lower())
+        if match:
+            params["category"] = match.group(1)
+            break
+    for pattern in [r"in\s+(\w+(?:\s+\w+)*(?:\s+City)?)", r"at\s+(\w+(?:\s+\w+)*(?:\s+City)?)",
+                    r"near\s+(\w+(?:\s+\w+)*(?:\s+City)?)", r"around\s+(\w+(?:\s+\w+)*(?:\s+City)?)"]:
+        match = re.search(pattern, message)
+        if match:
+            params["location"] = match.group(1)
+            break
+    query = message
+    if "category" in params:
+        query = re.sub(r"category[:\s]+" + params["category"], "", query, flags=re.IGNORECASE)
+    if "location" in params:
+        query = re.sub(r"in\s+" + params["location"], "", query, flags=re.IGNORECASE)
+    params["query"] = query.strip()
+    return params
+
+
+def build_listings(rng):
+    """One business per seeded name with a handful of jobs, as seed.py creates"""
+    listings = []
+    for i, name in enumerate(BUSINESS_NAMES):
+        category, location = rng.choice(CATEGORIES), rng.choice(LOCATIONS)
+        listings.append((f"business:{i}", BUSINESS, {
+            'name': name, 'category': category, 'location': location,
+            'description': f"{name} is a {category} business in {location}, Catanduanes."}))
+        for title in rng.sample(JOB_TITLES, 5):
+            listings.append((f"job:{i}:{title}", JOB, {
+                'title': title, 'company_name': name, 'category': category, 'location': location,
+                'description': f"{name} is hiring a {title} in {location}."}))
+    return listings
+
+
+def legacy_hit(listings, params):
+    query = params['query'].lower()
+    location = (params.get('location') or '').lower()
+    category = (params.get('category') or '').lower()
+    for _, _, doc in listings:
+        text = ' '.join(str(doc.get(field) or '') for field in ('title', 'name', 'description')).lower()
+        if query in text and location in doc['location'].lower() and category in doc['category'].lower():
+            return True
+    return False
+
+
+def new_hit(index, params):
+    if not has_filters(params):
+        return False
+    kinds = [kind for kind in (search_kinds(params) or (JOB, BUSINESS)) if kind in (JOB, BUSINESS)]
+    return any(index.search(params['query'], kind, 3, params['location'], params['categories']) for kind in kinds)
+
+
+def time_parser(fn, messages, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for message in messages:
+            fn(message)
+    return (time.perf_counter() - start) / (repeat * len(messages)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--messages', default=os.path.join(ROOT, 'benchmarks', 'chat_messages.txt'))
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    with open(args.messages, encoding='utf-8') as f:
+        messages = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    listings = build_listings(random.Random(42))
+    index = RetrievalIndex()
+    for doc_id, kind, doc in listings:
+        index.add(doc_id, kind, ' '.join(str(v) for v in doc.values()), doc)
+    towns = {town.lower() for town in CATANDUANES_LOCATIONS.values()}
+    parse_query('warm up')
+
+    print(f"{len(messages)} messages, {len(listings)} listings\n")
+    print(f"{'parser':<10} {'us/message':>10} {'town found':>11} {'context hit':>12}")
+    for name, fn, hit in (('legacy', legacy_extract_search_params, lambda p: legacy_hit(listings, p)),
+                          ('vocabulary', parse_query, lambda p: new_hit(index, p))):
+        parsed = [fn(message) for message in messages]
+        towns_found = sum((p.get('location') or '').lower() in towns for p in parsed)
+        hits = sum(hit(p) for p in parsed)
+        print(f"{name:<10} {time_parser(fn, messages, args.repeat):>10.1f} "
+              f"{towns_found / len(messages):>11.0%} {hits / len(messages):>12.0%}")
+
+
+if __name__ == '__main__':
+    main()
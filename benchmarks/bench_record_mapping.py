@@ -0,0 +1,117 @@
+"""
+Micro-benchmark for Neo4j record -> AttrDict mapping in database.py.
+
+Builds in-memory neo4j Node/Record objects (no server needed) and compares the
+previous _node_to_dict implementation with the current precompiled per-label
+mapper, plus the peak memory of safe_run() versus consuming stream_run().
+
+Usage:
+    python benchmarks/bench_record_mapping.py [--nodes 100000]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from neo4j import Record
+from neo4j.graph import Graph, Node
+from neo4j.time import DateTime
+
+from database import AttrDict, _node_to_dict, safe_run, stream_run
+
+
+def legacy_node_to_dict(node):
+    """_node_to_dict as it was before the per-label mapper"""
+    if not node:
+        return None
+    node_dict = dict(node)
+    from datetime import datetime
+    from neo4j.time import DateTime, Date, Time
+    for key, value in node_dict.items():
+        if isinstance(value, (DateTime, Date, Time, datetime)):
+            node_dict[key] = value.isoformat() if hasattr(value, 'isoformat') else str(value)
+    result = AttrDict(node_dict)
+    if 'id' not in result:
+        result['id'] = node.id
+    result['labels'] = list(node.labels)
+    if 'username' not in result:
+        if 'email' in result:
+            result['username'] = result['email'].split('@')[0]
+        elif 'first_name' in result:
+            result['username'] = result['first_name']
+        else:
+            result['username'] = f"user_{result.get('id', 'unknown')}"
+    return result
+
+
+def build_records(count):
+    """Alternate Job and User nodes shaped like the seeded data"""
+    graph = Graph()
+    created = DateTime(2025, 1, 1, 8, 30, 0)
+    records = []
+    for i in range(count):
+        if i % 2:
+            node = Node(graph, f"4:bench:{i}", i, ['User'], {
+                'id': f"user-{i}", 'email': f"user{i}@example.com", 'role': 'job_seeker',
+                'is_verified': True, 'created_at': created,
+            })
+        else:
+            node = Node(graph, f"4:bench:{i}", i, ['Job'], {
+                'id': f"job-{i}", 'title': f"Job {i}", 'description': 'x' * 200,
+                'category': 'technology', 'location': 'Virac', 'salary_min': 15000,
+                'salary_max': 25000, 'is_active': True, 'created_at': created.isoformat(),
+            })
+        records.append(Record([('n', node), ('business_name', 'Bench Co')]))
+    return records
+
+
+class _FakeSession:
+    def __init__(self, records):
+        self._records = records
+
+    def run(self, query, params):
+        return iter(self._records)
+
+
+def bench_mapping(name, fn, nodes):
+    start = time.perf_counter()
+    for node in nodes:
+        fn(node)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<28} {len(nodes) / elapsed:>12,.0f} nodes/sec")
+
+
+def bench_memory(name, consume, records):
+    start = time.perf_counter()
+    consume(_FakeSession(records))
+    elapsed = time.perf_counter() - start
+    # Second pass under tracemalloc, which would otherwise skew the timing
+    tracemalloc.start()
+    consume(_FakeSession(records))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<28} {len(records) / elapsed:>12,.0f} records/sec  peak {peak / 2**20:8.1f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--nodes', type=int, default=100_000)
+    args = parser.parse_args()
+
+    records = build_records(args.nodes)
+    nodes = [record['n'] for record in records]
+    print(f"{args.nodes:,} nodes\n")
+
+    bench_mapping('legacy _node_to_dict', legacy_node_to_dict, nodes)
+    bench_mapping('per-label _node_to_dict', _node_to_dict, nodes)
+    print()
+    bench_memory('safe_run (list)', lambda s: len(safe_run(s, 'bench')), records)
+    bench_memory('stream_run (generator)', lambda s: sum(1 for _ in stream_run(s, 'bench')), records)
+
+
+if __name__ == '__main__':
+    main()
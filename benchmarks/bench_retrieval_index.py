@@ -0,0 +1,106 @@
+"""
+Micro-benchmark for the chatbot context lookup in retrieval_index.py.
+
+Builds a synthetic corpus of jobs, businesses and services (no server needed)
+and compares a BM25 top-k lookup against a Python emulation of the three
+CONTAINS scans _get_relevant_data used to run in Neo4j per message. The scan
+matched the whole message as one substring, so besides being slower it rarely
+found anything; the hit rate of both is printed too. (The Neo4j round trips
+the index also saves are not part of these numbers.)
+
+The target is a top-k lookup (all three kinds) in under 1 ms; the script
+exits with status 1 when the BM25 lookup misses it.
+
+Usage:
+    python benchmarks/bench_retrieval_index.py [--docs 20000] [--queries 2000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+TARGET_US = 1000
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from retrieval_index import BUSINESS, JOB, SERVICE, RetrievalIndex
+
+WORDS = ('cook cashier driver teacher nurse developer welder farmer fisherman tour guide '
+         'accountant carpenter electrician mechanic baker barista sales clerk encoder '
+         'resort restaurant hardware pharmacy bakery school clinic office abaca copra').split()
+TOWNS = ('Virac', 'San Andres', 'Bato', 'Baras', 'Pandan', 'Caramoran', 'Viga', 'Gigmoto')
+
+
+def build_corpus(count, rng):
+    # Listing text mixes a few domain words with a long tail of rarer ones
+    tail = [f"w{i}" for i in range(5000)]
+    weights = [1 / (rank + 1) for rank in range(len(tail))]
+    corpus = []
+    for i in range(count):
+        kind = (JOB, BUSINESS, SERVICE)[i % 3]
+        title = ' '.join(rng.sample(WORDS, 2)).title()
+        description = ' '.join(rng.sample(WORDS, 3) + rng.choices(tail, weights, k=37))
+        corpus.append((f"{kind}:{i}", kind, title, description, rng.choice(TOWNS)))
+    return corpus
+
+
+def scan(corpus, query, k=3):
+    """toLower(title/description) CONTAINS toLower($query) ... LIMIT k, per kind"""
+    needle = query.lower()
+    results = []
+    for kind in (JOB, SERVICE, BUSINESS):
+        hits = 0
+        for _, doc_kind, title, description, _ in corpus:
+            if doc_kind == kind and (needle in title.lower() or needle in description.lower()):
+                results.append(title)
+                hits += 1
+                if hits == k:
+                    break
+    return results
+
+
+def bench(name, fn, queries):
+    found = 0
+    start = time.perf_counter()
+    for query in queries:
+        found += bool(fn(query))
+    per_lookup = (time.perf_counter() - start) / len(queries) * 1e6
+    print(f"{name:<28} {per_lookup:>9.1f} us/lookup  "
+          f"{found / len(queries):>6.1%} of queries got context")
+    return per_lookup
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--docs', type=int, default=20_000)
+    parser.add_argument('--queries', type=int, default=2_000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    corpus = build_corpus(args.docs, rng)
+    queries = [f"looking for {' '.join(rng.sample(WORDS, 2))} work in {rng.choice(TOWNS)}"
+               for _ in range(args.queries)]
+
+    start = time.perf_counter()
+    index = RetrievalIndex()
+    for doc_id, kind, title, description, town in corpus:
+        index.add(doc_id, kind, f"{title} {title} {description}", {'title': title, 'location': town})
+    index.prepare()
+    print(f"{args.docs:,} documents indexed in {time.perf_counter() - start:.2f}s\n")
+
+    bench('CONTAINS scan (3 kinds)', lambda q: scan(corpus, q), queries)
+    per_lookup = bench('BM25 top-3 (3 kinds)',
+                       lambda q: [r for kind in (JOB, SERVICE, BUSINESS) for r in index.search(q, kind, 3)],
+                       queries)
+    town = TOWNS[-1]
+    bench(f'BM25 top-3 in {town}',
+          lambda q: [r for kind in (JOB, SERVICE, BUSINESS) for r in index.search(q, kind, 3, town)], queries)
+    met = per_lookup < TARGET_US
+    print(f"\nTarget: top-3 in under {TARGET_US} us per lookup - {'met' if met else 'MISSED'}")
+    return 0 if met else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -7,6 +7,10 @@ from flask import Blueprint, render_template, request, jsonify, redirect, url_fo
 from flask_login import login_required, current_user
 from decorators import role_required
 from database import get_neo4j_db, safe_run, _node_to_dict
+from pagination import KeysetPager
+from extensions import cache
+from retrieval_index import index_business, index_job
+from cache_tags import invalidate_tags
 from datetime import datetime
 import os
 
@@ -15,6 +19,25 @@ admin_mgmt = Blueprint('admin_mgmt', __name__, url_prefix='/admin')
 
 admin_required = role_required('admin')
 
+# Sortable columns per management page. Text columns are coalesced so the
+# keyset comparison never meets a null; anything else falls back to created_at.
+_SORT_COLUMNS = {
+    'u': {'created_at': 'u.created_at', 'username': "coalesce(u.username, '')", 'email': "coalesce(u.email, '')"},
+    'j': {'created_at': 'j.created_at', 'title': "coalesce(j.title, '')", 'deadline': 'j.deadline'},
+    'b': {'created_at': 'b.created_at', 'name': "coalesce(b.name, '')", 'rating': 'coalesce(b.rating, 0)'},
+}
+
+
+def _management_pager(alias, sort_by, sort_order, per_page):
+    """Keyset pager for a management table; returns (pager, sort_by, sort_order)"""
+    columns = _SORT_COLUMNS[alias]
+    if sort_by not in columns:
+        sort_by = 'created_at'
+    sort_order = 'asc' if sort_order == 'asc' else 'desc'
+    direction = sort_order.upper()
+    pager = KeysetPager.from_request([(columns[sort_by], direction), (f"{alias}.id", direction)], per_page)
+    return pager, sort_by, sort_order
+
 # ============================================================================
 # HELPER FUNCTION - GET REAL-TIME STATS
 # ============================================================================
@@ -187,12 +210,11 @@ def users_management():
         total_users = total_result[0]['total'] if total_result else 0
         
         # Sort and paginate
-        sort_field = f"u.{sort_by}"
-        query += f" RETURN u ORDER BY {sort_field} {sort_order.upper()}"
-        query += f" SKIP {(page - 1) * per_page} LIMIT {per_page}"
-        
-        result = safe_run(session, query, params)
-        users = [record['u'] for record in (result or [])]
+        pager, sort_by, sort_order = _management_pager('u', sort_by, sort_order, per_page)
+        page = pager.page
+        result = safe_run(session, query + pager.where_and() + " RETURN u" + pager.key_column()
+                          + pager.order_by() + pager.limit_clause(), {**params, **pager.params})
+        users = [record['u'] for record in pager.paginate(result or [])]
     
     # Calculate pagination
     total_pages = (total_users + per_page - 1) // per_page
@@ -202,6 +224,7 @@ def users_management():
                          total_users=total_users,
                          current_page=page,
                          total_pages=total_pages,
+                         pager=pager,
                          search=search,
                          role_filter=role_filter,
                          status_filter=status_filter,
@@ -394,12 +417,11 @@ def jobs_management():
             total_jobs = total_result[0]['total'] if total_result else 0
             
             # Sort and paginate
-            sort_field = f"j.{sort_by}"
-            query += f" RETURN j ORDER BY {sort_field} {sort_order.upper()}"
-            query += f" SKIP {(page - 1) * per_page} LIMIT {per_page}"
-            
-            result = safe_run(session, query, params)
-            jobs = [record['j'] for record in (result or [])]
+            pager, sort_by, sort_order = _management_pager('j', sort_by, sort_order, per_page)
+            page = pager.page
+            result = safe_run(session, query + pager.where_and() + " RETURN j" + pager.key_column()
+                              + pager.order_by() + pager.limit_clause(), {**params, **pager.params})
+            jobs = [record['j'] for record in pager.paginate(result or [])]
             
             # Get categories for filter
             cat_result = safe_run(session, "MATCH (j:Job) WHERE j.category IS NOT NULL RETURN DISTINCT j.category as category")
@@ -431,6 +453,7 @@ def jobs_management():
                                  categories=categories,
                                  current_page=page,
                                  total_pages=total_pages,
+                                 pager=pager,
                                  search=search,
                                  category_filter=category_filter,
                                  employment_type_filter=employment_type_filter,
@@ -457,6 +480,8 @@ def delete_job(job_id):
             DETACH DELETE j
         """, {'job_id': job_id})
     
+    invalidate_tags('job:*', f'job:{job_id}')
+    index_job(job_id)
     flash('Job deleted successfully', 'success')
     return redirect(url_for('admin_mgmt.jobs_management'))
 
@@ -505,6 +530,8 @@ Catanduanes Connect Team""",
                 except Exception as e:
                     logger.error(f"Failed to send email notification: {e}")
     
+    invalidate_tags('job:*', f'job:{job_id}')
+    index_job(job_id)
     flash('Job approved successfully', 'success')
     return redirect(url_for('admin_mgmt.jobs_management'))
 
@@ -556,6 +583,8 @@ Catanduanes Connect Team""",
                 except Exception as e:
                     logger.error(f"Failed to send email notification: {e}")
     
+    invalidate_tags('job:*', f'job:{job_id}')
+    index_job(job_id)
     flash('Job rejected successfully', 'success')
     return redirect(url_for('admin_mgmt.jobs_management'))
 
@@ -573,6 +602,8 @@ def feature_job(job_id):
             SET j.is_featured = true, j.featured_at = datetime()
         """, {'job_id': job_id})
     
+    invalidate_tags('job:*', f'job:{job_id}')
+    index_job(job_id)
     flash('Job featured successfully', 'success')
     return redirect(url_for('admin_mgmt.jobs_management'))
 
@@ -590,6 +621,8 @@ def unfeature_job(job_id):
             SET j.is_featured = false, j.featured_at = null
         """, {'job_id': job_id})
     
+    invalidate_tags('job:*', f'job:{job_id}')
+    index_job(job_id)
     flash('Job unfeatured successfully', 'success')
     return redirect(url_for('admin_mgmt.jobs_management'))
 
@@ -654,7 +687,8 @@ def business_management():
                     query += " AND b.is_rejected = true"
             
             if featured_filter:
-                query += f" AND b.is_featured = {featured_filter == 'yes'}"
+                query += " AND b.is_featured = $featured"
+                params['featured'] = featured_filter == 'yes'
             
             # Count - build separate count query with WHERE clause before RETURN
             count_parts = query.split(' WHERE ', 1)
@@ -667,12 +701,11 @@ def business_management():
             total_businesses = total_result[0]['total'] if total_result else 0
             
             # Sort and paginate
-            sort_field = f"b.{sort_by}"
-            query += f" RETURN b ORDER BY {sort_field} {sort_order.upper()}"
-            query += f" SKIP {(page - 1) * per_page} LIMIT {per_page}"
-            
-            result = safe_run(session, query, params)
-            businesses = [record['b'] for record in (result or [])]
+            pager, sort_by, sort_order = _management_pager('b', sort_by, sort_order, per_page)
+            page = pager.page
+            result = safe_run(session, query + pager.where_and() + " RETURN b" + pager.key_column()
+                              + pager.order_by() + pager.limit_clause(), {**params, **pager.params})
+            businesses = [record['b'] for record in pager.paginate(result or [])]
             
             # Get categories for filter
             cat_result = safe_run(session, "MATCH (b:Business) WHERE b.category IS NOT NULL RETURN DISTINCT b.category as category")
@@ -701,6 +734,7 @@ def business_management():
                                  categories=categories,
                                  current_page=page,
                                  total_pages=total_pages,
+                                 pager=pager,
                                  search=search,
                                  category_filter=category_filter,
                                  status_filter=status_filter,
@@ -743,6 +777,8 @@ def edit_business(business_id):
             update_query = update_query.rstrip(',')
             safe_run(session, update_query, params)
             
+            invalidate_tags('business:*', f'business:{business_id}')
+            index_business(business_id)
             flash('Business updated successfully', 'success')
             return redirect(url_for('admin_mgmt.business_management'))
     
@@ -762,6 +798,8 @@ def delete_business(business_id):
             DETACH DELETE b
         """, {'business_id': business_id})
     
+    invalidate_tags('business:*', f'business:{business_id}', 'job:*')
+    index_business(business_id)
     flash('Business deleted successfully', 'success')
     return redirect(url_for('admin_mgmt.business_management'))
 
@@ -779,6 +817,8 @@ def approve_business(business_id):
             SET b.is_approved = true, b.is_rejected = false, b.approved_at = datetime(), b.approved_by = $admin_id
         """, {'business_id': business_id, 'admin_id': current_user.id})
     
+    invalidate_tags('business:*', f'business:{business_id}')
+    index_business(business_id)
     flash('Business approved successfully', 'success')
     return redirect(url_for('admin_mgmt.business_management'))
 
@@ -797,6 +837,8 @@ def reject_business(business_id):
             SET b.is_rejected = true, b.is_approved = false, b.rejected_at = datetime(), b.rejection_reason = $reason, b.rejected_by = $admin_id
         """, {'business_id': business_id, 'reason': reason, 'admin_id': current_user.id})
     
+    invalidate_tags('business:*', f'business:{business_id}')
+    index_business(business_id)
     flash('Business rejected successfully', 'success')
     return redirect(url_for('admin_mgmt.business_management'))
 
@@ -814,6 +856,8 @@ def feature_business(business_id):
             SET b.is_featured = true, b.featured_at = datetime()
         """, {'business_id': business_id})
     
+    invalidate_tags('business:*', f'business:{business_id}')
+    index_business(business_id)
     flash('Business featured successfully', 'success')
     return redirect(url_for('admin_mgmt.business_management'))
 
@@ -831,6 +875,8 @@ def unfeature_business(business_id):
             SET b.is_featured = false, b.featured_at = null
         """, {'business_id': business_id})
     
+    invalidate_tags('business:*', f'business:{business_id}')
+    index_business(business_id)
     flash('Business unfeatured successfully', 'success')
     return redirect(url_for('admin_mgmt.business_management'))
 
@@ -873,7 +919,6 @@ def verifications():
         query = """
             MATCH (u:User)-[:SUBMITTED]->(v:Verification)
             WHERE v.verification_status = $status
-            RETURN v, u
         """
         params = {'status': status_filter}
         
@@ -881,21 +926,16 @@ def verifications():
             query += " AND u.role = $user_type"
             params['user_type'] = user_type_filter
         
-        # Count - properly structured with WHERE before RETURN
-        count_query = """
-            MATCH (u:User)-[:SUBMITTED]->(v:Verification)
-            WHERE v.verification_status = $status
-        """
-        if user_type_filter:
-            count_query += " AND u.role = $user_type"
-        count_query += " RETURN COUNT(v) as total"
-        
-        total_result = safe_run(session, count_query, params)
+        # Count under the same filters
+        total_result = safe_run(session, query + " RETURN COUNT(v) as total", params)
         total = total_result[0]['total'] if total_result else 0
         
         # Paginate
-        query += f" SKIP {(page - 1) * per_page} LIMIT {per_page}"
-        result = safe_run(session, query, params)
+        pager = KeysetPager.from_request([('v.created_at', 'DESC'), ('v.id', 'DESC')], per_page)
+        page = pager.page
+        result = safe_run(session, query + pager.where_and() + " RETURN v, u" + pager.key_column()
+                          + pager.order_by() + pager.limit_clause(), {**params, **pager.params})
+        result = pager.paginate(result or [])
         
         verifications = []
         if result:
@@ -914,6 +954,7 @@ def verifications():
                          total=total,
                          current_page=page,
                          total_pages=total_pages,
+                         pager=pager,
                          status_filter=status_filter,
                          user_type_filter=user_type_filter,
                          stats=get_realtime_stats())
@@ -1470,13 +1511,12 @@ def maintenance(action):
                 RETURN count(*) as deleted
             """)
             deleted_count = result[0]['deleted'] if result else 0
+            invalidate_tags('job:*')
             flash(f'Cleanup completed: {deleted_count} expired jobs removed', 'success')
             
         elif action == 'cache_clear':
-            # Clear any cached data (application-level)
-            from flask import cache
-            if hasattr(current_app, 'cache'):
-                current_app.cache.clear()
+            # Clear the shared cache (all workers)
+            cache.clear()
             flash('Cache cleared successfully', 'success')
             
         elif action == 'database_optimize':
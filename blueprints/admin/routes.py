@@ -1,10 +1,17 @@
 
 import logging
+import os
 from datetime import datetime, timedelta
-from flask import render_template, request, redirect, url_for, flash, jsonify, current_app, Blueprint, g, send_file
+from flask import render_template, request, redirect, url_for, flash, jsonify, current_app, Blueprint, g, send_file, Response, stream_with_context
 from flask_login import login_required, current_user
 from functools import wraps
-from database import get_neo4j_db, safe_run, _node_to_dict
+from database import get_neo4j_db, safe_run, stream_run, _node_to_dict
+from query_metrics import query_metrics
+from gemini_cache import response_cache
+from gemini_governor import governor
+from pagination import KeysetPager
+from retrieval_index import index_business
+from cache_tags import invalidate_tags
 from models import User, Business, Job, Review, Notification
 from decorators import role_required, json_response
 from tasks import send_email_task, create_notification_task
@@ -12,6 +19,7 @@ from forms import BusinessForm, JobForm
 import bcrypt
 import csv
 import io
+import itertools
 from . import admin_bp
 
 _TIME_TABLE = {
@@ -536,16 +544,12 @@ def users():
         total_users = count_result[0]['total'] if count_result else 0
         
         # Get users for current page
-        query += """
-            RETURN u
-            ORDER BY u.created_at DESC
-            SKIP $skip
-            LIMIT $limit
-        """
-        params['skip'] = (page - 1) * per_page
-        params['limit'] = per_page
-        
-        users_result = safe_run(session, query, params)
+        pager = KeysetPager.from_request([('u.created_at', 'DESC'), ('u.id', 'DESC')], per_page)
+        page = pager.page
+        users_result = safe_run(session, query + pager.where_and() + """
+            RETURN u""" + pager.key_column() + pager.order_by() + pager.limit_clause(),
+            {**params, **pager.params})
+        users_result = pager.paginate(users_result)
         users = [_node_to_dict(rec['u']) | {'id': str(_node_to_dict(rec['u'])['id'])}
          for rec in (users_result or [])]
 
@@ -566,6 +570,7 @@ def users():
                          total_users=total_users,
                          page=page,
                          total_pages=total_pages,
+                         pager=pager,
                          search=search,
                          role_filter=role_filter,
                          status_filter=status_filter,
@@ -719,18 +724,15 @@ def businesses():
         count_result = safe_run(session, count_query, params)
         total_businesses = count_result[0]['total'] if count_result else 0
         
-        # Get businesses for current page
-        query += """
+        # Get businesses for current page; the owner is only looked up for the page rows
+        pager = KeysetPager.from_request([('b.created_at', 'DESC'), ('b.id', 'DESC')], per_page)
+        page = pager.page
+        businesses_result = safe_run(session, query + pager.where_and() + """
+            WITH b""" + pager.order_by() + pager.limit_clause() + """
             OPTIONAL MATCH (owner:User)-[:OWNS]->(b)
-            RETURN b, owner.username as owner_name
-            ORDER BY b.created_at DESC
-            SKIP $skip
-            LIMIT $limit
-        """
-        params['skip'] = (page - 1) * per_page
-        params['limit'] = per_page
-        
-        businesses_result = safe_run(session, query, params)
+            RETURN b, owner.username as owner_name""" + pager.key_column(),
+            {**params, **pager.params})
+        businesses_result = pager.paginate(businesses_result)
         businesses = []
         for business in businesses_result or []:
             biz_data = _node_to_dict(business['b'])
@@ -752,6 +754,7 @@ def businesses():
                          total_businesses=total_businesses,
                          page=page,
                          total_pages=total_pages,
+                         pager=pager,
                          search=search,
                          status_filter=status_filter,
                          category_filter=category_filter,
@@ -789,6 +792,8 @@ def verify_business(business_id):
             'verified_at': datetime.utcnow().isoformat(),
             'verified_by': current_user.id
         })
+        invalidate_tags('business:*', f'business:{business_id}')
+        index_business(business_id)
         
         # Create notification for business owner - verify owner exists first
         if owner and owner.get('id'):
@@ -867,18 +872,15 @@ def jobs():
         count_result = safe_run(session, count_query, params)
         total_jobs = count_result[0]['total'] if count_result else 0
         
-        # Get jobs for current page
-        query += """
+        # Get jobs for current page; the business is only looked up for the page rows
+        pager = KeysetPager.from_request([('j.created_at', 'DESC'), ('j.id', 'DESC')], per_page)
+        page = pager.page
+        jobs_result = safe_run(session, query + pager.where_and() + """
+            WITH j""" + pager.order_by() + pager.limit_clause() + """
             OPTIONAL MATCH (b:Business)-[:POSTED]->(j)
-            RETURN j, b.name as business_name, b.id as business_id
-            ORDER BY j.created_at DESC
-            SKIP $skip
-            LIMIT $limit
-        """
-        params['skip'] = (page - 1) * per_page
-        params['limit'] = per_page
-        
-        jobs_result = safe_run(session, query, params)
+            RETURN j, b.name as business_name, b.id as business_id""" + pager.key_column(),
+            {**params, **pager.params})
+        jobs_result = pager.paginate(jobs_result)
         jobs = []
         for job in jobs_result or []:
             job_data = _node_to_dict(job['j'])
@@ -901,6 +903,7 @@ def jobs():
                          total_jobs=total_jobs,
                          page=page,
                          total_pages=total_pages,
+                         pager=pager,
                          search=search,
                          status_filter=status_filter,
                          category_filter=category_filter,
@@ -1159,52 +1162,140 @@ def system_info():
             'database_status': 'connected',
             'cache_status': 'active',
             'email_status': 'configured'
-        }
+        },
+        'database_pool': db.pool_metrics()
     }
     
     return system_info
 
 
+
+@admin_bp.route('/query-stats')
+@login_required
+@admin_required
+@json_response
+def query_stats():
+    """Per-fingerprint Cypher latency histograms for this worker process"""
+    limit = request.args.get('limit', 50, type=int)
+    queries = query_metrics.snapshot()
+    return {
+        'pid': os.getpid(),
+        'slow_query_ms': query_metrics.slow_query_ms,
+        'fingerprints': len(queries),
+        'queries': queries[:limit]
+    }
+
+
+@admin_bp.route('/query-stats/reset', methods=['POST'])
+@login_required
+@admin_required
+@json_response
+def reset_query_stats():
+    """Clear the query histograms for this worker process"""
+    query_metrics.reset()
+    return {'success': True}
+
+
+@admin_bp.route('/ai-cache-stats')
+@login_required
+@admin_required
+@json_response
+def ai_cache_stats():
+    """Gemini response cache and single-flight counters for this worker process"""
+    from gemini_client import single_flight
+    return {'pid': os.getpid(), **response_cache.stats(), 'single_flight': single_flight.stats()}
+
+
+@admin_bp.route('/ai-cache-stats/clear', methods=['POST'])
+@login_required
+@admin_required
+@json_response
+def clear_ai_cache():
+    """Drop cached Gemini responses (memory and shared disk tier)"""
+    response_cache.clear()
+    return {'success': True}
+
+
+@admin_bp.route('/ai-governor')
+@login_required
+@admin_required
+@json_response
+def ai_governor():
+    """Gemini request budget, circuit breaker state, rejects and time to recovery"""
+    return governor.snapshot()
+
+
+@admin_bp.route('/ai-governor/reset', methods=['POST'])
+@login_required
+@admin_required
+@json_response
+def reset_ai_governor():
+    """Close the circuit and refill the budget"""
+    governor.reset()
+    return {'success': True}
+
+
 # CSV Export Routes
+_CSV_FLUSH_BYTES = 64 * 1024
+
+
+def _write_csv_rows(session, query, writer):
+    """Stream query rows into a csv writer; returns the number of rows"""
+    count = 0
+    for row in stream_run(session, query):
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def _csv_download(query, fieldnames, name):
+    """Stream a query as a CSV attachment without materialising the result.
+
+    The first chunk is produced before the response starts so connection and
+    query errors still reach the caller's error handling.
+    """
+    db = get_neo4j_db()
+    admin_name = current_user.username
+
+    def generate():
+        count = 0
+        with db.session() as session:
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=fieldnames)
+            writer.writeheader()
+            for row in stream_run(session, query):
+                writer.writerow(row)
+                count += 1
+                if buffer.tell() >= _CSV_FLUSH_BYTES:
+                    yield buffer.getvalue().encode('utf-8')
+                    buffer.seek(0)
+                    buffer.truncate()
+            yield buffer.getvalue().encode('utf-8')
+        logger.info(f"Admin {admin_name} exported {count} {name} to CSV")
+
+    chunks = generate()
+    first = next(chunks)
+    filename = f'{name}_export_{datetime.utcnow().strftime("%Y%m%d_%H%M%S")}.csv'
+    return Response(
+        stream_with_context(itertools.chain([first], chunks)),
+        mimetype='text/csv',
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
+    )
+
+
 @admin_bp.route('/export/users')
 @admin_required
 def export_users_csv():
     """Export all users data to CSV"""
     try:
-        db = get_neo4j_db()
-        with db.session() as session:
-            users = safe_run(session, """
-                MATCH (u:User)
-                RETURN u.id as user_id, u.username as username, u.email as email, u.role as role,
-                       u.full_name as full_name, u.phone as phone, u.is_verified as is_verified,
-                       u.created_at as created_at, u.last_login as last_login
-                ORDER BY u.created_at DESC
-            """)
-        
-        # Create CSV in memory
-        output = io.StringIO()
-        if users:
-            fieldnames = ['user_id', 'username', 'email', 'role', 'full_name', 'phone', 'is_verified', 'created_at', 'last_login']
-            writer = csv.DictWriter(output, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            for user in users:
-                row = {k: v for k, v in user.items()}
-                writer.writerow(row)
-        
-        # Convert to bytes
-        output.seek(0)
-        bytes_data = io.BytesIO(output.getvalue().encode('utf-8'))
-        bytes_data.seek(0)
-        
-        logger.info(f"Admin {current_user.username} exported {len(users) if users else 0} users to CSV")
-        
-        return send_file(
-            bytes_data,
-            mimetype='text/csv',
-            as_attachment=True,
-            download_name=f'users_export_{datetime.utcnow().strftime("%Y%m%d_%H%M%S")}.csv'
-        )
+        return _csv_download("""
+            MATCH (u:User)
+            RETURN u.id as user_id, u.username as username, u.email as email, u.role as role,
+                   u.full_name as full_name, u.phone as phone, u.is_verified as is_verified,
+                   u.created_at as created_at, u.last_login as last_login
+            ORDER BY u.created_at DESC
+        """, ['user_id', 'username', 'email', 'role', 'full_name', 'phone', 'is_verified', 'created_at', 'last_login'],
+            'users')
     except Exception as e:
         logger.error(f"Error exporting users CSV: {str(e)}")
         flash('Error exporting users data', 'error')
@@ -1216,46 +1307,20 @@ def export_users_csv():
 def export_businesses_csv():
     """Export all businesses data to CSV"""
     try:
-        db = get_neo4j_db()
-        with db.session() as session:
-            businesses = safe_run(session, """
-                MATCH (b:Business)
-                OPTIONAL MATCH (b)-[:HAS_REVIEW]->(r:Review)
-                WITH b, COUNT(r) as review_count, AVG(r.rating) as avg_rating
-                RETURN b.id as business_id, b.name as name, b.category as category, 
-                       b.address as address, b.phone as phone, b.email as email,
-                       b.website as website, b.is_verified as is_verified, b.is_featured as is_featured,
-                       b.rating as rating, b.description as description,
-                       b.latitude as latitude, b.longitude as longitude,
-                       review_count, b.created_at as created_at
-                ORDER BY b.created_at DESC
-            """)
-        
-        # Create CSV in memory
-        output = io.StringIO()
-        if businesses:
-            fieldnames = ['business_id', 'name', 'category', 'address', 'phone', 'email', 'website', 
-                         'is_verified', 'is_featured', 'rating', 'review_count', 'description', 'latitude', 'longitude', 'created_at']
-            writer = csv.DictWriter(output, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            for business in businesses:
-                row = {k: v for k, v in business.items()}
-                writer.writerow(row)
-        
-        # Convert to bytes
-        output.seek(0)
-        bytes_data = io.BytesIO(output.getvalue().encode('utf-8'))
-        bytes_data.seek(0)
-        
-        logger.info(f"Admin {current_user.username} exported {len(businesses) if businesses else 0} businesses to CSV")
-        
-        return send_file(
-            bytes_data,
-            mimetype='text/csv',
-            as_attachment=True,
-            download_name=f'businesses_export_{datetime.utcnow().strftime("%Y%m%d_%H%M%S")}.csv'
-        )
+        return _csv_download("""
+            MATCH (b:Business)
+            OPTIONAL MATCH (b)-[:HAS_REVIEW]->(r:Review)
+            WITH b, COUNT(r) as review_count, AVG(r.rating) as avg_rating
+            RETURN b.id as business_id, b.name as name, b.category as category,
+                   b.address as address, b.phone as phone, b.email as email,
+                   b.website as website, b.is_verified as is_verified, b.is_featured as is_featured,
+                   b.rating as rating, b.description as description,
+                   b.latitude as latitude, b.longitude as longitude,
+                   review_count, b.created_at as created_at
+            ORDER BY b.created_at DESC
+        """, ['business_id', 'name', 'category', 'address', 'phone', 'email', 'website',
+              'is_verified', 'is_featured', 'rating', 'review_count', 'description', 'latitude', 'longitude', 'created_at'],
+            'businesses')
     except Exception as e:
         logger.error(f"Error exporting businesses CSV: {str(e)}")
         flash('Error exporting businesses data', 'error')
@@ -1267,48 +1332,22 @@ def export_businesses_csv():
 def export_jobs_csv():
     """Export all jobs data to CSV"""
     try:
-        db = get_neo4j_db()
-        with db.session() as session:
-            jobs = safe_run(session, """
-                MATCH (j:Job)
-                OPTIONAL MATCH (j)-[:POSTED_BY]->(b:Business)
-                OPTIONAL MATCH (j)<-[:APPLIED_FOR]-(a:Application)
-                WITH j, b, COUNT(a) as application_count
-                RETURN j.id as job_id, j.title as title, j.description as description,
-                       j.salary_range as salary_range, j.employment_type as employment_type,
-                       j.location as location, j.experience_level as experience_level,
-                       b.name as company_name, j.status as status,
-                       application_count, j.is_featured as is_featured,
-                       j.deadline as deadline, j.created_at as posted_at
-                ORDER BY j.created_at DESC
-            """)
-        
-        # Create CSV in memory
-        output = io.StringIO()
-        if jobs:
-            fieldnames = ['job_id', 'title', 'company_name', 'location', 'salary_range', 
-                         'employment_type', 'experience_level', 'status', 'is_featured',
-                         'application_count', 'deadline', 'posted_at', 'description']
-            writer = csv.DictWriter(output, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            for job in jobs:
-                row = {k: v for k, v in job.items()}
-                writer.writerow(row)
-        
-        # Convert to bytes
-        output.seek(0)
-        bytes_data = io.BytesIO(output.getvalue().encode('utf-8'))
-        bytes_data.seek(0)
-        
-        logger.info(f"Admin {current_user.username} exported {len(jobs) if jobs else 0} jobs to CSV")
-        
-        return send_file(
-            bytes_data,
-            mimetype='text/csv',
-            as_attachment=True,
-            download_name=f'jobs_export_{datetime.utcnow().strftime("%Y%m%d_%H%M%S")}.csv'
-        )
+        return _csv_download("""
+            MATCH (j:Job)
+            OPTIONAL MATCH (j)-[:POSTED_BY]->(b:Business)
+            OPTIONAL MATCH (j)<-[:APPLIED_FOR]-(a:Application)
+            WITH j, b, COUNT(a) as application_count
+            RETURN j.id as job_id, j.title as title, j.description as description,
+                   j.salary_range as salary_range, j.employment_type as employment_type,
+                   j.location as location, j.experience_level as experience_level,
+                   b.name as company_name, j.status as status,
+                   application_count, j.is_featured as is_featured,
+                   j.deadline as deadline, j.created_at as posted_at
+            ORDER BY j.created_at DESC
+        """, ['job_id', 'title', 'company_name', 'location', 'salary_range',
+              'employment_type', 'experience_level', 'status', 'is_featured',
+              'application_count', 'deadline', 'posted_at', 'description'],
+            'jobs')
     except Exception as e:
         logger.error(f"Error exporting jobs CSV: {str(e)}")
         flash('Error exporting jobs data', 'error')
@@ -1321,83 +1360,68 @@ def export_all_csv():
     """Export all data (users, businesses, jobs) to CSV files in a zip"""
     try:
         import zipfile
-        
+
         db = get_neo4j_db()
-        
-        # Create zip file in memory
+
+        # Create zip file in memory; rows are streamed straight into each entry
         zip_buffer = io.BytesIO()
         with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            
+
             with db.session() as session:
                 # Export Users
-                users = safe_run(session, """
-                    MATCH (u:User)
-                    RETURN u.id as user_id, u.username as username, u.email as email, u.role as role,
-                           u.full_name as full_name, u.phone as phone, u.is_verified as is_verified,
-                           u.created_at as created_at, u.last_login as last_login
-                    ORDER BY u.created_at DESC
-                """)
-                
-                users_csv = io.StringIO()
-                if users:
+                with zip_file.open('users.csv', 'w') as entry, \
+                        io.TextIOWrapper(entry, encoding='utf-8', newline='') as users_csv:
                     fieldnames = ['user_id', 'username', 'email', 'role', 'full_name', 'phone', 'is_verified', 'created_at', 'last_login']
                     writer = csv.DictWriter(users_csv, fieldnames=fieldnames)
                     writer.writeheader()
-                    for user in users:
-                        writer.writerow({k: v for k, v in user.items()})
-                
-                zip_file.writestr('users.csv', users_csv.getvalue())
-                
+                    _write_csv_rows(session, """
+                        MATCH (u:User)
+                        RETURN u.id as user_id, u.username as username, u.email as email, u.role as role,
+                               u.full_name as full_name, u.phone as phone, u.is_verified as is_verified,
+                               u.created_at as created_at, u.last_login as last_login
+                        ORDER BY u.created_at DESC
+                    """, writer)
+
                 # Export Businesses
-                businesses = safe_run(session, """
-                    MATCH (b:Business)
-                    OPTIONAL MATCH (b)-[:HAS_REVIEW]->(r:Review)
-                    WITH b, COUNT(r) as review_count
-                    RETURN b.id as business_id, b.name as name, b.category as category, 
-                           b.address as address, b.phone as phone, b.email as email,
-                           b.website as website, b.is_verified as is_verified, b.is_featured as is_featured,
-                           b.rating as rating, review_count, b.created_at as created_at
-                    ORDER BY b.created_at DESC
-                """)
-                
-                businesses_csv = io.StringIO()
-                if businesses:
-                    fieldnames = ['business_id', 'name', 'category', 'address', 'phone', 'email', 'website', 
+                with zip_file.open('businesses.csv', 'w') as entry, \
+                        io.TextIOWrapper(entry, encoding='utf-8', newline='') as businesses_csv:
+                    fieldnames = ['business_id', 'name', 'category', 'address', 'phone', 'email', 'website',
                                  'is_verified', 'is_featured', 'rating', 'review_count', 'created_at']
                     writer = csv.DictWriter(businesses_csv, fieldnames=fieldnames)
                     writer.writeheader()
-                    for business in businesses:
-                        writer.writerow({k: v for k, v in business.items()})
-                
-                zip_file.writestr('businesses.csv', businesses_csv.getvalue())
-                
+                    _write_csv_rows(session, """
+                        MATCH (b:Business)
+                        OPTIONAL MATCH (b)-[:HAS_REVIEW]->(r:Review)
+                        WITH b, COUNT(r) as review_count
+                        RETURN b.id as business_id, b.name as name, b.category as category,
+                               b.address as address, b.phone as phone, b.email as email,
+                               b.website as website, b.is_verified as is_verified, b.is_featured as is_featured,
+                               b.rating as rating, review_count, b.created_at as created_at
+                        ORDER BY b.created_at DESC
+                    """, writer)
+
                 # Export Jobs
-                jobs = safe_run(session, """
-                    MATCH (j:Job)
-                    OPTIONAL MATCH (j)-[:POSTED_BY]->(b:Business)
-                    OPTIONAL MATCH (j)<-[:APPLIED_FOR]-(a:Application)
-                    WITH j, b, COUNT(a) as application_count
-                    RETURN j.id as job_id, j.title as title, j.salary_range as salary_range,
-                           j.employment_type as employment_type, j.location as location,
-                           b.name as company_name, j.status as status, application_count,
-                           j.is_featured as is_featured, j.created_at as posted_at
-                    ORDER BY j.created_at DESC
-                """)
-                
-                jobs_csv = io.StringIO()
-                if jobs:
-                    fieldnames = ['job_id', 'title', 'company_name', 'location', 'salary_range', 
+                with zip_file.open('jobs.csv', 'w') as entry, \
+                        io.TextIOWrapper(entry, encoding='utf-8', newline='') as jobs_csv:
+                    fieldnames = ['job_id', 'title', 'company_name', 'location', 'salary_range',
                                  'employment_type', 'status', 'is_featured', 'application_count', 'posted_at']
                     writer = csv.DictWriter(jobs_csv, fieldnames=fieldnames)
                     writer.writeheader()
-                    for job in jobs:
-                        writer.writerow({k: v for k, v in job.items()})
-                
-                zip_file.writestr('jobs.csv', jobs_csv.getvalue())
-        
+                    _write_csv_rows(session, """
+                        MATCH (j:Job)
+                        OPTIONAL MATCH (j)-[:POSTED_BY]->(b:Business)
+                        OPTIONAL MATCH (j)<-[:APPLIED_FOR]-(a:Application)
+                        WITH j, b, COUNT(a) as application_count
+                        RETURN j.id as job_id, j.title as title, j.salary_range as salary_range,
+                               j.employment_type as employment_type, j.location as location,
+                               b.name as company_name, j.status as status, application_count,
+                               j.is_featured as is_featured, j.created_at as posted_at
+                        ORDER BY j.created_at DESC
+                    """, writer)
+
         zip_buffer.seek(0)
         logger.info(f"Admin {current_user.username} exported all data to ZIP")
-        
+
         return send_file(
             zip_buffer,
             mimetype='application/zip',
@@ -6,6 +6,7 @@ Provides intelligent location filtering and suggestions for Jobs and Businesses
 from flask import Blueprint, request, jsonify
 from flask_login import login_required, current_user
 from gemini_client import get_gemini_response
+from gemini_governor import PRIORITY_BACKGROUND
 from database import get_neo4j_db, safe_run
 import logging
 import json
@@ -26,6 +27,13 @@ CATANDUANES_LOCATIONS = {
     'san andres': 'San Andres',
     'viga': 'Viga',
     'caramoran': 'Caramoran',
+    'bato': 'Bato',
+    'gigmoto': 'Gigmoto',
+    'pandan': 'Pandan',
+    'panganiban': 'Panganiban',
+    'payo': 'Panganiban',
+    'san_miguel': 'San Miguel',
+    'san miguel': 'San Miguel',
 }
 
 def normalize_location(location_query):
@@ -94,7 +102,7 @@ Respond in JSON format with this structure:
 
 Only return JSON, no additional text."""
 
-        response = get_gemini_response(prompt)
+        response = get_gemini_response(prompt, priority=PRIORITY_BACKGROUND)
         
         try:
             suggestions = json.loads(response)
@@ -149,7 +157,7 @@ Respond in JSON format:
 
 Only return JSON, no additional text."""
 
-        ai_response = get_gemini_response(prompt)
+        ai_response = get_gemini_response(prompt, priority=PRIORITY_BACKGROUND)
         
         try:
             location_data = json.loads(ai_response)
@@ -263,7 +271,7 @@ Respond in JSON format:
 
 Only return JSON, no additional text."""
 
-        ai_response = get_gemini_response(prompt)
+        ai_response = get_gemini_response(prompt, priority=PRIORITY_BACKGROUND)
         
         try:
             location_data = json.loads(ai_response)
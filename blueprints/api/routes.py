@@ -1,7 +1,11 @@
-from flask import jsonify, current_app
+from flask import jsonify, current_app, request
 from flask_login import current_user, login_required
 from . import api_bp
 from database import get_neo4j_db, safe_run
+from notification_writer import decode_data
+from map_clusters import bbox_condition, cluster_params, cluster_query, request_viewport, split_cells
+from realtime import bus
+from sse import event_stream_response
 from .realtime import get_platform_stats, get_business_owner_stats, get_job_seeker_stats
 
 @api_bp.route('/homepage/featured-jobs')
@@ -105,6 +109,19 @@ def realtime_stats():
     
     return jsonify(stats)
 
+@api_bp.route('/events')
+@login_required
+def events():
+    """Server-Sent Events stream of the user's chat messages and notifications"""
+    if not current_app.config.get('REALTIME_ENABLED', True):
+        return jsonify({'error': 'Realtime events are disabled'}), 404
+    if not bus.has_capacity():
+        # The page polls instead; leave the remaining threads to requests
+        return jsonify({'error': 'Too many open event streams'}), 503, {'Retry-After': '60'}
+    # EventSource resends the last id it saw when it reconnects
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    return event_stream_response(bus.stream(current_user.id, last_event_id))
+
 @api_bp.route('/current-user')
 def get_current_user():
     if current_user.is_authenticated:
@@ -119,50 +136,34 @@ def get_current_user():
 
 @api_bp.route('/businesses/map-markers')
 def get_business_markers():
-    """Get all business locations for map display"""
+    """Get business locations in the map viewport (?bbox=west,south,east,north&zoom=)"""
     try:
+        bbox, zoom = request_viewport(request.args)
         db = get_neo4j_db()
         with db.session() as session:
-            # Query businesses with location data
-            result = safe_run(session, """
-                MATCH (b:Business)
-                WHERE b.latitude IS NOT NULL 
-                AND b.longitude IS NOT NULL
-                RETURN b.id AS id,
-                       b.name AS name,
-                       b.address AS address,
-                       b.latitude AS latitude,
-                       b.longitude AS longitude,
-                       b.category AS category,
-                       b.description AS description
-            """)
+            # Only the fields a marker popup shows; dense cells are clustered
+            result = safe_run(session, cluster_query(
+                f"MATCH (b:Business) WHERE {bbox_condition('b.position')}",
+                'b.position',
+                "{id: b.id, name: b.name, address: b.address, category: b.category, "
+                "latitude: b.position.latitude, longitude: b.position.longitude}"
+            ), cluster_params(bbox, zoom))
             
-            markers = []
-            if result:
-                for record in result:
-                    # Only add markers with valid coordinates
-                    if record.get('latitude') and record.get('longitude'):
-                        try:
-                            lat = float(record['latitude'])
-                            lng = float(record['longitude'])
-                            markers.append({
-                                'id': record['id'],
-                                'name': record['name'],
-                                'address': record['address'],
-                                'latitude': lat,
-                                'longitude': lng,
-                                'business_type': record.get('business_type', 'Unknown'),
-                                'description': record.get('description', '')
-                            })
-                        except (ValueError, TypeError) as e:
-                            current_app.logger.warning(
-                                f"Invalid coordinates for business {record.get('id')}: {e}"
-                            )
-                            continue
+            clusters, points = split_cells(result or [], zoom)
+            markers = [{
+                'id': point['id'],
+                'name': point['name'],
+                'address': point['address'],
+                'latitude': point['latitude'],
+                'longitude': point['longitude'],
+                'business_type': point.get('category') or 'Unknown'
+            } for point in points]
             
             return jsonify({
                 'success': True,
-                'markers': markers
+                'zoom': zoom,
+                'markers': markers,
+                'clusters': clusters
             })
             
     except Exception as e:
@@ -170,7 +171,8 @@ def get_business_markers():
         return jsonify({
             'success': False,
             'error': 'Failed to fetch business locations',
-            'markers': []
+            'markers': [],
+            'clusters': []
         })
 
 
@@ -203,7 +205,7 @@ def get_notifications():
                         'type': node_data.get('type'),
                         'title': node_data.get('title'),
                         'message': node_data.get('message'),
-                        'data': node_data.get('data', {}),
+                        'data': decode_data(node_data.get('data')),
                         'is_read': node_data.get('is_read', False),
                         'created_at': node_data.get('created_at')
                     })
@@ -1,4 +1,5 @@
 import uuid
+import hashlib
 import logging
 from datetime import datetime
 from flask import render_template, request, redirect, url_for, flash, jsonify, current_app
@@ -12,10 +13,19 @@ from models import Business, Review
 from forms import BusinessForm, ReviewForm, SearchForm
 from decorators import role_required, login_required_optional, json_response, verified_required, business_owner_required
 from tasks import send_email_task, create_notification_task
-from app import cache  # Import the cache extension
+from retrieval_index import index_business
+from cache_tags import get_tagged, set_tagged, invalidate_tags
+from pagination import KeysetPager
+from gemini_governor import governor, PRIORITY_BACKGROUND
+from map_clusters import bbox_condition, cluster_params, cluster_query, request_viewport, split_cells
+from notification_writer import decode_data
 
 logger = logging.getLogger(__name__)
 
+# Query results of the business listing, keyed by its query string; the page
+# itself is rendered per request (CSRF token, flashed messages, navigation)
+_BUSINESS_LIST_CACHE_TIMEOUT = 300
+
 @businesses_bp.route('/categories')
 @login_required_optional
 def categories_overview():
@@ -49,7 +59,6 @@ def categories_overview():
 
 @businesses_bp.route('/')
 @login_required_optional
-@cache.cached(timeout=300, query_string=True)   # ← add query_string=True
 def list_businesses():
     """List all businesses with search and filtering"""
     form = SearchForm(request.args)
@@ -94,63 +103,38 @@ def list_businesses():
     if verified_only:
         query += " AND b.is_verified = true"
     
-    # Add sorting
+    # Add sorting; keys end in b.id so the keyset cursor is unique
     if sort_by == 'rating':
-        query += " ORDER BY b.rating DESC"
+        sort_keys = [('coalesce(b.rating, 0)', 'DESC'), ('b.id', 'DESC')]
     elif sort_by == 'reviews':
-        query += " ORDER BY b.review_count DESC"
+        sort_keys = [('coalesce(b.review_count, 0)', 'DESC'), ('b.id', 'DESC')]
     elif sort_by == 'name':
-        query += " ORDER BY b.name ASC"
+        sort_keys = [("coalesce(b.name, '')", 'ASC'), ('b.id', 'ASC')]
     else:  # created_at
-        query += " ORDER BY b.created_at DESC"
+        sort_keys = [('b.created_at', 'DESC'), ('b.id', 'DESC')]
     
     # Add pagination
-    page = request.args.get('page', 1, type=int)
     per_page = 12
-    skip = (page - 1) * per_page
-    
-    query += f" SKIP $skip LIMIT $limit"
-    params['skip'] = skip
-    params['limit'] = per_page
-    
-    query += """
-        RETURN b
-    """
+    pager = KeysetPager.from_request(sort_keys, per_page)
+    page = pager.page
     
-    db = get_neo4j_db()
-    with db.session() as session:
-        businesses = safe_run(session, query, params)
-        
-        # Get total count for pagination
-        count_query = """
-            MATCH (b:Business)
-            WHERE b.is_active = true
-        """
-        count_params = {}
-        
-        if query_text:
-            count_query += " AND (toLower(b.name) CONTAINS toLower($query) OR toLower(b.description) CONTAINS toLower($query))"
-            count_params['query'] = query_text
-        
-        if category:
-            count_query += " AND b.category = $category"
-            count_params['category'] = category
-        
-        if location:
-            count_query += " AND toLower(b.address) CONTAINS toLower($location)"
-            count_params['location'] = location
-        
-        if min_rating > 0:
-            count_query += " AND b.rating >= $min_rating"
-            count_params['min_rating'] = min_rating
-        
-        if verified_only:
-            count_query += " AND b.is_verified = true"
-        
-        count_query += " RETURN count(b) as total"
-        
-        total_result = safe_run(session, count_query, count_params)
-        total = total_result[0]['total'] if total_result else 0
+    args = sorted(request.args.items(multi=True))
+    cache_key = f"businesses:list:{hashlib.md5(repr(args).encode('utf-8')).hexdigest()}"
+    cached = get_tagged(cache_key, ['business:*'])
+    if cached is None:
+        db = get_neo4j_db()
+        with db.session() as session:
+            rows = safe_run(session, query + pager.where_and() + """
+                RETURN b""" + pager.key_column() + pager.order_by() + pager.limit_clause(),
+                {**params, **pager.params})
+            
+            # Get total count for pagination under the same filters
+            total_result = safe_run(session, query + " RETURN count(b) as total", params)
+            total = total_result[0]['total'] if total_result else 0
+        cached = {'rows': rows, 'total': total}
+        set_tagged(cache_key, cached, ['business:*'], timeout=_BUSINESS_LIST_CACHE_TIMEOUT)
+    businesses = pager.paginate(cached['rows'])
+    total = cached['total']
     
     # Convert to Business objects and handle pagination
     business_list = []
@@ -166,8 +150,6 @@ def list_businesses():
         
     # Calculate pagination values
     total_pages = (total + per_page - 1) // per_page
-    has_next = page < total_pages
-    has_prev = page > 1
     
     # Create pagination object
     pagination = {
@@ -175,10 +157,13 @@ def list_businesses():
         'per_page': per_page,
         'total': total,
         'total_pages': total_pages,
-        'has_next': has_next,
-        'has_prev': has_prev,
-        'next_num': page + 1 if has_next else None,
-        'prev_num': page - 1 if has_prev else None
+        'has_next': pager.has_next,
+        'has_prev': pager.has_prev,
+        'next_num': page + 1 if pager.has_next else None,
+        'prev_num': page - 1 if pager.has_prev else None,
+        'next_cursor': pager.next_cursor,
+        'prev_cursor': pager.prev_cursor,
+        'max_offset_pages': pager.max_offset_pages
     }
     
     return render_template('businesses.html',
@@ -560,18 +545,25 @@ def create_business():
             # Create business
             safe_run(session, """
                 CREATE (b:Business $business_data)
+                SET b.position = CASE WHEN b.latitude IS NULL OR b.longitude IS NULL THEN null
+                    ELSE point({latitude: toFloat(b.latitude), longitude: toFloat(b.longitude)}) END
                 WITH b
                 MATCH (u:User {id: $user_id})
                 CREATE (u)-[:OWNS]->(b)
             """, {'business_data': business_data, 'user_id': current_user.id})
-        
-        # Send verification request to admin
-        create_notification_task(
-            type='business_verification',
-            title='New Business Registration',
-            message=f'New business "{form.name.data}" requires verification',
-            data={'business_id': business_id, 'owner_id': current_user.id}
-        )
+            admins = safe_run(session, "MATCH (a:User {role: 'admin'}) RETURN a.id AS id")
+        invalidate_tags('business:*')
+        index_business(business_id)
+        
+        # Send the verification request to every admin (notifications are per user)
+        for admin in admins:
+            create_notification_task(
+                user_id=admin['id'],
+                type='business_verification',
+                title='New Business Registration',
+                message=f'New business "{form.name.data}" requires verification',
+                data={'business_id': business_id, 'owner_id': current_user.id}
+            )
         
         flash('Business registration submitted successfully! It will be reviewed by our team.', 'success')
         return redirect(url_for('businesses.business_detail', business_id=business_id))
@@ -672,6 +664,8 @@ def add_review(business_id):
             """, {'business_id': business_id})
             
             logger.info(f"Updated business rating for {business_id}")
+            # Ratings are not part of the retrieval index, so only the caches change
+            invalidate_tags('business:*', f'business:{business_id}')
             
             # Create notification for business owner
             owner_result = safe_run(session, """
@@ -851,7 +845,11 @@ def edit_business(business_id):
             safe_run(session, """
                 MATCH (b:Business {id: $business_id})
                 SET b += $update_data
+                SET b.position = CASE WHEN b.latitude IS NULL OR b.longitude IS NULL THEN null
+                    ELSE point({latitude: toFloat(b.latitude), longitude: toFloat(b.longitude)}) END
             """, {'business_id': business_id, 'update_data': update_data})
+        invalidate_tags('business:*', f'business:{business_id}')
+        index_business(business_id)
         
         flash('Business updated successfully!', 'success')
         return redirect(url_for('businesses.business_detail', business_id=business_id))
@@ -923,7 +921,7 @@ Examples:
 - If query is "shop" → store, retail, market, vendor, store, commercial
 - If query is "cafe" → restaurant, coffee, diner, bistro, eatery, food service"""
                 
-                keywords_response = get_gemini_response(expansion_prompt)
+                keywords_response = get_gemini_response(expansion_prompt, priority=PRIORITY_BACKGROUND)
                 expanded_keywords = [k.strip() for k in keywords_response.split('\n') if k.strip()][:6]
                 
                 if expanded_keywords:
@@ -991,17 +989,14 @@ def ai_search_businesses():
     category = request.args.get('category', '').strip()
     limit = request.args.get('limit', 12, type=int)
     
-    # Check if API quota is exhausted
-    import pathlib
-    project_root = pathlib.Path(__file__).parent.parent.parent  # From blueprints/businesses/routes.py to project root
-    quota_disabled_file = project_root / '.gemini_quota_disabled'
-    ai_quota_exhausted = quota_disabled_file.exists()
+    # Skip AI search while the Gemini budget is low or the circuit is open
+    ai_quota_exhausted = not governor.available(PRIORITY_BACKGROUND)
     
     # For short queries (< 4 chars), use manual search instead to preserve API quota
     # Also skip AI search if quota has been exhausted
     if not query or len(query) < 4 or ai_quota_exhausted:
         if ai_quota_exhausted:
-            logger.info(f"API quota exhausted, using manual search for: {query}")
+            logger.info(f"Gemini budget exhausted, using manual search for: {query}")
         elif len(query) < 4:
             logger.debug(f"Query too short for AI search ({len(query)} chars), using manual search")
         db = get_neo4j_db()
@@ -1063,7 +1058,7 @@ Return ONLY valid JSON, no markdown or extra text.
 Example for "restaurant":
 {{"primary_keywords": ["restaurant", "food"], "related_keywords": ["dining", "cafe", "eatery"], "business_types": ["Restaurant", "Cafe", "Food Service"], "services": ["dine-in", "takeout", "catering"], "categories": ["restaurant", "services"]}}"""
         
-        intent_response = get_gemini_response(intent_prompt)
+        intent_response = get_gemini_response(intent_prompt, priority=PRIORITY_BACKGROUND)
         
         # Parse the intent response
         try:
@@ -1238,50 +1233,62 @@ Example for "restaurant":
 @businesses_bp.route('/api/map/points')
 @json_response
 def api_map_points():
-    """API endpoint for map points"""
-    bounds = request.args.get('bounds', '')
+    """API endpoint for map points.
+
+    Query parameters: bbox (or bounds) as 'west,south,east,north', zoom and
+    category. Returns GeoJSON; dense areas come back as cluster features.
+    """
+    bbox, zoom = request_viewport(request.args)
     category = request.args.get('category', '')
     
+    match = f"""
+        MATCH (b:Business)
+        WHERE {bbox_condition('b.position')}
+        AND b.is_active = true
+        AND b.is_verified = true
+    """
+    params = cluster_params(bbox, zoom)
+    
+    if category:
+        match += " AND b.category = $category"
+        params['category'] = category
+    
     db = get_neo4j_db()
     with db.session() as session:
-        query = """
-            MATCH (b:Business)
-            WHERE b.is_active = true 
-            AND b.is_verified = true
-            AND b.latitude IS NOT NULL 
-            AND b.longitude IS NOT NULL
-        """
-        params = {}
-        
-        if category:
-            query += " AND b.category = $category"
-            params['category'] = category
-        
-        query += """
-            RETURN b.id as id, b.name as name, b.latitude as lat, b.longitude as lon,
-                   b.category as category, b.rating as rating
-        """
-        
-        results = safe_run(session, query, params)
-        
-        features = []
-        for record in results:
-            features.append({
-                'type': 'Feature',
-                'geometry': {
-                    'type': 'Point',
-                    'coordinates': [record['lon'], record['lat']]
-                },
-                'properties': {
-                    'id': record['id'],
-                    'name': record['name'],
-                    'category': record['category'],
-                    'rating': record['rating']
-                }
-            })
+        rows = safe_run(session, cluster_query(
+            match, 'b.position',
+            "{id: b.id, name: b.name, category: b.category, rating: b.rating, "
+            "lat: b.position.latitude, lon: b.position.longitude}"
+        ), params)
+    clusters, points = split_cells(rows, zoom)
+    
+    features = [{
+        'type': 'Feature',
+        'geometry': {'type': 'Point', 'coordinates': [cluster['lng'], cluster['lat']]},
+        'properties': {
+            'cluster': True,
+            'count': cluster['count'],
+            'expansion_zoom': cluster['expansion_zoom']
+        }
+    } for cluster in clusters]
+    for point in points:
+        features.append({
+            'type': 'Feature',
+            'geometry': {
+                'type': 'Point',
+                'coordinates': [point['lon'], point['lat']]
+            },
+            'properties': {
+                'id': point['id'],
+                'name': point['name'],
+                'category': point['category'],
+                'rating': point['rating']
+            }
+        })
     
     return {
         'type': 'FeatureCollection',
+        'zoom': zoom,
         'features': features
     }
 
@@ -1306,6 +1313,7 @@ def notifications():
             if result:
                 for record in result:
                     node_data = _node_to_dict(record['n'])
+                    node_data['data'] = decode_data(node_data.get('data'))
                     notifications_list.append(node_data)
                     if not node_data.get('is_read'):
                         unread_count += 1
@@ -6,11 +6,52 @@ from flask_login import login_required, current_user
 
 from . import chat_bp
 from database import get_neo4j_db, safe_run, _node_to_dict
+from pagination import decode_cursor, encode_cursor, keyset_condition
+from realtime import publish
 from decorators import json_response, rate_limit_by_user
 from blueprints.chatbot import chatbot_bp
 
 logger = logging.getLogger(__name__)
 
+_PREVIEW_LENGTH = 80
+
+# Conversation pages (get_conversation) are keyed on (timestamp, id)
+_MESSAGE_KEYS = [('m.timestamp', 'ASC'), ('m.id', 'ASC')]
+_MESSAGES_PAGE_SIZE = 50
+_MESSAGES_MAX_PAGE_SIZE = 200
+
+# The inbox reads one (:Conversation) per partner, reached from the user's
+# PARTICIPATES_IN relationships, which carry that user's unread count; the
+# last-message fields are kept on the conversation by send_user_message.
+# Cost grows with the number of conversations, not messages.
+_CONVERSATIONS_LIST = """
+    MATCH (:User {id: $user_id})-[p:PARTICIPATES_IN]->(c:Conversation)
+    WITH c, p, coalesce(head([pid IN c.participant_ids WHERE pid <> $user_id]), $user_id) AS other_user_id
+    MATCH (u:User {id: other_user_id})
+    RETURN u, c.last_message_at AS last_timestamp, p.unread_count AS unread_count,
+           c.last_sender_id AS last_sender_id, c.last_message_preview AS last_text
+    ORDER BY last_timestamp DESC
+"""
+
+# Marks the reader's unread messages read (only those in $ids, unless null) and
+# takes them off the reader's count. The decrement reads and writes the counter
+# in one SET, so it cannot lose a concurrent send's increment
+_MARK_READ = """
+    MATCH (m:UserMessage)
+    WHERE m.conversation_id = $conversation_id AND m.recipient_id = $user_id AND m.read = false
+      AND ($ids IS NULL OR m.id IN $ids)
+    SET m.read = true
+    WITH count(m) AS marked
+    MATCH (:User {id: $user_id})-[p:PARTICIPATES_IN]->(:Conversation {id: $conversation_id})
+    SET p.unread_count = CASE WHEN p.unread_count > marked THEN p.unread_count - marked ELSE 0 END
+    RETURN marked
+"""
+
+
+def conversation_id(user_id, other_id):
+    """Id of the conversation between two users, the same from either side"""
+    return ':'.join(sorted([str(user_id), str(other_id)]))
+
 @chat_bp.route('/user')
 @login_required
 def user_chat_view():
@@ -163,14 +204,23 @@ def send_user_message():
                 logger.warning(f"Recipient not found: {recipient_id}")
                 return jsonify({'error': 'Recipient not found', 'success': False}), 404
             
-            # Create message
+            # Create the message and update the conversation in one transaction:
+            # last-message fields (unless a later message got there first) and
+            # the recipient's unread count
             message_id = str(uuid.uuid4())
             timestamp = datetime.now().isoformat()
             
             safe_run(session, """
                 MATCH (sender:User {id: $sender_id}), (recipient:User {id: $recipient_id})
+                MERGE (c:Conversation {id: $conversation_id})
+                ON CREATE SET c.participant_ids = [$sender_id, $recipient_id], c.created_at = $timestamp
+                MERGE (sender)-[sp:PARTICIPATES_IN]->(c)
+                ON CREATE SET sp.unread_count = 0
+                MERGE (recipient)-[rp:PARTICIPATES_IN]->(c)
+                ON CREATE SET rp.unread_count = 0
                 CREATE (m:UserMessage {
                     id: $message_id,
+                    conversation_id: $conversation_id,
                     sender_id: $sender_id,
                     recipient_id: $recipient_id,
                     text: $text,
@@ -179,15 +229,34 @@ def send_user_message():
                 })
                 CREATE (sender)-[:SENT]->(m)
                 CREATE (m)-[:SENT_TO]->(recipient)
+                FOREACH (_ IN CASE WHEN coalesce(c.last_message_at, '') <= $timestamp THEN [1] ELSE [] END |
+                    SET c.last_message_at = $timestamp,
+                        c.last_message_id = $message_id,
+                        c.last_message_preview = left($text, $preview_length),
+                        c.last_sender_id = $sender_id)
+                SET rp.unread_count = rp.unread_count + CASE WHEN $sender_id = $recipient_id THEN 0 ELSE 1 END
             """, {
                 'sender_id': current_user.id,
                 'recipient_id': recipient_id,
+                'conversation_id': conversation_id(current_user.id, recipient_id),
                 'message_id': message_id,
                 'text': message_text,
-                'timestamp': timestamp
+                'timestamp': timestamp,
+                'preview_length': _PREVIEW_LENGTH
             })
         
         logger.debug(f"Message sent successfully: {message_id}")
+        # Open pages of both participants (the sender may have other tabs) fetch it
+        event = {
+            'message_id': message_id,
+            'conversation_id': conversation_id(current_user.id, recipient_id),
+            'sender_id': current_user.id,
+            'recipient_id': recipient_id,
+            'text': message_text,
+            'timestamp': timestamp
+        }
+        publish(recipient_id, 'message', event)
+        publish(current_user.id, 'message', event)
         return jsonify({
             'success': True,
             'message_id': message_id,
@@ -200,34 +269,77 @@ def send_user_message():
 @chat_bp.route('/api/conversation/<recipient_id>')
 @login_required
 def get_conversation(recipient_id):
-    """Get conversation history with a user"""
+    """Get one page of the conversation with a user, oldest first.
+    
+    Without a cursor this is the newest page. ?before=<cursor> pages back
+    from the oldest message shown, ?since=<cursor> returns only messages
+    after the newest one shown (what a poll needs); ?limit= sets the page
+    size. Only unread messages in the delivered page are marked as read.
+    """
+    limit = min(max(request.args.get('limit', _MESSAGES_PAGE_SIZE, type=int), 1), _MESSAGES_MAX_PAGE_SIZE)
+    since = decode_cursor(request.args.get('since', ''), len(_MESSAGE_KEYS))
+    before = decode_cursor(request.args.get('before', ''), len(_MESSAGE_KEYS))
+    
+    # Newer messages are read forwards from the since cursor; the newest page
+    # and older pages are read backwards and returned in display order
+    keys = _MESSAGE_KEYS if since else [(expr, 'DESC') for expr, _ in _MESSAGE_KEYS]
+    cursor = since or before
+    condition = f" AND {keyset_condition(keys)}" if cursor else ''
+    params = {
+        'conversation_id': conversation_id(current_user.id, recipient_id),
+        'limit': limit + 1,
+    }
+    for i, value in enumerate(cursor[0] if cursor else []):
+        params[f'cursor_{i}'] = value
+    
     db = get_neo4j_db()
     with db.session() as session:
-        # Get all messages between current user and recipient
-        messages = safe_run(session, """
+        records = safe_run(session, f"""
             MATCH (m:UserMessage)
-            WHERE (m.sender_id = $user_id AND m.recipient_id = $recipient_id)
-               OR (m.sender_id = $recipient_id AND m.recipient_id = $user_id)
+            WHERE m.conversation_id = $conversation_id{condition}
             RETURN m
-            ORDER BY m.timestamp ASC
-        """, {
-            'user_id': current_user.id,
-            'recipient_id': recipient_id
-        })
+            ORDER BY {', '.join(f"{expr} {direction}" for expr, direction in keys)}
+            LIMIT $limit
+        """, params)
         
-        message_list = [_node_to_dict(record['m']) for record in messages]
+        message_list = [_node_to_dict(record['m']) for record in records]
+        has_more = len(message_list) > limit
+        message_list = message_list[:limit]
+        if not since:
+            message_list.reverse()
         
-        # Mark messages as read if they were sent to current user
-        safe_run(session, """
-            MATCH (m:UserMessage)
-            WHERE m.recipient_id = $user_id AND m.sender_id = $recipient_id
-            SET m.read = true
-        """, {
-            'user_id': current_user.id,
-            'recipient_id': recipient_id
-        })
+        # Read receipts for the delivered range only
+        unread_ids = {m['id'] for m in message_list
+                      if m.get('recipient_id') == current_user.id and m.get('read') is False}
+        if unread_ids:
+            safe_run(session, _MARK_READ, {
+                'conversation_id': params['conversation_id'],
+                'user_id': current_user.id,
+                'ids': list(unread_ids),
+            })
+            for m in message_list:
+                if m['id'] in unread_ids:
+                    m['read'] = True
     
-    return jsonify({'messages': message_list})
+    if message_list:
+        oldest, newest = (encode_cursor([m['timestamp'], m['id']]) for m in (message_list[0], message_list[-1]))
+    else:
+        oldest = newest = None
+    if since:
+        # A poll: hand back the same cursor when nothing new arrived
+        return jsonify({
+            'messages': message_list,
+            'since': newest or request.args.get('since'),
+            'has_newer': has_more,
+        })
+    return jsonify({
+        'messages': message_list,
+        # Pass as ?before= to load the page before this one
+        'before': oldest if has_more else None,
+        'has_older': has_more,
+        # Pass as ?since= when polling (only for the newest page)
+        'since': newest if not before else None,
+    })
 
 @chat_bp.route('/api/conversations-list')
 @login_required
@@ -235,38 +347,15 @@ def get_conversations_list():
     """Get list of all conversations for current user"""
     db = get_neo4j_db()
     with db.session() as session:
-        # Get unique users that current user has messaged with
-        conversations = safe_run(session, """
-            MATCH (m:UserMessage)
-            WHERE m.sender_id = $user_id OR m.recipient_id = $user_id
-            WITH CASE 
-                WHEN m.sender_id = $user_id THEN m.recipient_id 
-                ELSE m.sender_id 
-            END as other_user_id, max(m.timestamp) as last_timestamp
-            MATCH (u:User {id: other_user_id})
-            RETURN u, last_timestamp
-            ORDER BY last_timestamp DESC
-        """, {'user_id': current_user.id})
+        conversations = safe_run(session, _CONVERSATIONS_LIST, {'user_id': current_user.id})
         
-        conversation_list = []
-        for record in conversations:
-            user_data = _node_to_dict(record['u'])
-            
-            # Count unread messages
-            unread = safe_run(session, """
-                MATCH (m:UserMessage)
-                WHERE m.sender_id = $other_user_id AND m.recipient_id = $user_id AND m.read = false
-                RETURN count(m) as unread_count
-            """, {
-                'other_user_id': user_data['id'],
-                'user_id': current_user.id
-            })
-            
-            conversation_list.append({
-                'user': user_data,
-                'last_message': record['last_timestamp'],
-                'unread_count': unread[0]['unread_count'] if unread else 0
-            })
+        conversation_list = [{
+            'user': _node_to_dict(record['u']),
+            'last_message': record['last_timestamp'],
+            'last_message_preview': record['last_text'],
+            'last_message_from_me': record['last_sender_id'] == current_user.id,
+            'unread_count': record['unread_count']
+        } for record in conversations]
         
         return jsonify({'conversations': conversation_list})
 
@@ -276,13 +365,10 @@ def mark_as_read(recipient_id):
     """Mark all messages from a user as read"""
     db = get_neo4j_db()
     with db.session() as session:
-        safe_run(session, """
-            MATCH (m:UserMessage)
-            WHERE m.sender_id = $sender_id AND m.recipient_id = $recipient_id
-            SET m.read = true
-        """, {
-            'sender_id': recipient_id,
-            'recipient_id': current_user.id
+        safe_run(session, _MARK_READ, {
+            'conversation_id': conversation_id(current_user.id, recipient_id),
+            'user_id': current_user.id,
+            'ids': None,
         })
     
     return jsonify({'success': True})
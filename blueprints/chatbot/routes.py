@@ -1,9 +1,11 @@
-from datetime import datetime
 import logging
 from flask import Blueprint, render_template, request, jsonify, session
 from flask_login import login_required, current_user
 from decorators import json_response
 from chatbot_core import chatbot
+from chat_history import chat_history, conversation_id
+from gemini_client import GeminiError
+from sse import stream_generation, wants_event_stream
 from flask_wtf.csrf import CSRFProtect
 from flask import current_app   
 
@@ -30,20 +32,29 @@ def send_message():
     if not message:
         return {'error': 'Message is required'}, 400
         
-    # Initialize chat history if not exists
-    if 'chat_history' not in session:
-        session['chat_history'] = []
+    user_id = current_user.id
+    conversation = conversation_id()
+    # Older versions kept the transcript in the cookie itself
+    session.pop('chat_history', None)
+    summary, history = chat_history.context(user_id, conversation)
+    
+    if wants_event_stream():
+        def finish(text):
+            chat_history.append(user_id, conversation, message, text)
+            return {'response': text, 'success': True}
+        
+        return stream_generation(
+            chatbot.stream_message(message, history=history, summary=summary),
+            finish=finish,
+            safe_errors=(GeminiError,)
+        )
     
     # Process the message through the chatbot
     try:
-        response = chatbot.send_message(message)
+        response = chatbot.send_message(message, history=history, summary=summary)
         
         # Update chat history
-        session['chat_history'].append({
-            'user': message,
-            'bot': response,
-            'timestamp': datetime.utcnow().isoformat()
-        })
+        chat_history.append(user_id, conversation, message, response)
         
         return {
             'response': response,
@@ -9,6 +9,7 @@ from flask_login import login_required, current_user
 from . import dashboard_bp
 from database import get_neo4j_db, safe_run, _node_to_dict
 from decorators import role_required
+from notification_writer import decode_data
 
 logger = logging.getLogger(__name__)
 
@@ -296,6 +297,7 @@ def notifications():
             if result:
                 for record in result:
                     node_data = _node_to_dict(record['n'])
+                    node_data['data'] = decode_data(node_data.get('data'))
                     notifications_list.append(node_data)
                     if not node_data.get('is_read'):
                         unread_count += 1
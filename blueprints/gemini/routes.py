@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from flask_login import login_required, current_user
 from gemini_client import get_gemini_response
+from gemini_governor import PRIORITY_BACKGROUND
 import logging
 
 gemini_bp = Blueprint('gemini', __name__)
@@ -36,7 +37,8 @@ Respond in {language} language.
 
 Provide ONLY the improved description without any additional commentary."""
 
-        response = get_gemini_response(prompt)
+        # A rewrite: asking again should give a fresh variation
+        response = get_gemini_response(prompt, use_cache=False)
         
         return jsonify({
             'status': 'success',
@@ -71,7 +73,7 @@ Respond in {language} language.
 
 Format as a numbered list with brief explanations for each tip."""
 
-        response = get_gemini_response(prompt)
+        response = get_gemini_response(prompt, priority=PRIORITY_BACKGROUND)
         
         return jsonify({
             'status': 'success',
@@ -11,21 +11,108 @@ import uuid
 import json
 import logging
 import os
+import re
 from datetime import datetime, timedelta
 from flask import render_template, request, redirect, url_for, flash, jsonify, current_app, g
 from flask_login import login_required, current_user
 from werkzeug.utils import secure_filename
 
 from . import jobs_bp
-from database import get_neo4j_db, safe_run, _node_to_dict
+from database import get_neo4j_db, safe_run, _node_to_dict, read as db_read, write as db_write
 from models import Job, JobApplication, Business, User
 from forms import JobForm, JobApplicationForm, SearchForm
 from decorators import role_required, login_required_optional, json_response, verified_required
 from tasks import send_email_task, create_notification_task
 from extensions import csrf
+from retrieval_index import index_job
+from cache_tags import get_tagged, set_tagged, invalidate_tags
+from pagination import KeysetPager
+from gemini_governor import governor, PRIORITY_BACKGROUND
+from sse import stream_generation, wants_event_stream
+from map_clusters import bbox_condition, cluster_params, cluster_query, request_viewport, split_cells
 
 logger = logging.getLogger(__name__)
 
+# Full-text job search over the job_text and business_name_text indexes
+# (see migrations.py). Lucene scores with BM25; a job matching on both its own
+# text and its business name gets the sum of both scores.
+_FULLTEXT_JOBS = """
+    CALL {
+        CALL db.index.fulltext.queryNodes('job_text', $ft_query) YIELD node, score
+        RETURN node AS j, score
+        UNION ALL
+        CALL db.index.fulltext.queryNodes('business_name_text', $ft_query) YIELD node, score
+        MATCH (j:Job)-[:POSTED_BY]->(node)
+        RETURN j, score
+    }
+    WITH j, sum(score) AS score
+"""
+
+_FULLTEXT_TERM_RE = re.compile(r'\w+')
+
+# Facets on the jobs board: (name, the filter's condition). Each facet counts
+# the jobs that pass every filter except its own, so picking a category still
+# shows the counts for the other categories.
+_JOB_FACETS = (
+    ('category', 'j.category = $category'),
+    ('type', 'j.type = $job_type'),
+    ('setup', 'j.setup = $setup'),
+    ('location', 'toLower(j.location) CONTAINS toLower($location)'),
+)
+
+# Total and facet counts in one aggregating pass: every matched job is
+# unwound into one (facet, value) entry per facet it counts towards, plus one
+# 'total' entry when it passes all filters. Only counts leave the subquery.
+_JOB_COUNTS_SUBQUERY = """
+            CALL {{
+                {base}
+                WITH j
+                UNWIND [{entries}] AS f
+                WITH f WHERE f.ok AND f.value IS NOT NULL
+                WITH f.name AS name, f.value AS value, count(*) AS count
+                ORDER BY count DESC
+                RETURN collect({{name: name, value: value, count: count}}) AS counts
+            }}
+"""
+
+_JOB_FACETS_CACHE_KEY = 'jobs:facets:unfiltered'
+_JOB_FACETS_CACHE_TIMEOUT = 300
+
+
+def _fulltext_query(text, match_all=True):
+    """Build a Lucene query string from free text.
+
+    Each term matches exactly (boosted), as a prefix for type-ahead, or
+    fuzzily within one edit for terms of four or more characters. Terms are
+    ANDed by default; match_all=False ORs them (used for keyword expansions).
+    Returns '' when the text has no searchable terms.
+    """
+    clauses = []
+    for term in _FULLTEXT_TERM_RE.findall(text.lower()):
+        options = [f"{term}^3", f"{term}*"]
+        if len(term) >= 4:
+            options.append(f"{term}~1")
+        clauses.append("(" + " OR ".join(options) + ")")
+    return (" AND " if match_all else " OR ").join(clauses)
+
+
+def _search_active_jobs(session, ft_query, category=None, limit=10):
+    """Active jobs matching a Lucene query, best match first"""
+    query = _FULLTEXT_JOBS + """
+        MATCH (j)-[:POSTED_BY]->(b:Business)
+        WHERE j.is_active = true
+    """
+    params = {'ft_query': ft_query, 'limit': limit}
+    if category:
+        query += " AND j.category = $category"
+        params['category'] = category
+    query += """
+        RETURN j, b.name as business_name, score
+        ORDER BY score DESC, j.created_at DESC
+        LIMIT $limit
+    """
+    return safe_run(session, query, params)
+
 # ============================================================================
 # JOB LISTING & FILTERING ROUTES
 # ============================================================================
@@ -45,8 +132,10 @@ def list_jobs():
     - salary_min: minimum salary
     - salary_max: maximum salary
     - location: filter by location
-    - sort: sorting option (latest, salary_high, salary_low, alphabetical)
-    - page: pagination page number
+    - sort: sorting option (relevance, latest, salary_high, salary_low, alphabetical);
+      defaults to relevance when searching
+    - page: pagination page number (the first few pages only)
+    - cursor: keyset cursor for the next/previous page
     """
     
     # Get form parameters
@@ -57,131 +146,117 @@ def list_jobs():
     salary_min = request.args.get('salary_min', type=int)
     salary_max = request.args.get('salary_max', type=int)
     location = request.args.get('location', '').strip()
-    sort_by = request.args.get('sort', 'latest')
-    page = request.args.get('page', 1, type=int)
+    sort_by = request.args.get('sort') or ('relevance' if search_query else 'latest')
     view = request.args.get('view', 'grid')  # grid or list or map
     
     per_page = 12
-    skip = (page - 1) * per_page
+    
+    # Sort keys end in j.id so the keyset cursor is unique
+    ft_query = _fulltext_query(search_query) if search_query else ''
+    if sort_by == 'relevance' and ft_query:
+        sort_keys = [('score', 'DESC'), ('j.created_at', 'DESC'), ('j.id', 'DESC')]
+    elif sort_by == 'salary_high':
+        sort_keys = [('coalesce(j.salary_max, 0)', 'DESC'), ('coalesce(j.salary_min, 0)', 'DESC'), ('j.id', 'DESC')]
+    elif sort_by == 'salary_low':
+        sort_keys = [('coalesce(j.salary_min, 0)', 'ASC'), ('j.id', 'ASC')]
+    elif sort_by == 'alphabetical':
+        sort_keys = [("coalesce(j.title, '')", 'ASC'), ('j.id', 'ASC')]
+    else:  # latest
+        sort_keys = [('j.created_at', 'DESC'), ('j.id', 'DESC')]
+    pager = KeysetPager.from_request(sort_keys, per_page)
+    
+    # The unfiltered board's facet counts are shared by every visitor, so
+    # cache them and drop the facet subqueries from the query on a hit
+    unfiltered = not (search_query or category or job_type or setup or location
+                      or salary_min or salary_max)
+    facets = get_tagged(_JOB_FACETS_CACHE_KEY, ['job:*']) if unfiltered else None
     
     db = get_neo4j_db()
     with db.session() as session:
-        # Build base query
-        query = """
-            MATCH (j:Job)-[:POSTED_BY]->(b:Business)
-            WHERE j.is_active = true
-        """
-        params = {
-            'skip': skip,
-            'per_page': per_page
-        }
-        
-        # Add search filters
-        if search_query:
-            query += " AND (toLower(j.title) CONTAINS toLower($search) OR toLower(j.description) CONTAINS toLower($search) OR toLower(b.name) CONTAINS toLower($search))"
-            params['search'] = search_query
-        
-        if category:
-            query += " AND j.category = $category"
-            params['category'] = category
-        
-        if job_type:
-            query += " AND j.type = $job_type"
-            params['job_type'] = job_type
-        
-        if setup:
-            query += " AND j.setup = $setup"
-            params['setup'] = setup
+        # Build base query; a text search starts from the full-text indexes
+        # so its cost scales with the matches rather than every active job
+        params = {**pager.params}
+        if ft_query:
+            base = _FULLTEXT_JOBS + """
+                MATCH (j)-[:POSTED_BY]->(b:Business)
+                WHERE j.is_active = true
+            """
+            params['ft_query'] = ft_query
+        else:
+            base = """
+                MATCH (j:Job)-[:POSTED_BY]->(b:Business)
+                WHERE j.is_active = true
+            """
         
+        # Salary bounds narrow every row; the faceted filters are kept apart so
+        # each facet can ignore its own filter
         if salary_min:
-            query += " AND (j.salary_min IS NULL OR j.salary_min >= $salary_min)"
+            base += " AND (j.salary_min IS NULL OR j.salary_min >= $salary_min)"
             params['salary_min'] = salary_min
         
         if salary_max:
-            query += " AND (j.salary_max IS NULL OR j.salary_max <= $salary_max)"
+            base += " AND (j.salary_max IS NULL OR j.salary_max <= $salary_max)"
             params['salary_max'] = salary_max
         
-        if location:
-            query += " AND toLower(j.location) CONTAINS toLower($location)"
-            params['location'] = location
-        
-        # Add sorting
-        sort_clause = ""
-        if sort_by == 'salary_high':
-            sort_clause = " ORDER BY j.salary_max DESC, j.salary_min DESC"
-        elif sort_by == 'salary_low':
-            sort_clause = " ORDER BY j.salary_min ASC"
-        elif sort_by == 'alphabetical':
-            sort_clause = " ORDER BY j.title ASC"
-        else:  # latest
-            sort_clause = " ORDER BY j.created_at DESC"
-        
-        # Execute query
-        query += sort_clause + " SKIP $skip LIMIT $per_page"
-        query += """
-            RETURN j, b.id as business_id, b.name as business_name, b.latitude as business_lat, b.longitude as business_lng
-        """
-        
-        jobs_result = safe_run(session, query, params)
-        
-        # Get total count
-        count_query = """
-            MATCH (j:Job)-[:POSTED_BY]->(b:Business)
-            WHERE j.is_active = true
+        filter_values = {'category': category, 'type': job_type, 'setup': setup, 'location': location}
+        filters = {name: condition for name, condition in _JOB_FACETS if filter_values[name]}
+        params.update({'category': category, 'job_type': job_type, 'setup': setup, 'location': location})
+        
+        def passes(names):
+            return ' AND '.join(f"({filters[name]})" for name in names if name in filters) or 'true'
+        
+        # The page: filters and the cursor's bound go into the WHERE, so the
+        # sort index serves ORDER BY ... LIMIT and deep pages cost like the first
+        page_conditions = ''.join(f" AND {condition}" for condition in filters.values())
+        query = f"""
+            CALL {{
+                {base}{page_conditions}{pager.where_and()}
+                WITH j, b, {'score' if ft_query else 'null AS score'}
+                {pager.order_by()}
+                {pager.limit_clause()}
+                RETURN collect({{
+                    job: j, k: {pager.key_list()}, business_id: b.id, business_name: b.name,
+                    business_lat: b.latitude, business_lng: b.longitude
+                }}) AS page
+            }}
         """
-        count_params = {}
-        
-        if search_query:
-            count_query += " AND (toLower(j.title) CONTAINS toLower($search) OR toLower(j.description) CONTAINS toLower($search) OR toLower(b.name) CONTAINS toLower($search))"
-            count_params['search'] = search_query
-        
-        if category:
-            count_query += " AND j.category = $category"
-            count_params['category'] = category
-        
-        if job_type:
-            count_query += " AND j.type = $job_type"
-            count_params['job_type'] = job_type
-        
-        if setup:
-            count_query += " AND j.setup = $setup"
-            count_params['setup'] = setup
-        
-        if location:
-            count_query += " AND toLower(j.location) CONTAINS toLower($location)"
-            count_params['location'] = location
-        
-        count_query += " RETURN count(j) as total"
         
-        count_result = safe_run(session, count_query, count_params)
-        total = count_result[0]['total'] if count_result else 0
-        
-        # Get category counts
-        categories_result = safe_run(session, """
-            MATCH (j:Job)
-            WHERE j.is_active = true
-            RETURN j.category as category, count(j) as count
-            ORDER BY count DESC
-        """, {})
-        
-        category_counts = {}
-        for record in categories_result:
-            if record['category']:
-                category_counts[record['category']] = record['count']
+        # Exact total, plus the facet counts unless they came from the cache
+        entries = [f"{{name: 'total', value: true, ok: {passes(filters)}}}"]
+        if facets is None:
+            entries += [f"{{name: '{name}', value: j.{name}, ok: {passes(n for n in filters if n != name)}}}"
+                        for name, _ in _JOB_FACETS]
+        query += _JOB_COUNTS_SUBQUERY.format(base=base, entries=', '.join(entries))
+        
+        # Execute query: page rows, total and facets in one round trip
+        result = safe_run(session, query + " RETURN page, counts", params)
+        record = result[0] if result else {}
+        counts = record.get('counts') or []
+        total = next((item['count'] for item in counts if item['name'] == 'total'), 0)
+        
+        if facets is None:
+            facets = {name: {} for name, _ in _JOB_FACETS}
+            for item in counts:
+                if item['name'] in facets:
+                    facets[item['name']][item['value']] = item['count']
+            if unfiltered and result:
+                set_tagged(_JOB_FACETS_CACHE_KEY, facets, ['job:*'], timeout=_JOB_FACETS_CACHE_TIMEOUT)
+        
+        category_counts = facets.get('category', {})
         
         # Convert results to Job objects
         jobs_list = []
         map_markers = []
         
-        for record in jobs_result:
-            job_data = _node_to_dict(record['j'])
-            job_data['business_id'] = record['business_id']
-            job_data['business_name'] = record['business_name']
+        for row in pager.paginate(record.get('page') or [], keys_of=lambda row: row['k']):
+            job_data = _node_to_dict(row['job'])
+            job_data['business_id'] = row['business_id']
+            job_data['business_name'] = row['business_name']
             
             # Use business coordinates for job location on map
-            if record['business_lat'] and record['business_lng']:
-                job_data['latitude'] = record['business_lat']
-                job_data['longitude'] = record['business_lng']
+            if row['business_lat'] and row['business_lng']:
+                job_data['latitude'] = row['business_lat']
+                job_data['longitude'] = row['business_lng']
             
             job = Job(**job_data)
             jobs_list.append(job)
@@ -222,10 +297,12 @@ def list_jobs():
         jobs_data=jobs_data,
         map_markers=json.dumps(map_markers),
         total_jobs=total,
-        current_page=page,
+        current_page=pager.page,
         total_pages=pages,
         per_page=per_page,
+        pager=pager,
         category_counts=category_counts,
+        facets=facets,
         search_query=search_query,
         category=category,
         job_type=job_type,
@@ -313,6 +390,15 @@ def job_detail(job_id):
 # JOB APPLICATION ROUTES
 # ============================================================================
 
+
+def _discard_upload(path):
+    """Remove an uploaded file that ended up unused"""
+    try:
+        os.remove(path)
+    except OSError as e:
+        logger.warning(f"Failed to remove unused upload {path}: {e}")
+
+
 @jobs_bp.route('/<job_id>/apply', methods=['GET', 'POST'])
 @login_required
 @role_required('job_seeker')
@@ -346,174 +432,157 @@ def apply_job(job_id):
         return render_template('jobs/job_apply.html', job=job)
     
     # POST request - handle application submission
-    db = get_neo4j_db()
-    with db.session() as session:
-        # Check if job exists and is active, and get business owner info
-        job_result = safe_run(session, """
-            MATCH (j:Job {id: $job_id})-[:POSTED_BY]->(b:Business)
-            MATCH (u:User)-[:OWNS]->(b)
-            WHERE j.is_active = true
-            RETURN j, b.id as business_id, b.name as business_name, b.email as business_email, u.email as owner_email, u.id as owner_id
-        """, {'job_id': job_id})
-        
-        if not job_result:
-            flash('Job not found or no longer active.', 'error')
-            return redirect(url_for('jobs.list_jobs'))
-        
-        # Check if job is filled
-        job_data = _node_to_dict(job_result[0]['j'])
-        if job_data.get('status') == 'filled':
-            flash('This job has already been filled.', 'error')
-            return redirect(url_for('jobs.job_detail', job_id=job_id))
-        
-        # Check if already applied
-        existing_result = safe_run(session, """
-            MATCH (u:User {id: $user_id})-[:APPLIED_TO]->(:JobApplication)-[:FOR_JOB]->(j:Job {id: $job_id})
-            RETURN count(*) as count
-        """, {'user_id': current_user.id, 'job_id': job_id})
-        
-        if existing_result[0]['count'] > 0:
-            flash('You have already applied for this job.', 'warning')
-            return redirect(url_for('jobs.job_detail', job_id=job_id))
-        
-        cover_letter = request.form.get('cover_letter', '').strip()
-        cv_file = request.files.get('cv')
-        
-        # Validate CV
-        if not cv_file or cv_file.filename == '':
-            return jsonify({'error': 'CV is required.'}), 400
-        
-        # Save CV file
-        filename = secure_filename(cv_file.filename)
-        file_ext = filename.rsplit('.', 1)[1].lower() if '.' in filename else ''
-        
-        if file_ext not in ['pdf', 'doc', 'docx', 'txt']:
-            return jsonify({'error': 'Only PDF, DOC, DOCX, and TXT files are allowed.'}), 400
-        
-        # Create application
-        application_id = str(uuid.uuid4())
-        cv_filename = f"{application_id}.{file_ext}"
-        cv_path = f"applications/{current_user.id}/{job_id}/{cv_filename}"
-        
-        full_path = os.path.join(current_app.config['UPLOAD_FOLDER'], cv_path)
-        os.makedirs(os.path.dirname(full_path), exist_ok=True)
-        
-        try:
-            cv_file.save(full_path)
-        except Exception as e:
-            logger.error(f"Failed to save CV: {str(e)}")
-            return jsonify({'error': 'Failed to save CV. Please try again.'}), 500
-        
-        # Fetch user's resume from database
-        user_resume = safe_run(session, """
-            MATCH (u:User {id: $user_id})
-            RETURN u.resume_data as resume_data
-        """, {'user_id': current_user.id})
-        
-        user_resume_data = user_resume[0]['resume_data'] if user_resume and user_resume[0]['resume_data'] else None
-        
-        # Create application in database
-        application_data = {
-            'id': application_id,
-            'uuid': str(uuid.uuid4()),
-            'job_id': job_id,
-            'job_title': job_result[0]['j']['title'],
-            'business_id': job_result[0]['business_id'],
-            'business_name': job_result[0]['business_name'],
-            'applicant_id': current_user.id,
-            'applicant_name': current_user.username,
-            'applicant_email': current_user.email,
-            'applicant_phone': current_user.phone or '',
-            'cover_letter': cover_letter,
-            'cv_file': cv_path,
-            'resume_data': user_resume_data,
-            'status': 'pending',
-            'created_at': datetime.utcnow().isoformat(),
-            'updated_at': datetime.utcnow().isoformat()
-        }
-        
-        safe_run(session, """
-            CREATE (a:JobApplication $app_data)
-            WITH a
+    # Job, owner, duplicate check and stored resume in one read
+    job_result = db_read("""
+        MATCH (j:Job {id: $job_id})-[:POSTED_BY]->(b:Business)
+        MATCH (owner:User)-[:OWNS]->(b)
+        WHERE j.is_active = true
+        MATCH (u:User {id: $user_id})
+        RETURN j, b.id as business_id, b.name as business_name,
+               owner.email as owner_email, owner.id as owner_id,
+               u.resume_data as resume_data,
+               EXISTS { (u)-[:APPLIED_TO]->(:JobApplication)-[:FOR_JOB]->(j) } as already_applied
+        LIMIT 1
+    """, {'job_id': job_id, 'user_id': current_user.id})
+    
+    if not job_result:
+        flash('Job not found or no longer active.', 'error')
+        return redirect(url_for('jobs.list_jobs'))
+    
+    # Check if job is filled
+    job_data = _node_to_dict(job_result[0]['j'])
+    if job_data.get('status') == 'filled':
+        flash('This job has already been filled.', 'error')
+        return redirect(url_for('jobs.job_detail', job_id=job_id))
+    
+    # Check if already applied
+    if job_result[0]['already_applied']:
+        flash('You have already applied for this job.', 'warning')
+        return redirect(url_for('jobs.job_detail', job_id=job_id))
+    
+    cover_letter = request.form.get('cover_letter', '').strip()
+    cv_file = request.files.get('cv')
+    
+    # Validate CV
+    if not cv_file or cv_file.filename == '':
+        return jsonify({'error': 'CV is required.'}), 400
+    
+    # Save CV file
+    filename = secure_filename(cv_file.filename)
+    file_ext = filename.rsplit('.', 1)[1].lower() if '.' in filename else ''
+    
+    if file_ext not in ['pdf', 'doc', 'docx', 'txt']:
+        return jsonify({'error': 'Only PDF, DOC, DOCX, and TXT files are allowed.'}), 400
+    
+    # Create application
+    application_id = str(uuid.uuid4())
+    cv_filename = f"{application_id}.{file_ext}"
+    cv_path = f"applications/{current_user.id}/{job_id}/{cv_filename}"
+    
+    full_path = os.path.join(current_app.config['UPLOAD_FOLDER'], cv_path)
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    
+    try:
+        cv_file.save(full_path)
+    except Exception as e:
+        logger.error(f"Failed to save CV: {str(e)}")
+        return jsonify({'error': 'Failed to save CV. Please try again.'}), 500
+    
+    user_resume_data = job_result[0]['resume_data'] or None
+    
+    # Create application in database
+    application_data = {
+        'id': application_id,
+        'uuid': str(uuid.uuid4()),
+        'job_id': job_id,
+        'job_title': job_result[0]['j']['title'],
+        'business_id': job_result[0]['business_id'],
+        'business_name': job_result[0]['business_name'],
+        'applicant_id': current_user.id,
+        'applicant_name': current_user.username,
+        'applicant_email': current_user.email,
+        'applicant_phone': current_user.phone or '',
+        'cover_letter': cover_letter,
+        'cv_file': cv_path,
+        'resume_data': user_resume_data,
+        'status': 'pending',
+        'created_at': datetime.utcnow().isoformat(),
+        'updated_at': datetime.utcnow().isoformat()
+    }
+    
+    # Create the application and bump the counter atomically; the guard
+    # re-checks for a concurrent duplicate inside the transaction
+    try:
+        created = db_write("""
             MATCH (u:User {id: $user_id}), (j:Job {id: $job_id})
+            WHERE NOT EXISTS { (u)-[:APPLIED_TO]->(:JobApplication)-[:FOR_JOB]->(j) }
+            CREATE (a:JobApplication $app_data)
             CREATE (u)-[:APPLIED_TO]->(a)-[:FOR_JOB]->(j)
+            SET j.applications_count = coalesce(j.applications_count, 0) + 1
+            RETURN a.id as id
         """, {
             'app_data': application_data,
             'user_id': current_user.id,
             'job_id': job_id
         })
-        
-        # Update job applications count
-        safe_run(session, """
-            MATCH (j:Job {id: $job_id})
-            SET j.applications_count = coalesce(j.applications_count, 0) + 1
-        """, {'job_id': job_id})
-        
-        # Get owner info for email
-        owner_result = safe_run(session, """
-            MATCH (j:Job {id: $job_id})-[:POSTED_BY]->(b:Business)
-            MATCH (owner:User)-[:OWNS]->(b)
-            RETURN owner.email as owner_email, owner.id as owner_id, b.name as business_name
-        """, {'job_id': job_id})
-        
-        owner_email = owner_result[0]['owner_email'] if owner_result else None
-        
-        # Send email to business owner
-        if owner_email:
-            try:
-                email_context = {
-                    'job_title': job_result[0]['j']['title'],
-                    'business_name': job_result[0]['business_name'],
-                    'applicant_name': current_user.username,
-                    'applicant_email': current_user.email,
-                    'applicant_phone': current_user.phone or 'N/A',
-                    'cover_letter': cover_letter or 'No cover letter provided',
-                    'application_date': datetime.utcnow().strftime('%B %d, %Y at %I:%M %p'),
-                    'app_dashboard_url': url_for('dashboard.business_owner', _external=True),
-                    'application_id': application_id,
-                    'has_resume': bool(user_resume_data),
-                    'has_cv': True,
-                    'cv_filename': f"{application_id}.{file_ext}"
-                }
-                
-                from tasks import send_email_task_wrapper
-                send_email_task_wrapper(
-                    to=owner_email,
-                    subject=f'New Job Application: {job_result[0]["j"]["title"]} - {current_user.username}',
-                    template='emails/job_application_notification.html',
-                    context=email_context
-                )
-            except Exception as e:
-                logger.error(f"Failed to send application notification email: {str(e)}")
-        
-        # Create notification for business owner - verify owner exists first
-        if owner_result and owner_result[0]['owner_id']:
-            owner_id = owner_result[0]['owner_id']
-            
-            # Verify owner user exists in database
-            owner_check_result = safe_run(session, """
-                MATCH (u:User {id: $user_id})
-                RETURN u.id as id
-            """, {'user_id': owner_id})
+    except Exception:
+        _discard_upload(full_path)
+        raise
+    
+    if not created:
+        # No application points at the CV just saved
+        _discard_upload(full_path)
+        flash('You have already applied for this job.', 'warning')
+        return redirect(url_for('jobs.job_detail', job_id=job_id))
+    
+    owner_email = job_result[0]['owner_email']
+    owner_id = job_result[0]['owner_id']
+    
+    # Send email to business owner
+    if owner_email:
+        try:
+            email_context = {
+                'job_title': job_result[0]['j']['title'],
+                'business_name': job_result[0]['business_name'],
+                'applicant_name': current_user.username,
+                'applicant_email': current_user.email,
+                'applicant_phone': current_user.phone or 'N/A',
+                'cover_letter': cover_letter or 'No cover letter provided',
+                'application_date': datetime.utcnow().strftime('%B %d, %Y at %I:%M %p'),
+                'app_dashboard_url': url_for('dashboard.business_owner', _external=True),
+                'application_id': application_id,
+                'has_resume': bool(user_resume_data),
+                'has_cv': True,
+                'cv_filename': f"{application_id}.{file_ext}"
+            }
             
-            if owner_check_result:
-                create_notification_task(
-                    user_id=owner_id,
-                    type='job_application',
-                    title='New Job Application',
-                    message=f'{current_user.username} applied for {job_result[0]["j"]["title"]}',
-                    data={
-                        'application_id': application_id,
-                        'job_id': job_id,
-                        'applicant_id': current_user.id,
-                        'applicant_name': current_user.username
-                    }
-                )
-            else:
-                logger.warning(f"Owner user {owner_id} not found in database for notification")
-        
-        flash('Application submitted successfully!', 'success')
-        return jsonify({'success': True, 'message': 'Application submitted successfully!', 'redirect_url': url_for('jobs.job_detail', job_id=job_id)})
+            from tasks import send_email_task_wrapper
+            send_email_task_wrapper(
+                to=owner_email,
+                subject=f'New Job Application: {job_result[0]["j"]["title"]} - {current_user.username}',
+                template='emails/job_application_notification.html',
+                context=email_context
+            )
+        except Exception as e:
+            logger.error(f"Failed to send application notification email: {str(e)}")
+    
+    # Create notification for business owner (matched via OWNS above, so it exists)
+    if owner_id:
+        create_notification_task(
+            user_id=owner_id,
+            type='job_application',
+            title='New Job Application',
+            message=f'{current_user.username} applied for {job_result[0]["j"]["title"]}',
+            data={
+                'application_id': application_id,
+                'job_id': job_id,
+                'applicant_id': current_user.id,
+                'applicant_name': current_user.username
+            }
+        )
+    
+    flash('Application submitted successfully!', 'success')
+    return jsonify({'success': True, 'message': 'Application submitted successfully!', 'redirect_url': url_for('jobs.job_detail', job_id=job_id)})
 
 @jobs_bp.route('/applications')
 @login_required
@@ -617,6 +686,8 @@ def create_job():
                 'job_data': job_data,
                 'business_id': form.business_id.data
             })
+        invalidate_tags('job:*')
+        index_job(job_id)
         
         flash('Job posted successfully!', 'success')
         return redirect(url_for('jobs.job_detail', job_id=job_id))
@@ -678,6 +749,8 @@ def edit_job(job_id):
                 'job_id': job_id,
                 'update_data': update_data
             })
+        invalidate_tags('job:*', f'job:{job_id}')
+        index_job(job_id)
         
         flash('Job updated successfully!', 'success')
         return redirect(url_for('jobs.job_detail', job_id=job_id))
@@ -727,6 +800,8 @@ def close_job(job_id):
             SET j.is_active = false
             RETURN j
         """, {'job_id': job_id})
+    invalidate_tags('job:*', f'job:{job_id}')
+    index_job(job_id)
     
     flash('Job closed successfully!', 'success')
     return redirect(url_for('jobs.my_postings'))
@@ -1316,46 +1391,61 @@ def message_applicant(application_id):
 @jobs_bp.route('/api/map-markers')
 @login_required_optional
 def get_map_markers():
-    """Get job markers for map display"""
+    """Get job markers in the map viewport (?bbox=west,south,east,north&zoom=).
+
+    Callers that send no bbox (or bounds) get the flat marker list this
+    endpoint returned before viewports, capped at 100.
+    """
     
-    bbox = request.args.get('bbox')  # bounding box for map view
+    bbox, zoom = request_viewport(request.args)
+    viewport = bool(request.args.get('bbox') or request.args.get('bounds'))
     category = request.args.get('category', '').strip()
     
     db = get_neo4j_db()
     with db.session() as session:
-        query = """
-            MATCH (j:Job)-[:POSTED_BY]->(b:Business)
-            WHERE j.is_active = true AND j.latitude IS NOT NULL AND j.longitude IS NOT NULL
+        # Jobs sit at their business' location, so the viewport is matched
+        # on the business_position index and the jobs are expanded from there
+        match = f"""
+            MATCH (b:Business)
+            WHERE {bbox_condition('b.position')}
+            MATCH (j:Job)-[:POSTED_BY]->(b)
+            WHERE j.is_active = true
         """
-        params = {}
+        params = cluster_params(bbox, zoom)
         
         if category:
-            query += " AND j.category = $category"
+            match += " AND j.category = $category"
             params['category'] = category
         
-        query += """
-            RETURN j, b.name as business_name
-            LIMIT 100
-        """
-        
-        results = safe_run(session, query, params)
-        
-        markers = []
-        for record in results:
-            job_data = _node_to_dict(record['j'])
-            marker = {
-                'id': job_data['id'],
-                'title': job_data['title'],
-                'business': record['business_name'],
-                'lat': float(job_data['latitude']),
-                'lng': float(job_data['longitude']),
-                'salary': f"₱{job_data.get('salary_min', 'TBD')} - ₱{job_data.get('salary_max', 'TBD')}",
-                'type': Job.JOB_TYPES.get(job_data['type'], job_data['type']),
-                'url': url_for('jobs.job_detail', job_id=job_data['id'])
-            }
-            markers.append(marker)
+        item = ("{id: j.id, title: j.title, business: b.name, type: j.type, "
+                "salary_min: j.salary_min, salary_max: j.salary_max, "
+                "lat: b.position.latitude, lng: b.position.longitude}")
+        if viewport:
+            rows = safe_run(session, cluster_query(match, 'b.position', item), params)
+        else:
+            rows = safe_run(session, match + f" RETURN {item} AS item LIMIT 100", params)
+    if viewport:
+        clusters, points = split_cells(rows, zoom)
+    else:
+        points = [row['item'] for row in rows]
+    
+    markers = []
+    for job_data in points:
+        marker = {
+            'id': job_data['id'],
+            'title': job_data['title'],
+            'business': job_data['business'],
+            'lat': job_data['lat'],
+            'lng': job_data['lng'],
+            'salary': f"₱{job_data.get('salary_min') or 'TBD'} - ₱{job_data.get('salary_max') or 'TBD'}",
+            'type': Job.JOB_TYPES.get(job_data['type'], job_data['type']),
+            'url': url_for('jobs.job_detail', job_id=job_data['id'])
+        }
+        markers.append(marker)
     
-    return jsonify(markers)
+    if not viewport:
+        return jsonify(markers)
+    return jsonify({'zoom': zoom, 'markers': markers, 'clusters': clusters})
 
 @jobs_bp.route('/api/search')
 def api_search_jobs():
@@ -1367,28 +1457,28 @@ def api_search_jobs():
     
     db = get_neo4j_db()
     with db.session() as session:
-        # Step 1: Try manual search first (case-insensitive)
-        cypher_query = """
-            MATCH (j:Job)-[:POSTED_BY]->(b:Business)
-            WHERE j.is_active = true
-        """
-        params = {'limit': limit}
-        
-        if query:
-            cypher_query += " AND (toLower(j.title) CONTAINS toLower($query) OR toLower(j.description) CONTAINS toLower($query))"
-            params['query'] = query
-        
-        if category:
-            cypher_query += " AND j.category = $category"
-            params['category'] = category
-        
-        cypher_query += """
-            RETURN j, b.name as business_name
-            ORDER BY j.created_at DESC
-            LIMIT $limit
-        """
-        
-        results = safe_run(session, cypher_query, params)
+        # Step 1: Try manual search first (full-text, with prefix and fuzzy matching)
+        ft_query = _fulltext_query(query) if query else ''
+        if ft_query:
+            results = _search_active_jobs(session, ft_query, category, limit)
+        else:
+            cypher_query = """
+                MATCH (j:Job)-[:POSTED_BY]->(b:Business)
+                WHERE j.is_active = true
+            """
+            params = {'limit': limit}
+            
+            if category:
+                cypher_query += " AND j.category = $category"
+                params['category'] = category
+            
+            cypher_query += """
+                RETURN j, b.name as business_name
+                ORDER BY j.created_at DESC
+                LIMIT $limit
+            """
+            
+            results = safe_run(session, cypher_query, params)
         
         jobs = []
         for record in results:
@@ -1412,35 +1502,16 @@ Examples:
 - If query is "code" → programmer, developer, software engineer, coding, backend, frontend, python
 - If query is "manage" → manager, management, supervisor, administrator, leader, coordinator, director"""
                 
-                keywords_response = get_gemini_response(expansion_prompt)
+                keywords_response = get_gemini_response(expansion_prompt, priority=PRIORITY_BACKGROUND)
                 expanded_keywords = [k.strip() for k in keywords_response.split('\n') if k.strip()][:6]
                 
-                if expanded_keywords:
+                expanded_ft_query = _fulltext_query(' '.join(expanded_keywords), match_all=False)
+                
+                if expanded_ft_query:
                     logger.info(f"AI expanded '{query}' to: {expanded_keywords}")
                     
-                    # Build search conditions with expanded keywords
-                    conditions = [f"toLower(j.title) CONTAINS toLower('{kw}') OR toLower(j.description) CONTAINS toLower('{kw}')" 
-                                 for kw in expanded_keywords]
-                    where_conditions = "(" + " OR ".join(conditions) + ")"
-                    
-                    ai_query = """
-                        MATCH (j:Job)-[:POSTED_BY]->(b:Business)
-                        WHERE j.is_active = true AND """ + where_conditions
-                    
-                    if category:
-                        ai_query += " AND j.category = $category"
-                    
-                    ai_query += """
-                        RETURN j, b.name as business_name
-                        ORDER BY j.created_at DESC
-                        LIMIT $limit
-                    """
-                    
-                    ai_params = {'limit': limit}
-                    if category:
-                        ai_params['category'] = category
-                    
-                    ai_results = safe_run(session, ai_query, ai_params)
+                    # Any expanded keyword may match; ranked by full-text score
+                    ai_results = _search_active_jobs(session, expanded_ft_query, category, limit)
                     
                     for record in ai_results:
                         job_data = _node_to_dict(record['j'])
@@ -1471,38 +1542,35 @@ def ai_search_jobs():
     category = request.args.get('category', '').strip()
     limit = request.args.get('limit', 12, type=int)
     
-    # Check if API quota is exhausted
-    import pathlib
-    project_root = pathlib.Path(__file__).parent.parent.parent  # From blueprints/jobs/routes.py to project root
-    quota_disabled_file = project_root / '.gemini_quota_disabled'
-    ai_quota_exhausted = quota_disabled_file.exists()
+    # Skip AI search while the Gemini budget is low or the circuit is open
+    ai_quota_exhausted = not governor.available(PRIORITY_BACKGROUND)
     
     # For short queries (< 4 chars), use manual search instead to preserve API quota
     # Also skip AI search if quota has been exhausted
     if not query or len(query) < 4 or ai_quota_exhausted:
         if ai_quota_exhausted:
-            logger.info(f"API quota exhausted, using manual search for: {query}")
+            logger.info(f"Gemini budget exhausted, using manual search for: {query}")
         elif len(query) < 4:
             logger.debug(f"Query too short for AI search ({len(query)} chars), using manual search")
         db = get_neo4j_db()
         with db.session() as session:
-            cypher_query = """
-                MATCH (j:Job)-[:POSTED_BY]->(b:Business)
-                WHERE j.is_active = true
-            """
-            params = {'limit': limit}
-            
-            if query:
-                cypher_query += " AND (toLower(j.title) CONTAINS toLower($query) OR toLower(j.description) CONTAINS toLower($query))"
-                params['query'] = query
-            
-            if category:
-                cypher_query += " AND j.category = $category"
-                params['category'] = category
-            
-            cypher_query += " RETURN j, b.name as business_name ORDER BY j.created_at DESC LIMIT $limit"
-            
-            results = safe_run(session, cypher_query, params)
+            ft_query = _fulltext_query(query) if query else ''
+            if ft_query:
+                results = _search_active_jobs(session, ft_query, category, limit)
+            else:
+                cypher_query = """
+                    MATCH (j:Job)-[:POSTED_BY]->(b:Business)
+                    WHERE j.is_active = true
+                """
+                params = {'limit': limit}
+                
+                if category:
+                    cypher_query += " AND j.category = $category"
+                    params['category'] = category
+                
+                cypher_query += " RETURN j, b.name as business_name ORDER BY j.created_at DESC LIMIT $limit"
+                
+                results = safe_run(session, cypher_query, params)
             jobs = []
             for record in results:
                 job_data = _node_to_dict(record['j'])
@@ -1548,7 +1616,7 @@ Return ONLY valid JSON, no markdown or extra text.
 Example for "coding":
 {{"primary_keywords": ["coding", "code"], "related_keywords": ["programming", "developer", "software"], "job_titles": ["Software Developer", "Programmer", "Backend Developer"], "skills": ["Python", "JavaScript", "Java"], "categories": ["IT", "Software Development"]}}"""
         
-        intent_response = get_gemini_response(intent_prompt)
+        intent_response = get_gemini_response(intent_prompt, priority=PRIORITY_BACKGROUND)
         
         # Parse the intent response
         try:
@@ -1578,36 +1646,16 @@ Example for "coding":
             all_keywords = intent_data.get('primary_keywords', []) + intent_data.get('related_keywords', []) + intent_data.get('job_titles', [])
             all_keywords = list(set([k.lower().strip() for k in all_keywords if k]))[:10]  # Limit to 10 unique keywords
             
-            search_conditions = []
-            for kw in all_keywords:
-                search_conditions.append(f"(toLower(j.title) CONTAINS '{kw.lower()}' OR toLower(j.description) CONTAINS '{kw.lower()}')")
-            
-            where_clause = " OR ".join(search_conditions) if search_conditions else "1=1"
-            
-            cypher_query = f"""
-                MATCH (j:Job)-[:POSTED_BY]->(b:Business)
-                WHERE j.is_active = true AND ({where_clause})
-            """
-            
-            if category:
-                cypher_query += " AND j.category = $category"
-            
-            cypher_query += f"""
-                RETURN j, b.name as business_name, 
-                    (CASE 
-                        WHEN toLower(j.title) CONTAINS '{query.lower()}' THEN 3
-                        ELSE 1
-                    END) as relevance_score
-                ORDER BY relevance_score DESC, j.created_at DESC
-                LIMIT {limit}
-            """
-            
-            params = {}
-            if category:
-                params['category'] = category
+            # Any expansion may match; jobs that also match the original query
+            # score on both groups and rank first. Groups are parenthesised
+            # because Lucene has no AND-over-OR precedence.
+            ft_query = " OR ".join(f"({group})" for group in [
+                _fulltext_query(query),
+                _fulltext_query(' '.join(all_keywords), match_all=False),
+            ] if group)
             
             try:
-                results = safe_run(session, cypher_query, params)
+                results = _search_active_jobs(session, ft_query, category, limit) if ft_query else []
             except Exception as query_error:
                 # Fallback to simpler query if complex one fails
                 logger.warning(f"Complex query failed, using simple search: {query_error}")
@@ -1799,7 +1847,7 @@ def update_resume():
 def analyze_resume():
     """Analyze resume using Gemini AI"""
     try:
-        from gemini_client import get_gemini_response
+        from gemini_client import get_gemini_response, stream_gemini_response, GeminiError
         
         data = request.get_json()
         resume_text = data.get('resume', '')
@@ -1829,6 +1877,13 @@ Format your response clearly with section headers.
 
 {lang_instruction}"""
         
+        if wants_event_stream():
+            return stream_generation(
+                stream_gemini_response(prompt),
+                finish=lambda text: {'status': 'success', 'analysis': text.strip()},
+                safe_errors=(GeminiError,)
+            )
+        
         logger.info(f"Calling Gemini API for resume analysis in {language}")
         analysis = get_gemini_response(prompt)
         logger.info("Resume analysis completed successfully")
@@ -1845,13 +1900,26 @@ Format your response clearly with section headers.
         }), 500
 
 
+def _parse_suggestion_list(text):
+    """Numbered or bulleted lines of a suggestions reply, markers stripped"""
+    suggestion_list = []
+    for line in text.split('\n'):
+        line = line.strip()
+        if line and (line[0].isdigit() or line.startswith('-') or line.startswith('•')):
+            # Clean up the suggestion
+            suggestion = line.lstrip('0123456789.-•) ').strip()
+            if suggestion:
+                suggestion_list.append(suggestion)
+    return suggestion_list
+
+
 @jobs_bp.route('/get-resume-suggestions', methods=['POST'])
 @login_required
 @role_required('job_seeker')
 def get_resume_suggestions():
     """Get improvement suggestions for resume using Gemini AI"""
     try:
-        from gemini_client import get_gemini_response
+        from gemini_client import get_gemini_response, stream_gemini_response, GeminiError
         
         data = request.get_json()
         resume_text = data.get('resume', '')
@@ -1885,22 +1953,20 @@ Provide 5-8 total suggestions.
 
 {lang_instruction}"""
         
+        if wants_event_stream():
+            return stream_generation(
+                stream_gemini_response(prompt),
+                finish=lambda text: {'status': 'success', 'suggestions': _parse_suggestion_list(text)},
+                safe_errors=(GeminiError,)
+            )
+        
         logger.info(f"Calling Gemini API for resume suggestions in {language}")
         suggestions = get_gemini_response(prompt)
         logger.info("Resume suggestions completed successfully")
         
         # Parse into list if it's a string
         if isinstance(suggestions, str):
-            # Split by newlines and filter for numbered items
-            lines = suggestions.split('\n')
-            suggestion_list = []
-            for line in lines:
-                line = line.strip()
-                if line and (line[0].isdigit() or line.startswith('-') or line.startswith('•')):
-                    # Clean up the suggestion
-                    suggestion = line.lstrip('0123456789.-•) ').strip()
-                    if suggestion:
-                        suggestion_list.append(suggestion)
+            suggestion_list = _parse_suggestion_list(suggestions)
         else:
             suggestion_list = suggestions
         
@@ -1998,6 +2064,55 @@ In the issues array, list what's missing or needs improvement. Be specific about
         }), 500
 
 
+@jobs_bp.route('/resume-ai-batch', methods=['POST'])
+@login_required
+@role_required('job_seeker')
+def resume_ai_batch():
+    """Run several resume/application analyses on one submission.
+    
+    Expects JSON {analyses: [...], resume, cover_letter, job_title, language};
+    analyses are any of resume_ai.ANALYSES. Results are cached per content
+    hash, so an unchanged resume is answered without calling Gemini.
+    """
+    try:
+        from resume_ai import ANALYSES, NEEDS_COVER_LETTER, RESUME, run_batch
+        
+        data = request.get_json() or {}
+        analyses = data.get('analyses') or []
+        unknown = [name for name in analyses if name not in ANALYSES]
+        if not analyses or unknown:
+            return jsonify({'status': 'error', 'error': f"Unknown or missing analyses: {unknown}"}), 400
+        
+        resume_text = data.get('resume', '')
+        cover_letter = data.get('cover_letter', '')
+        if any(ANALYSES[name][0] == RESUME for name in analyses) and not resume_text.strip():
+            return jsonify({'status': 'error', 'error': 'Resume is empty'}), 400
+        if any(name in NEEDS_COVER_LETTER for name in analyses) and not cover_letter.strip():
+            return jsonify({'status': 'error', 'error': 'Cover letter is empty'}), 400
+        
+        results, errors = run_batch(
+            analyses,
+            resume=resume_text,
+            cover_letter=cover_letter,
+            job_title=data.get('job_title', 'this position'),
+            language=data.get('language', 'English')
+        )
+        if not results:
+            return jsonify({'status': 'error', 'error': next(iter(errors.values())), 'errors': errors}), 503
+        
+        return jsonify({
+            'status': 'success',
+            'results': results,
+            'errors': errors
+        })
+    except Exception as e:
+        logger.error(f"Error running batched resume analyses: {str(e)}", exc_info=True)
+        return jsonify({
+            'status': 'error',
+            'error': str(e)
+        }), 500
+
+
 # ============================================================================
 # AI-POWERED JOB APPLICATION ASSISTANCE ENDPOINTS
 # ============================================================================
@@ -2008,7 +2123,7 @@ In the issues array, list what's missing or needs improvement. Be specific about
 def improve_application():
     """Improve job application cover letter using Gemini AI"""
     try:
-        from gemini_client import get_gemini_response
+        from gemini_client import get_gemini_response, stream_gemini_response, GeminiError
         
         data = request.get_json()
         cover_letter = data.get('cover_letter', '')
@@ -2038,6 +2153,13 @@ Provide:
 
 {lang_instruction}"""
         
+        if wants_event_stream():
+            return stream_generation(
+                stream_gemini_response(prompt),
+                finish=lambda text: {'status': 'success', 'improvements': text.strip()},
+                safe_errors=(GeminiError,)
+            )
+        
         logger.info(f"Calling Gemini API to improve application for {job_title} in {language}")
         improvements = get_gemini_response(prompt)
         logger.info("Application improvement completed successfully")
@@ -0,0 +1,68 @@
+"""
+Tag-based invalidation on top of the shared Flask-Caching backend.
+
+Every tag ('business:*', 'business:<id>', 'job:*', ...) has a version stored
+in the cache itself. Cached entries embed the current versions of their tags
+in their key, so bumping a tag makes every entry that carried it unreachable
+for all workers at once - no key scans, and it works the same on the
+filesystem and Redis backends. Orphaned entries simply age out by timeout.
+
+    set_tagged('jobs:facets:unfiltered', facets, ['job:*'], timeout=300)
+    facets = get_tagged('jobs:facets:unfiltered', ['job:*'])
+
+    invalidate_tags('business:*', f'business:{business_id}')
+"""
+
+import hashlib
+import logging
+import time
+from typing import Any, List, Sequence
+
+from extensions import cache
+
+logger = logging.getLogger(__name__)
+
+_TAG_PREFIX = 'tag:'
+
+
+def _new_version() -> int:
+    # Nanosecond clock: unique enough that two workers bumping the same tag
+    # never hand out a version an old entry was stored under
+    return time.time_ns()
+
+
+def tag_versions(tags: Sequence[str]) -> List[int]:
+    """Current version of each tag, creating missing ones"""
+    keys = [_TAG_PREFIX + tag for tag in tags]
+    if not keys:
+        return []
+    versions = list(cache.get_many(*keys))
+    missing = {key: _new_version() for key, version in zip(keys, versions) if version is None}
+    if missing:
+        cache.set_many(missing, timeout=0)
+        versions = [missing.get(key, version) for key, version in zip(keys, versions)]
+    return versions
+
+
+def invalidate_tags(*tags: str):
+    """Drop every cached entry carrying any of the tags, in every worker"""
+    if not tags:
+        return
+    try:
+        cache.set_many({_TAG_PREFIX + tag: _new_version() for tag in tags}, timeout=0)
+    except Exception as e:
+        logger.warning(f"Could not invalidate cache tags {tags}: {e}")
+
+
+def tagged_key(key: str, tags: Sequence[str]) -> str:
+    """Cache key for `key` bound to the current versions of `tags`"""
+    stamp = ','.join(f"{tag}@{version}" for tag, version in zip(tags, tag_versions(tags)))
+    return f"{key}|{hashlib.md5(stamp.encode('utf-8')).hexdigest()}"
+
+
+def get_tagged(key: str, tags: Sequence[str]) -> Any:
+    return cache.get(tagged_key(key, tags))
+
+
+def set_tagged(key: str, value: Any, tags: Sequence[str], timeout: int = None):
+    cache.set(tagged_key(key, tags), value, timeout=timeout)
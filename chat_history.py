@@ -0,0 +1,321 @@
+"""
+Server-side chatbot conversation history.
+
+Conversations live in a store of their own - Redis when
+CHAT_HISTORY_REDIS_URL is set, otherwise a SQLite file (CHAT_HISTORY_DB)
+shared by the workers on the host - under the user id and a conversation id;
+the session cookie carries only that id. Not the page cache: its size-based
+pruning would throw conversations away. Records expire after CHAT_HISTORY_TTL
+and every change is an atomic read-modify-write, so a reply and a background
+summary landing together cannot drop each other's turns. Prompt history is
+assembled to a token budget:
+
+* the newest turns go in verbatim, each clipped to CHAT_HISTORY_TURN_TOKENS,
+  until CHAT_HISTORY_TOKEN_BUDGET is spent;
+* turns that no longer fit are folded into a running summary once, in the
+  background, when CHAT_SUMMARY_BATCH_TURNS of them have piled up. The summary
+  (at most CHAT_SUMMARY_TOKENS) is stored and reused by every later prompt,
+  and the folded turns are dropped from storage.
+
+So both the cookie and the model input stay the same size however long the
+conversation runs.
+
+    summary, turns = chat_history.context(user_id, conversation_id)
+    reply = chatbot.send_message(message, history=turns, summary=summary)
+    chat_history.append(user_id, conversation_id, message, reply)
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from flask import current_app, session
+
+logger = logging.getLogger(__name__)
+
+# Rough size of a Gemini token in characters of English/Filipino text
+CHARS_PER_TOKEN = 4
+
+_SESSION_KEY = 'chat_id'
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text or '') + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def clip(text: str, tokens: int) -> str:
+    """Cut text to about `tokens` tokens, on a word boundary where possible"""
+    limit = tokens * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    cut = text[:limit]
+    space = cut.rfind(' ')
+    return (cut[:space] if space > limit // 2 else cut) + ' …'
+
+
+def conversation_id() -> str:
+    """The current session's conversation id, created on first use"""
+    if _SESSION_KEY not in session:
+        session[_SESSION_KEY] = uuid.uuid4().hex
+    return session[_SESSION_KEY]
+
+
+def new_conversation() -> str:
+    """Start a fresh conversation for this session"""
+    session[_SESSION_KEY] = uuid.uuid4().hex
+    return session[_SESSION_KEY]
+
+
+# Applied inside a store transaction to the stored record ({} when there is
+# none): changes it in place and returns True to write it back
+Update = Callable[[Dict[str, Any]], bool]
+
+
+class _MemoryStore:
+    """Conversations in this process only (tests, or no shared store configured)"""
+
+    def __init__(self):
+        self._records: Dict[str, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._records.get(key)
+        return entry[0] if entry and entry[1] > time.time() else None
+
+    def update(self, key: str, fn: Update, ttl: int):
+        with self._lock:
+            record = json.loads(self.get(key) or '{}')
+            if fn(record):
+                self._records[key] = (json.dumps(record), time.time() + ttl)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._records.pop(key, None)
+
+
+class _SQLiteStore:
+    """Expiring conversations in a SQLite file shared by the workers on this host"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS chat_history (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        """)
+        conn.execute("DELETE FROM chat_history WHERE expires_at <= ?", (time.time(),))
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per thread (and per process, keyed by pid); autocommit
+        # so update() can take the write lock up front with BEGIN IMMEDIATE
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def get(self, key: str) -> Optional[str]:
+        row = self._connect().execute(
+            "SELECT value FROM chat_history WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def update(self, key: str, fn: Update, ttl: int):
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            record = json.loads(self.get(key) or '{}')
+            if fn(record):
+                conn.execute(
+                    "INSERT OR REPLACE INTO chat_history (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(record), time.time() + ttl)
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def delete(self, key: str):
+        self._connect().execute("DELETE FROM chat_history WHERE key = ?", (key,))
+
+
+class _RedisStore:
+    """Conversations in Redis, updated with optimistic transactions"""
+
+    def __init__(self, url: str, prefix: str = 'chat:history:'):
+        import redis
+        self.client = redis.Redis.from_url(url, socket_timeout=2, socket_connect_timeout=2)
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[str]:
+        raw = self.client.get(self.prefix + key)
+        return raw.decode('utf-8') if raw else None
+
+    def update(self, key: str, fn: Update, ttl: int):
+        def apply(pipe):
+            raw = pipe.get(self.prefix + key)
+            record = json.loads(raw) if raw else {}
+            pipe.multi()
+            if fn(record):
+                pipe.set(self.prefix + key, json.dumps(record), ex=ttl)
+
+        # Retried from the top if another worker wrote the key meanwhile
+        self.client.transaction(apply, self.prefix + key)
+
+    def delete(self, key: str):
+        self.client.delete(self.prefix + key)
+
+
+class ChatHistoryStore:
+    """Bounded per-conversation history with summary, kept in a shared store"""
+
+    def __init__(self, summarize: Callable[[str, List[Dict[str, str]], int], Optional[str]] = None):
+        self._summarize = summarize
+        self._in_flight = set()
+        self._lock = threading.Lock()
+        self.configure()
+
+    def configure(self, budget_tokens: int = 1200, turn_tokens: int = 400, summary_tokens: int = 200,
+                  summary_batch: int = 6, max_turns: int = 50, ttl: int = 7 * 24 * 60 * 60,
+                  redis_url: str = None, db_path: str = None):
+        self.budget_tokens = budget_tokens
+        self.turn_tokens = turn_tokens
+        self.summary_tokens = summary_tokens
+        self.summary_batch = summary_batch
+        self.max_turns = max_turns
+        self.ttl = ttl
+        self.store = None
+        if redis_url:
+            try:
+                self.store = _RedisStore(redis_url)
+            except Exception as e:
+                logger.warning(f"Chat history not using Redis: {e}")
+        if self.store is None and db_path:
+            try:
+                self.store = _SQLiteStore(db_path)
+            except Exception as e:
+                logger.warning(f"Chat history not using {db_path}: {e}")
+        if self.store is None:
+            if redis_url or db_path:
+                logger.warning("Chat history limited to this worker")
+            self.store = _MemoryStore()
+
+    @staticmethod
+    def _key(user_id, conversation: str) -> str:
+        return f"{user_id}:{conversation}"
+
+    def load(self, user_id, conversation: str) -> Dict[str, Any]:
+        """{'summary': str, 'turns': [{'role', 'content', 'timestamp'}, ...]}"""
+        raw = self.store.get(self._key(user_id, conversation))
+        return json.loads(raw) if raw else {'summary': '', 'turns': []}
+
+    def append(self, user_id, conversation: str, message: str, reply: str = None):
+        """Record the user's message and, if there is one, the reply to it"""
+        now = datetime.utcnow().isoformat()
+        turns = [{'role': 'user', 'content': message, 'timestamp': now}]
+        if reply is not None:
+            turns.append({'role': 'assistant', 'content': reply, 'timestamp': now})
+
+        def add(record):
+            record.setdefault('summary', '')
+            record.setdefault('turns', []).extend(turns)
+            # Hard cap for when summaries can't be produced (no API key, breaker open)
+            del record['turns'][:-self.max_turns]
+            return True
+
+        self.store.update(self._key(user_id, conversation), add, self.ttl)
+
+    def clear(self, user_id, conversation: str):
+        self.store.delete(self._key(user_id, conversation))
+
+    def split(self, turns: List[Dict[str, str]]) -> Tuple[List[Dict[str, str]], List[Dict[str, str]]]:
+        """(older, recent): recent is the newest turns, clipped, that fit the budget"""
+        recent = []
+        spent = 0
+        for index in range(len(turns) - 1, -1, -1):
+            content = clip(turns[index]['content'], self.turn_tokens)
+            cost = estimate_tokens(content)
+            if recent and spent + cost > self.budget_tokens:
+                return turns[:index + 1], recent[::-1]
+            recent.append({'role': turns[index]['role'], 'content': content})
+            spent += cost
+        return [], recent[::-1]
+
+    def context(self, user_id, conversation: str) -> Tuple[str, List[Dict[str, str]]]:
+        """(summary, recent turns) for the next prompt; may start a summary update"""
+        record = self.load(user_id, conversation)
+        older, recent = self.split(record['turns'])
+        if len(older) >= self.summary_batch:
+            self._schedule_summary(user_id, conversation, len(older))
+        return record['summary'], recent
+
+    def _schedule_summary(self, user_id, conversation: str, count: int):
+        key = self._key(user_id, conversation)
+        with self._lock:
+            if key in self._in_flight:
+                return
+            self._in_flight.add(key)
+        app = current_app._get_current_object()
+        threading.Thread(target=self._fold, args=(app, key, user_id, conversation, count),
+                         name='chat-summary', daemon=True).start()
+
+    def _fold(self, app, key: str, user_id, conversation: str, count: int):
+        try:
+            with app.app_context():
+                record = self.load(user_id, conversation)
+                folded = record['turns'][:count]
+                summary = self._summarize(record['summary'], folded, self.summary_tokens) if self._summarize else None
+                if not summary:
+                    return
+
+                def replace(current):
+                    # Compare-and-set: skip if the folded turns changed while summarising
+                    if current.get('turns', [])[:count] != folded:
+                        return False
+                    current['summary'] = clip(summary.strip(), self.summary_tokens)
+                    del current['turns'][:count]
+                    return True
+
+                self.store.update(key, replace, self.ttl)
+        except Exception as e:
+            logger.warning(f"Chat history summary failed: {e}")
+        finally:
+            with self._lock:
+                self._in_flight.discard(key)
+
+
+def _summarize_with_gemini(summary: str, turns: List[Dict[str, str]], max_tokens: int) -> Optional[str]:
+    from gemini_client import summarize_conversation
+    return summarize_conversation(summary, turns, max_words=max_tokens * 3 // 4)
+
+
+chat_history = ChatHistoryStore(summarize=_summarize_with_gemini)
+
+
+def init_app(app):
+    """Configure the process-wide store from CHAT_HISTORY_* / CHAT_SUMMARY_* settings"""
+    chat_history.configure(
+        budget_tokens=app.config.get('CHAT_HISTORY_TOKEN_BUDGET', 1200),
+        turn_tokens=app.config.get('CHAT_HISTORY_TURN_TOKENS', 400),
+        summary_tokens=app.config.get('CHAT_SUMMARY_TOKENS', 200),
+        summary_batch=app.config.get('CHAT_SUMMARY_BATCH_TURNS', 6),
+        max_turns=app.config.get('CHAT_HISTORY_MAX_TURNS', 50),
+        ttl=app.config.get('CHAT_HISTORY_TTL', 7 * 24 * 60 * 60),
+        redis_url=app.config.get('CHAT_HISTORY_REDIS_URL'),
+        db_path=app.config.get('CHAT_HISTORY_DB') or None,
+    )
@@ -1,9 +1,11 @@
 from flask import Blueprint, render_template, request, jsonify, session
-from flask_login import login_required
+from flask_login import login_required, current_user
 from datetime import datetime
 import logging
 import os
-from gemini_client import GeminiChat
+from gemini_client import GeminiChat, GeminiError
+from chat_history import chat_history, conversation_id, new_conversation
+from sse import stream_generation, wants_event_stream
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -13,7 +15,8 @@ chatbot = None
 try:
     logger.info("Initializing Gemini chat client...")
     api_key = os.getenv("GEMINI_API_KEY")
-    if api_key:
+    # The offline backend (GEMINI_BACKEND=fake) needs no key
+    if api_key or os.getenv("GEMINI_BACKEND") == 'fake':
         try:
             chatbot = GeminiChat(api_key=api_key)
             logger.info("Successfully initialized Gemini chat client")
@@ -71,8 +74,11 @@ def chat_api():
                 'message': 'Chatbot service is not available'
             }), 503
 
-        # Retrieve chat history from session
-        chat_history = session.get('chat_history', [])
+        # Server-side history; the cookie only carries the conversation id
+        user_id = current_user.id
+        conversation = conversation_id()
+        session.pop('chat_history', None)
+        summary, chat_history_turns = chat_history.context(user_id, conversation)
 
         # Try to get context (if method exists)
         context = None
@@ -84,26 +90,39 @@ def chat_api():
 
         formatted_context = context if context else "No specific context available."
 
+        if wants_event_stream():
+            def finish(text):
+                chat_history.append(user_id, conversation, user_message, text.strip())
+                return {
+                    'status': 'success',
+                    'message': text.strip(),
+                    'timestamp': datetime.utcnow().isoformat()
+                }
+
+            return stream_generation(
+                chatbot.stream_message(
+                    message=user_message,
+                    context=formatted_context,
+                    history=chat_history_turns,
+                    summary=summary
+                ),
+                finish=finish,
+                safe_errors=(GeminiError,)
+            )
+
         # Send message to chatbot
         try:
             response = chatbot.send_message(
                 message=user_message,
                 context=formatted_context,
-                history=chat_history
+                history=chat_history_turns,
+                summary=summary
             )
 
             formatted_response = response.strip().replace("**", "").replace("*", "• ")
 
             # Update chat history
-            chat_history.append({"role": "user", "content": user_message})
-            chat_history.append({"role": "assistant", "content": formatted_response})
-
-            # Keep only last 10 messages
-            if len(chat_history) > 10:
-                chat_history = chat_history[-10:]
-
-            session['chat_history'] = chat_history
-            session.modified = True
+            chat_history.append(user_id, conversation, user_message, formatted_response)
 
             return jsonify({
                 'status': 'success',
@@ -133,10 +152,11 @@ def chat_api():
 def get_chat_history():
     """Get the current user's chat history."""
     try:
-        chat_history = session.get('chat_history', [])
+        record = chat_history.load(current_user.id, conversation_id())
         return jsonify({
             'status': 'success',
-            'history': chat_history
+            'history': record['turns'],
+            'summary': record['summary']
         })
     except Exception as e:
         logger.error(f"Error retrieving chat history: {str(e)}", exc_info=True)
@@ -152,8 +172,8 @@ def get_chat_history():
 def clear_chat_history():
     """Clear the current user's chat history."""
     try:
-        session['chat_history'] = []
-        session.modified = True
+        chat_history.clear(current_user.id, conversation_id())
+        new_conversation()
         return jsonify({
             'status': 'success',
             'message': 'Chat history cleared'
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from datetime import timedelta
 from dotenv import load_dotenv
 
@@ -12,8 +13,33 @@ class Config:
     NEO4J_PASSWORD = os.environ.get('NEO4J_PASSWORD') or 'password'  # Default Neo4j Desktop password
     NEO4J_DATABASE = os.environ.get('NEO4J_DATABASE') or 'neo4j'
     
-    # Simple cache instead of Redis
-    CACHE_TYPE = 'SimpleCache'
+    # Neo4j driver pool (one driver per worker process)
+    NEO4J_MAX_POOL_SIZE = int(os.environ.get('NEO4J_MAX_POOL_SIZE') or 50)
+    NEO4J_ACQUISITION_TIMEOUT = float(os.environ.get('NEO4J_ACQUISITION_TIMEOUT') or 60)
+    NEO4J_MAX_CONNECTION_LIFETIME = int(os.environ.get('NEO4J_MAX_CONNECTION_LIFETIME') or 1800)
+    # Seconds a pooled connection may sit idle before it is health-checked on checkout
+    NEO4J_LIVENESS_CHECK_TIMEOUT = float(os.environ.get('NEO4J_LIVENESS_CHECK_TIMEOUT') or 30)
+    # Upper bound on retries of transient errors in database.read()/write()
+    NEO4J_MAX_TRANSACTION_RETRY_TIME = float(os.environ.get('NEO4J_MAX_TRANSACTION_RETRY_TIME') or 15)
+    
+    # Query instrumentation: queries slower than this are logged, with their
+    # plan ('explain', or 'profile' for read-only queries) once per fingerprint
+    NEO4J_SLOW_QUERY_MS = float(os.environ.get('NEO4J_SLOW_QUERY_MS') or 500)
+    NEO4J_SLOW_QUERY_PLAN = os.environ.get('NEO4J_SLOW_QUERY_PLAN') or 'explain'
+    
+    # Apply pending schema migrations (constraints/indexes) when the app starts
+    NEO4J_AUTO_MIGRATE = os.environ.get('NEO4J_AUTO_MIGRATE', 'True').lower() in ['true', '1', 'yes']
+    
+    # Listings reachable by ?page=N; deeper pages use keyset cursors (pagination.py)
+    PAGINATION_MAX_OFFSET_PAGES = int(os.environ.get('PAGINATION_MAX_OFFSET_PAGES') or 10)
+    
+    # Shared response cache: Redis when CACHE_REDIS_URL is set, otherwise a
+    # directory cache that every worker on the host reads and writes
+    CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL')
+    CACHE_TYPE = os.environ.get('CACHE_TYPE') or ('RedisCache' if CACHE_REDIS_URL else 'FileSystemCache')
+    CACHE_DIR = os.environ.get('CACHE_DIR') or os.path.join(tempfile.gettempdir(), 'catanduanes-connect-cache')
+    CACHE_THRESHOLD = int(os.environ.get('CACHE_THRESHOLD') or 5000)
+    CACHE_KEY_PREFIX = os.environ.get('CACHE_KEY_PREFIX') or 'cc:'
     
     # Email Configuration - SendGrid
     SENDGRID_API_KEY = os.environ.get('SENDGRID_API_KEY')
@@ -30,6 +56,80 @@ class Config:
     GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY')
     SEMAPHORE_API_KEY = os.environ.get('SEMAPHORE_API_KEY', '5dc45caa4475c0e877cdfda343b04ed0')
     
+    # Shared Gemini HTTP client (one keep-alive pool per worker, see gemini_client.py)
+    GEMINI_TIMEOUT = float(os.environ.get('GEMINI_TIMEOUT') or 60)
+    GEMINI_CONNECT_TIMEOUT = float(os.environ.get('GEMINI_CONNECT_TIMEOUT') or 10)
+    GEMINI_MAX_CONNECTIONS = int(os.environ.get('GEMINI_MAX_CONNECTIONS') or 20)
+    GEMINI_KEEPALIVE_EXPIRY = float(os.environ.get('GEMINI_KEEPALIVE_EXPIRY') or 300)
+    # Open the pooled connection when the worker boots instead of on the first AI request
+    GEMINI_WARMUP = os.environ.get('GEMINI_WARMUP', 'False').lower() in ['true', '1', 'yes']
+    # 'fake' answers every Gemini call offline (gemini_fake.py) for load tests and
+    # demos: fixed latency plus jitter, injected 429/503/safety-block rates
+    GEMINI_BACKEND = os.environ.get('GEMINI_BACKEND') or 'genai'
+    GEMINI_FAKE_LATENCY_MS = float(os.environ.get('GEMINI_FAKE_LATENCY_MS') or 300)
+    GEMINI_FAKE_JITTER_MS = float(os.environ.get('GEMINI_FAKE_JITTER_MS') or 200)
+    GEMINI_FAKE_ERROR_429 = float(os.environ.get('GEMINI_FAKE_ERROR_429') or 0)
+    GEMINI_FAKE_ERROR_503 = float(os.environ.get('GEMINI_FAKE_ERROR_503') or 0)
+    GEMINI_FAKE_SAFETY_BLOCK = float(os.environ.get('GEMINI_FAKE_SAFETY_BLOCK') or 0)
+    GEMINI_FAKE_REPLIES = os.environ.get('GEMINI_FAKE_REPLIES')
+    GEMINI_FAKE_SEED = int(os.environ['GEMINI_FAKE_SEED']) if os.environ.get('GEMINI_FAKE_SEED') else None
+    
+    # Prompt response cache (gemini_cache.py): in-process LRU, plus a SQLite file
+    # shared by the workers on a host when GEMINI_CACHE_DB is set
+    GEMINI_CACHE_ENABLED = os.environ.get('GEMINI_CACHE_ENABLED', 'True').lower() in ['true', '1', 'yes']
+    GEMINI_CACHE_SIZE = int(os.environ.get('GEMINI_CACHE_SIZE') or 1024)
+    GEMINI_CACHE_TTL = int(os.environ.get('GEMINI_CACHE_TTL') or 24 * 60 * 60)
+    GEMINI_CACHE_DB = os.environ.get('GEMINI_CACHE_DB')
+    # Identical in-flight prompts wait for one API call (single_flight.py). With a
+    # lock directory this extends across workers, sharing results through GEMINI_CACHE_DB
+    GEMINI_SINGLEFLIGHT_TIMEOUT = float(os.environ.get('GEMINI_SINGLEFLIGHT_TIMEOUT') or 0) or None
+    GEMINI_SINGLEFLIGHT_LOCK_DIR = os.environ.get('GEMINI_SINGLEFLIGHT_LOCK_DIR')
+    # Request budget and circuit breaker for all Gemini calls (gemini_governor.py);
+    # shared by every worker through Redis when a URL is available, otherwise by
+    # the workers on this host through the GEMINI_GOVERNOR_DB SQLite file
+    GEMINI_RATE_PER_MINUTE = float(os.environ.get('GEMINI_RATE_PER_MINUTE') or 30)
+    GEMINI_RATE_BURST = int(os.environ.get('GEMINI_RATE_BURST') or 10)
+    GEMINI_BREAKER_THRESHOLD = int(os.environ.get('GEMINI_BREAKER_THRESHOLD') or 3)
+    GEMINI_BREAKER_COOLDOWN = float(os.environ.get('GEMINI_BREAKER_COOLDOWN') or 30)
+    GEMINI_BREAKER_MAX_COOLDOWN = float(os.environ.get('GEMINI_BREAKER_MAX_COOLDOWN') or 600)
+    GEMINI_GOVERNOR_REDIS_URL = os.environ.get('GEMINI_GOVERNOR_REDIS_URL') or CACHE_REDIS_URL
+    GEMINI_GOVERNOR_DB = os.environ.get('GEMINI_GOVERNOR_DB') or os.path.join(tempfile.gettempdir(), 'catanduanes-connect-gemini-governor.db')
+    # In-process BM25 index the chatbot reads its context from (retrieval_index.py);
+    # rebuilt in the background when another worker writes, at most this often
+    RETRIEVAL_INDEX_ENABLED = os.environ.get('RETRIEVAL_INDEX_ENABLED', 'True').lower() in ['true', '1', 'yes']
+    RETRIEVAL_INDEX_MIN_REBUILD_SECONDS = float(os.environ.get('RETRIEVAL_INDEX_MIN_REBUILD_SECONDS') or 30)
+    # Chatbot history (chat_history.py) lives in its own store, not the cookie or the
+    # pruned page cache: Redis when a URL is available, else a SQLite file per host.
+    # Prompts carry the newest turns up to the token budget plus a summary of the rest
+    CHAT_HISTORY_REDIS_URL = os.environ.get('CHAT_HISTORY_REDIS_URL') or CACHE_REDIS_URL
+    CHAT_HISTORY_DB = os.environ.get('CHAT_HISTORY_DB') or os.path.join(tempfile.gettempdir(), 'catanduanes-connect-chat-history.db')
+    CHAT_HISTORY_TOKEN_BUDGET = int(os.environ.get('CHAT_HISTORY_TOKEN_BUDGET') or 1200)
+    CHAT_HISTORY_TURN_TOKENS = int(os.environ.get('CHAT_HISTORY_TURN_TOKENS') or 400)
+    CHAT_SUMMARY_TOKENS = int(os.environ.get('CHAT_SUMMARY_TOKENS') or 200)
+    CHAT_SUMMARY_BATCH_TURNS = int(os.environ.get('CHAT_SUMMARY_BATCH_TURNS') or 6)
+    CHAT_HISTORY_MAX_TURNS = int(os.environ.get('CHAT_HISTORY_MAX_TURNS') or 50)
+    CHAT_HISTORY_TTL = int(os.environ.get('CHAT_HISTORY_TTL') or 7 * 24 * 60 * 60)
+    # Push events (realtime.py) for chat and notifications over /api/events.
+    # Redis fans them out to every worker. Each open stream holds a worker
+    # thread, so this needs threaded workers (the Procfile runs gthread); with
+    # sync workers set REALTIME_ENABLED=false and pages poll instead. Streams
+    # past REALTIME_MAX_STREAMS per worker are refused and those pages poll,
+    # so some threads always stay free for ordinary requests
+    REALTIME_ENABLED = os.environ.get('REALTIME_ENABLED', 'True').lower() in ['true', '1', 'yes']
+    REALTIME_MAX_STREAMS = int(os.environ.get('REALTIME_MAX_STREAMS') or 24)
+    REALTIME_REDIS_URL = os.environ.get('REALTIME_REDIS_URL') or CACHE_REDIS_URL
+    REALTIME_REPLAY_SIZE = int(os.environ.get('REALTIME_REPLAY_SIZE') or 50)
+    REALTIME_HEARTBEAT_SECONDS = float(os.environ.get('REALTIME_HEARTBEAT_SECONDS') or 25)
+    REALTIME_MAX_STREAM_SECONDS = float(os.environ.get('REALTIME_MAX_STREAM_SECONDS') or 300)
+    REALTIME_WEBSOCKET = os.environ.get('REALTIME_WEBSOCKET', 'False').lower() in ['true', '1', 'yes']
+    # Notifications are queued and written in batches by one thread per worker
+    # (notification_writer.py). A full queue makes callers wait up to
+    # NOTIFICATION_PUT_TIMEOUT, then write their notification themselves
+    NOTIFICATION_QUEUE_SIZE = int(os.environ.get('NOTIFICATION_QUEUE_SIZE') or 1000)
+    NOTIFICATION_BATCH_SIZE = int(os.environ.get('NOTIFICATION_BATCH_SIZE') or 100)
+    NOTIFICATION_FLUSH_SECONDS = float(os.environ.get('NOTIFICATION_FLUSH_SECONDS') or 0.5)
+    NOTIFICATION_PUT_TIMEOUT = float(os.environ.get('NOTIFICATION_PUT_TIMEOUT') or 1.0)
+    
     # File Upload
     UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER') or 'static/uploads'
     MAX_CONTENT_LENGTH = int(os.environ.get('MAX_CONTENT_LENGTH') or 16777216)
@@ -54,7 +154,6 @@ class Config:
     ADMIN_EMAIL = os.environ.get('ADMIN_EMAIL') or 'admin@catanduanesconnect.com'
     
     # Cache
-    CACHE_TYPE = 'SimpleCache'
     CACHE_DEFAULT_TIMEOUT = 300
     
     @staticmethod
@@ -89,6 +188,12 @@ class TestingConfig(Config):
     TESTING = True
     WTF_CSRF_ENABLED = False
     CACHE_TYPE = 'SimpleCache'
+    GEMINI_CACHE_DB = None
+    GEMINI_GOVERNOR_DB = None
+    CHAT_HISTORY_REDIS_URL = None
+    CHAT_HISTORY_DB = None
+    RETRIEVAL_INDEX_ENABLED = False
+    REALTIME_REDIS_URL = None
 
 
 config = {
@@ -1,10 +1,19 @@
+import atexit
 import logging
+import os
+import threading
+import time
 from contextlib import contextmanager
 from neo4j import GraphDatabase, Driver
+from neo4j.exceptions import DriverError
+from neo4j.time import DateTime, Date, Time
+from datetime import datetime
 from flask import current_app, g
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Iterator, List
 import json
 
+from query_metrics import query_metrics
+
 logger = logging.getLogger(__name__)
 
 
@@ -26,15 +35,60 @@ class AttrDict(dict):
             raise AttributeError(f"'AttrDict' object has no attribute '{name}'")
 
 
+class PoolMetrics:
+    """Thread-safe counters for session checkouts against a shared driver"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def checkout(self, wait: float):
+        with self._lock:
+            self.in_use += 1
+            self.checkouts += 1
+            self.total_wait += wait
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+            self.max_wait = max(self.max_wait, wait)
+
+    def checkin(self):
+        with self._lock:
+            self.in_use -= 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'in_use': self.in_use,
+                'peak_in_use': self.peak_in_use,
+                'checkouts': self.checkouts,
+                'avg_wait_ms': (self.total_wait / self.checkouts * 1000) if self.checkouts else 0.0,
+                'max_wait_ms': self.max_wait * 1000,
+            }
+
+
 class Neo4jConnection:
-    """Neo4j connection manager with session pooling and auto-reconnect"""
+    """Neo4j connection manager wrapping a single pooled driver"""
     
-    def __init__(self, uri: str, user: str, password: str, database: str = 'neo4j'):
+    def __init__(self, uri: str, user: str, password: str, database: str = 'neo4j',
+                 max_pool_size: int = 50, acquisition_timeout: float = 60.0,
+                 max_connection_lifetime: int = 30 * 60,
+                 liveness_check_timeout: Optional[float] = None,
+                 max_transaction_retry_time: float = 15.0):
         self.uri = uri
         self.user = user
         self.password = password
         self.database = database
+        self.max_pool_size = max_pool_size
+        self.acquisition_timeout = acquisition_timeout
+        self.max_connection_lifetime = max_connection_lifetime
+        self.liveness_check_timeout = liveness_check_timeout
+        self.max_transaction_retry_time = max_transaction_retry_time
         self.driver = None
+        self.metrics = PoolMetrics()
+        self._lock = threading.Lock()
         # Connection will be established on first use
         
     def connect(self):
@@ -49,7 +103,15 @@ class Neo4jConnection:
             self.driver = GraphDatabase.driver(
                 self.uri, 
                 auth=(self.user, self.password),
-                max_connection_lifetime=30*60,  # 30 min
+                max_connection_pool_size=self.max_pool_size,
+                connection_acquisition_timeout=self.acquisition_timeout,
+                max_connection_lifetime=self.max_connection_lifetime,
+                # Idle connections older than this get a RESET round trip
+                # before reuse instead of verifying the whole driver per session
+                liveness_check_timeout=self.liveness_check_timeout,
+                # Managed transactions retry transient errors with
+                # exponential backoff and jitter for up to this long
+                max_transaction_retry_time=self.max_transaction_retry_time,
                 keep_alive=True
             )
             # Verify connection
@@ -71,6 +133,13 @@ class Neo4jConnection:
         except Exception as e:
             logger.warning(f"Lost connection to Neo4j, attempting to reconnect: {e}")
             self.connect()
+
+    def _ensure_driver(self):
+        """Create the driver on first use; later calls are a cheap check"""
+        if self.driver is None:
+            with self._lock:
+                if self.driver is None:
+                    self.connect()
     
     def close(self):
         """Close the driver connection"""
@@ -81,74 +150,129 @@ class Neo4jConnection:
                 logger.error(f"Error closing Neo4j connection: {e}")
             finally:
                 self.driver = None
+
+    def pool_metrics(self) -> Dict[str, Any]:
+        """Return session checkout counters plus idle/in-use pool connections"""
+        metrics = self.metrics.snapshot()
+        metrics['max_pool_size'] = self.max_pool_size
+        metrics['pool_in_use'] = None
+        metrics['pool_idle'] = None
+        # The driver does not publish pool stats; read them best-effort
+        pool = getattr(self.driver, '_pool', None)
+        connections = getattr(pool, 'connections', None)
+        if connections:
+            try:
+                conns = [c for queue in list(connections.values()) for c in list(queue)]
+                busy = sum(1 for c in conns if getattr(c, 'in_use', False))
+                metrics['pool_in_use'] = busy
+                metrics['pool_idle'] = len(conns) - busy
+            except Exception as e:
+                logger.debug(f"Could not read Neo4j pool state: {e}")
+        return metrics
             
     @contextmanager
     def session(self):
-        """Context manager for Neo4j sessions with auto-reconnect"""
-        self.ensure_connection()
-        session = None
+        """Check a session out of the shared driver pool"""
+        start = time.perf_counter()
+        self._ensure_driver()
         try:
             session = self.driver.session(database=self.database)
-            yield session
-        except Exception as e:
-            logger.error(f"Neo4j session error: {e}")
-            # If it's a connection error, try to reconnect
-            if "Driver closed" in str(e):
-                self.connect()
-                # Retry once after reconnecting
-                session = self.driver.session(database=self.database)
-                yield session
-            else:
+        except DriverError as e:
+            if "closed" not in str(e).lower():
                 raise
+            # Someone closed the shared driver; rebuild it once before use
+            logger.warning(f"Neo4j driver was closed, reconnecting: {e}")
+            with self._lock:
+                self.connect()
+            session = self.driver.session(database=self.database)
+        self.metrics.checkout(time.perf_counter() - start)
+        try:
+            yield session
         finally:
-            if session:
-                session.close()
+            session.close()
+            self.metrics.checkin()
+
+    def execute_read(self, work, *args, **kwargs):
+        """Run work(tx, *args, **kwargs) in a managed read transaction.
+
+        Transient failures are retried by the driver. With a neo4j:// (routing)
+        URI the transaction is sent to a follower or read replica.
+        """
+        with self.session() as session:
+            return session.execute_read(work, *args, **kwargs)
+
+    def execute_write(self, work, *args, **kwargs):
+        """Run work(tx, *args, **kwargs) in a managed write transaction"""
+        with self.session() as session:
+            return session.execute_write(work, *args, **kwargs)
+
+
+# One connection (and therefore one driver pool) per worker process. Keyed
+# by pid so a forked gunicorn worker never reuses its parent's sockets.
+_connections: Dict[tuple, Neo4jConnection] = {}
+_connections_lock = threading.Lock()
+
+
+def get_shared_connection(config) -> Neo4jConnection:
+    """Return the process-wide Neo4jConnection for the given app config"""
+    key = (os.getpid(), config['NEO4J_URI'], config['NEO4J_USER'], config['NEO4J_DATABASE'])
+    db = _connections.get(key)
+    if db is None:
+        with _connections_lock:
+            db = _connections.get(key)
+            if db is None:
+                db = Neo4jConnection(
+                    config['NEO4J_URI'],
+                    config['NEO4J_USER'],
+                    config['NEO4J_PASSWORD'],
+                    config['NEO4J_DATABASE'],
+                    max_pool_size=config.get('NEO4J_MAX_POOL_SIZE', 50),
+                    acquisition_timeout=config.get('NEO4J_ACQUISITION_TIMEOUT', 60.0),
+                    max_connection_lifetime=config.get('NEO4J_MAX_CONNECTION_LIFETIME', 30 * 60),
+                    liveness_check_timeout=config.get('NEO4J_LIVENESS_CHECK_TIMEOUT'),
+                    max_transaction_retry_time=config.get('NEO4J_MAX_TRANSACTION_RETRY_TIME', 15.0),
+                )
+                _connections[key] = db
+    return db
+
+
+@atexit.register
+def close_shared_connections():
+    """Close the drivers owned by this process"""
+    pid = os.getpid()
+    with _connections_lock:
+        for key in [k for k in _connections if k[0] == pid]:
+            _connections.pop(key).close()
+
 
 def get_neo4j_db() -> Neo4jConnection:
-    """Get or create Neo4j database connection"""
+    """Get the shared Neo4j database connection for this worker"""
     if 'neo4j_db' not in g:
-        g.neo4j_db = Neo4jConnection(
-            current_app.config['NEO4J_URI'],
-            current_app.config['NEO4J_USER'],
-            current_app.config['NEO4J_PASSWORD'],
-            current_app.config['NEO4J_DATABASE']
-        )
+        g.neo4j_db = get_shared_connection(current_app.config)
     return g.neo4j_db
 
 def init_neo4j(app):
-    """Attach driver to app and verify configuration once."""
-    with app.app_context():
-        # 1. store driver on app (same as you do in get_neo4j_db)
-        if 'neo4j_db' not in g:
-            g.neo4j_db = Neo4jConnection(
-                app.config['NEO4J_URI'],
-                app.config['NEO4J_USER'],
-                app.config['NEO4J_PASSWORD'],
-                app.config['NEO4J_DATABASE']
-            )
-        # 2. test the connection (optional for startup)
-        try:
-            g.neo4j_db.ensure_connection()
-            logger.info("Successfully initialized Neo4j connection")
-        except Exception as e:
-            logger.warning(f"Neo4j connection failed during initialization: {e}. App will continue without Neo4j.")
+    """Attach the shared driver to app and verify configuration once."""
+    db = get_shared_connection(app.config)
+    query_metrics.configure(
+        slow_query_ms=app.config.get('NEO4J_SLOW_QUERY_MS'),
+        plan_mode=app.config.get('NEO4J_SLOW_QUERY_PLAN'),
+    )
+    # Test the connection (optional for startup)
+    try:
+        db._ensure_driver()
+        logger.info("Successfully initialized Neo4j connection")
+    except Exception as e:
+        logger.warning(f"Neo4j connection failed during initialization: {e}. App will continue without Neo4j.")
 
-    @app.teardown_appcontext
-    def close_neo4j(error):
-        db = g.pop('neo4j_db', None)
-        if db is not None:
-            db.close()
+    if 'neo4j' in app.extensions:
+        return
+    app.extensions['neo4j'] = db
 
-def get_neo4j_db() -> Neo4jConnection:
-    """Get Neo4j database connection"""
-    if 'neo4j_db' not in g:
-        g.neo4j_db = Neo4jConnection(
-            current_app.config['NEO4J_URI'],
-            current_app.config['NEO4J_USER'],
-            current_app.config['NEO4J_PASSWORD'],
-            current_app.config['NEO4J_DATABASE']
-    )
-    return g.neo4j_db
+    @app.teardown_appcontext
+    def release_neo4j(error):
+        # The driver outlives the request; only drop the per-request reference
+        g.pop('neo4j_db', None)
 
 def _record_to_dict(record) -> Optional[Dict[str, Any]]:
     """Convert Neo4j record to dictionary, recursively converting nodes"""
@@ -158,74 +282,121 @@ def _record_to_dict(record) -> Optional[Dict[str, Any]]:
     for key, value in record.items():
         if hasattr(value, 'labels'):  # It's a Neo4j Node
             result[key] = _node_to_dict(value)
-        elif isinstance(value, dict):
-            result[key] = value
         else:
             result[key] = value
     return result
 
+
+# Temporal property types rendered as ISO strings for JSON serialization.
+# Exact-type set membership is cheaper than isinstance() against a tuple.
+_TEMPORAL_TYPES = frozenset((DateTime, Date, Time, datetime))
+
+
+class _LabelMapper:
+    """Node-to-dict conversion precompiled for one label combination"""
+
+    __slots__ = ('labels', 'is_user')
+
+    def __init__(self, labels):
+        self.labels = list(labels)
+        self.is_user = 'User' in labels
+
+    def __call__(self, node) -> AttrDict:
+        result = AttrDict(node.items())
+        for key, value in result.items():
+            if type(value) in _TEMPORAL_TYPES:
+                result[key] = value.isoformat()
+        # IMPORTANT: Use the 'id' property from the node data, NOT node.id (which is Neo4j's internal ID)
+        # Only set node.id if the 'id' property doesn't already exist in the node data
+        if 'id' not in result:
+            result['id'] = node.id
+        result['labels'] = self.labels[:]
+        # Handle missing username field - use email or first_name as fallback
+        if self.is_user and 'username' not in result:
+            if 'email' in result:
+                result['username'] = result['email'].split('@')[0]
+            elif 'first_name' in result:
+                result['username'] = result['first_name']
+            else:
+                result['username'] = f"user_{result.get('id', 'unknown')}"
+        return result
+
+
+_label_mappers: Dict[frozenset, _LabelMapper] = {}
+
+
 def _node_to_dict(node) -> Optional[Dict[str, Any]]:
     """Convert Neo4j node to dictionary with attribute access support"""
     if not node:
         return None
-    
-    # Convert Neo4j node to dict, handling DateTime objects
-    node_dict = dict(node)
-    
-    # Convert DateTime objects to ISO format strings for JSON serialization
-    from datetime import datetime
-    from neo4j.time import DateTime, Date, Time
-    
-    for key, value in node_dict.items():
-        if isinstance(value, (DateTime, Date, Time, datetime)):
-            # Convert to ISO format string
-            node_dict[key] = value.isoformat() if hasattr(value, 'isoformat') else str(value)
-    
-    result = AttrDict(node_dict)
-    # IMPORTANT: Use the 'id' property from the node data, NOT node.id (which is Neo4j's internal ID)
-    # Only set node.id if the 'id' property doesn't already exist in the node data
-    if 'id' not in result:
-        result['id'] = node.id
-    result['labels'] = list(node.labels)
-    
-    # Handle missing username field - use email or first_name as fallback
-    if 'username' not in result:
-        if 'email' in result:
-            result['username'] = result['email'].split('@')[0]
-        elif 'first_name' in result:
-            result['username'] = result['first_name']
-        else:
-            result['username'] = f"user_{result.get('id', 'unknown')}"
-    
-    return result
+    if isinstance(node, dict):
+        # Already converted by safe_run/stream_run
+        return AttrDict(node)
+    mapper = _label_mappers.get(node.labels)
+    if mapper is None:
+        mapper = _label_mappers.setdefault(node.labels, _LabelMapper(node.labels))
+    return mapper(node)
 
 def safe_run(session, query: str, params: Dict[str, Any] = None) -> List[Dict[str, Any]]:
     """Safely execute Neo4j query with error handling"""
+    return list(stream_run(session, query, params))
+
+def stream_run(session, query: str, params: Dict[str, Any] = None) -> Iterator[Dict[str, Any]]:
+    """Execute a query and yield converted records one at a time.
+
+    Records are fetched from the server in batches as the generator is
+    consumed, so the session must stay open until iteration finishes.
+    Each execution is timed into query_metrics under its fingerprint.
+    """
+    start = time.perf_counter()
+    summary = None
+    failed = False
     try:
         result = session.run(query, params or {})
-        return [_record_to_dict(record) for record in result]
+        for record in result:
+            yield _record_to_dict(record)
+        summary = result.consume()
     except Exception as e:
+        failed = True
         logger.error(f"Neo4j query error: {e}")
         logger.error(f"Query: {query}")
         logger.error(f"Params: {params}")
         raise
+    finally:
+        # Also reached when the caller stops iterating early (no summary then)
+        query_metrics.record(query, (time.perf_counter() - start) * 1000, summary,
+                             error=failed, session=session if summary is not None else None,
+                             params=params)
+
+def _run_query(tx, query: str, params: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+    """Transaction function wrapping safe_run so results are read inside the tx"""
+    return safe_run(tx, query, params)
+
+def read(query: str, params: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+    """Run a read-only query in a managed transaction with automatic retry"""
+    return get_neo4j_db().execute_read(_run_query, query, params)
+
+def write(query: str, params: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+    """Run a write query in a managed transaction with automatic retry"""
+    return get_neo4j_db().execute_write(_run_query, query, params)
+
+def read_transaction(work, *args, **kwargs):
+    """Run several read statements in one managed transaction.
+
+    work(tx, *args, **kwargs) may call safe_run(tx, ...) any number of times.
+    It can be re-invoked on retry, so it must not have side effects outside
+    the transaction.
+    """
+    return get_neo4j_db().execute_read(work, *args, **kwargs)
+
+def write_transaction(work, *args, **kwargs):
+    """Run several write statements atomically in one managed transaction"""
+    return get_neo4j_db().execute_write(work, *args, **kwargs)
 
 def create_constraints():
-    """Create Neo4j constraints for data integrity"""
-    db = get_neo4j_db()
-    constraints = [
-        "CREATE CONSTRAINT user_email_unique IF NOT EXISTS FOR (u:User) REQUIRE u.email IS UNIQUE",
-        "CREATE CONSTRAINT business_name_unique IF NOT EXISTS FOR (b:Business) REQUIRE b.name IS UNIQUE",
-        "CREATE CONSTRAINT job_id_unique IF NOT EXISTS FOR (j:Job) REQUIRE j.id IS UNIQUE",
-        "CREATE CONSTRAINT service_id_unique IF NOT EXISTS FOR (s:Service) REQUIRE s.id IS UNIQUE",
-    ]
-    
-    with db.session() as session:
-        for constraint in constraints:
-            try:
-                session.run(constraint)
-            except Exception as e:
-                logger.warning(f"Constraint creation failed (may already exist): {e}")
+    """Create Neo4j constraints and indexes by applying pending schema migrations"""
+    from migrations import run_migrations
+    return run_migrations(get_neo4j_db())
 
 def init_db():
     """Initialize database with constraints and indexes"""
@@ -1,5 +1,5 @@
 from functools import wraps
-from flask import abort, redirect, url_for, request, flash, jsonify
+from flask import abort, redirect, url_for, request, flash, jsonify, Response
 from flask_login import current_user, login_required
 from typing import Callable, Union, List
 from extensions import limiter   # ← no circular dependency
@@ -97,6 +97,9 @@ def json_response(func: Callable) -> Callable:
     @wraps(func)
     def wrapper(*args, **kwargs):
         result = func(*args, **kwargs)
+        if isinstance(result, Response):
+            # Already a response, e.g. a streamed one
+            return result
         if isinstance(result, tuple):
             data, status_code = result
             return jsonify(data), status_code
@@ -4,5 +4,5 @@ from flask_caching import Cache
 from flask_wtf.csrf import CSRFProtect
 
 limiter  = Limiter(key_func=get_remote_address, storage_uri="memory://")
-cache    = Cache(config={"CACHE_TYPE": "SimpleCache", "CACHE_DEFAULT_TIMEOUT": 300})
+cache    = Cache()            # backend comes from app.config (see Config.CACHE_*)
 csrf     = CSRFProtect()
\ No newline at end of file
@@ -0,0 +1,225 @@
+"""
+Response cache for Gemini prompts.
+
+Many prompts are deterministic functions of small inputs (keyword expansion,
+intent JSON, location interpretation), so identical calls are answered from
+here instead of re-billing the API. Entries are keyed by the normalised prompt,
+model and temperature and live in two tiers:
+
+* an in-process LRU with a TTL, bounded by GEMINI_CACHE_SIZE entries;
+* optionally a SQLite file (GEMINI_CACHE_DB) shared by every worker on the
+  host. Memory misses fall through to it and hits are promoted back.
+
+Only successful generations are stored. Callers with creative prompts pass
+use_cache=False to get_gemini_response().
+"""
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+_SPACE_RE = re.compile(r'\s+')
+
+DEFAULT_SIZE = 1024
+DEFAULT_TTL = 24 * 60 * 60
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Collapse whitespace so indentation-only differences share an entry"""
+    return _SPACE_RE.sub(' ', prompt or '').strip()
+
+
+def cache_key(prompt: str, model: str, temperature: float) -> str:
+    raw = f"{model}\x00{float(temperature):.3f}\x00{normalize_prompt(prompt)}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class _MemoryTier:
+    """Thread-safe LRU with a per-entry expiry"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, expires_at: float = None):
+        with self._lock:
+            self._entries[key] = (value, expires_at or time.time() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class _SQLiteTier:
+    """Expiring key/value table in a SQLite file shared between workers"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS gemini_responses (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per thread (and per process, keyed by pid)
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def get(self, key: str) -> Optional[tuple]:
+        return self._connect().execute(
+            "SELECT value, expires_at FROM gemini_responses WHERE key = ? AND expires_at > ?",
+            (key, time.time())
+        ).fetchone()
+
+    def set(self, key: str, value: str, expires_at: float):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO gemini_responses (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, expires_at)
+            )
+
+    def purge_expired(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("DELETE FROM gemini_responses WHERE expires_at <= ?", (time.time(),)).rowcount
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM gemini_responses")
+
+
+class ResponseCache:
+    """Two-tier prompt cache with hit/miss counters"""
+
+    def __init__(self, maxsize: int = DEFAULT_SIZE, ttl: float = DEFAULT_TTL, db_path: str = None):
+        self._lock = threading.Lock()
+        self.configure(maxsize=maxsize, ttl=ttl, db_path=db_path)
+
+    def configure(self, maxsize: int = DEFAULT_SIZE, ttl: float = DEFAULT_TTL, db_path: str = None,
+                  enabled: bool = True):
+        self.enabled = enabled and maxsize > 0
+        self.ttl = ttl
+        self.memory = _MemoryTier(maxsize, ttl)
+        self.disk = None
+        if db_path:
+            try:
+                self.disk = _SQLiteTier(db_path)
+                self.disk.purge_expired()
+            except Exception as e:
+                logger.warning(f"Gemini disk cache disabled ({db_path}): {e}")
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._counts = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'stores': 0, 'bypassed': 0}
+
+    def _count(self, name: str):
+        with self._lock:
+            self._counts[name] += 1
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.memory.get(key)
+        if value is not None:
+            self._count('memory_hits')
+            return value
+        if self.disk is not None:
+            try:
+                row = self.disk.get(key)
+            except sqlite3.Error as e:
+                logger.warning(f"Gemini disk cache read failed: {e}")
+                row = None
+            if row is not None:
+                value, expires_at = row
+                self.memory.set(key, value, expires_at)
+                self._count('disk_hits')
+                return value
+        self._count('misses')
+        return None
+
+    def set(self, key: str, value: str):
+        expires_at = time.time() + self.ttl
+        self.memory.set(key, value, expires_at)
+        if self.disk is not None:
+            try:
+                self.disk.set(key, value, expires_at)
+            except sqlite3.Error as e:
+                logger.warning(f"Gemini disk cache write failed: {e}")
+        self._count('stores')
+
+    def bypass(self):
+        """Record a call that opted out of the cache"""
+        self._count('bypassed')
+
+    def clear(self):
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+        self.reset()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self._counts)
+        lookups = counts['memory_hits'] + counts['disk_hits'] + counts['misses']
+        hits = counts['memory_hits'] + counts['disk_hits']
+        return {
+            **counts,
+            'enabled': self.enabled,
+            'hit_ratio': round(hits / lookups, 4) if lookups else 0.0,
+            'memory_entries': len(self.memory),
+            'memory_size': self.memory.maxsize,
+            'ttl_seconds': self.ttl,
+            'disk_path': self.disk.path if self.disk is not None else None,
+        }
+
+
+response_cache = ResponseCache()
+
+
+def init_app(app):
+    """Configure the process-wide cache from GEMINI_CACHE_* settings"""
+    response_cache.configure(
+        maxsize=app.config.get('GEMINI_CACHE_SIZE', DEFAULT_SIZE),
+        ttl=app.config.get('GEMINI_CACHE_TTL', DEFAULT_TTL),
+        db_path=app.config.get('GEMINI_CACHE_DB') or None,
+        enabled=app.config.get('GEMINI_CACHE_ENABLED', True),
+    )
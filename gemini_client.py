@@ -1,20 +1,24 @@
+import json
 import os
 import logging
-import re
-from typing import List, Dict, Optional
+import threading
+from typing import Any, Iterator, List, Dict, Optional, Tuple
 import google.genai as genai
-import pathlib
+import httpx
 
 # Import get_neo4j_db from your database module
-from database import get_neo4j_db  # Replace 'database' with the actual module name if different
-
-# Get project root directory (where gemini_client.py is located - same level as app.py)
-PROJECT_ROOT = pathlib.Path(__file__).parent
-QUOTA_DISABLED_FLAG = PROJECT_ROOT / '.gemini_quota_disabled'
+from database import get_neo4j_db, safe_run  # Replace 'database' with the actual module name if different
+from gemini_cache import cache_key, response_cache, init_app as init_response_cache
+from single_flight import SingleFlight
+from retrieval_index import search_context
+from query_parser import has_filters, parse_query, search_kinds
+from gemini_governor import (
+    governor, is_overload_error, is_quota_error, init_app as init_governor,
+    PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, PRIORITY_STANDARD,
+)
 
 # Set up logging
 logger = logging.getLogger(__name__)
-logger.info(f"Gemini client initialized. Project root: {PROJECT_ROOT}, Quota flag: {QUOTA_DISABLED_FLAG}")
 
 SYSTEM_TEMPLATE = """You are an AI assistant for CatanduanesConnect, a platform connecting job seekers, businesses, 
 and service providers in Catanduanes. Help users find jobs, businesses, and services while providing accurate,
@@ -29,6 +33,106 @@ Key Features to Remember:
 
 Please maintain a helpful, professional tone and prioritize local opportunities in Catanduanes."""
 
+DEFAULT_MODEL = 'gemini-2.5-flash'
+
+# HTTP settings for the shared client; init_gemini() overrides them from app config
+_client_settings: Dict[str, Any] = {
+    'timeout': 60.0,
+    'connect_timeout': 10.0,
+    'max_connections': 20,
+    'keepalive_expiry': 300.0,
+    # 'genai' for the real API, 'fake' for the offline stand-in in gemini_fake
+    'backend': os.environ.get('GEMINI_BACKEND') or 'genai',
+}
+
+# One genai.Client per (process, api key). The client owns an httpx pool with
+# keep-alive, so TLS handshakes are paid once per worker rather than per call.
+# Keyed by pid so a forked gunicorn worker never reuses its parent's sockets.
+_clients: Dict[tuple, genai.Client] = {}
+_clients_lock = threading.Lock()
+
+# Coalesces concurrent identical cached prompts; init_gemini() configures it
+single_flight = SingleFlight(timeout=_client_settings['timeout'])
+
+
+def _build_client(api_key: str) -> genai.Client:
+    settings = _client_settings
+    http_client = httpx.Client(
+        timeout=httpx.Timeout(settings['timeout'], connect=settings['connect_timeout']),
+        limits=httpx.Limits(
+            max_connections=settings['max_connections'],
+            max_keepalive_connections=settings['max_connections'],
+            keepalive_expiry=settings['keepalive_expiry'],
+        ),
+    )
+    return genai.Client(
+        api_key=api_key,
+        http_options=genai.types.HttpOptions(
+            httpx_client=http_client,
+            # HttpOptions.timeout is in milliseconds
+            timeout=int(settings['timeout'] * 1000),
+        ),
+    )
+
+
+def get_client(api_key: str = None) -> genai.Client:
+    """Return the process-wide Gemini client, creating it on first use"""
+    if _client_settings['backend'] == 'fake':
+        from gemini_fake import fake_client
+        return fake_client
+    api_key = api_key or os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        raise ValueError("GEMINI_API_KEY environment variable is not set")
+    key = (os.getpid(), api_key)
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                client = _build_client(api_key)
+                _clients[key] = client
+                logger.info("Created shared Gemini client")
+    return client
+
+
+def warm_up(api_key: str = None, model: str = DEFAULT_MODEL) -> bool:
+    """Open a pooled connection ahead of the first AI request.
+
+    Fetches the model's metadata, which does not count against generation quota.
+    """
+    try:
+        get_client(api_key).models.get(model=model)
+        logger.info("Gemini client warmed up")
+        return True
+    except Exception as e:
+        logger.warning(f"Gemini warm-up failed: {e}")
+        return False
+
+
+def init_gemini(app):
+    """Apply the app's GEMINI_* settings and optionally warm the client up"""
+    _client_settings.update({
+        'timeout': app.config.get('GEMINI_TIMEOUT', _client_settings['timeout']),
+        'connect_timeout': app.config.get('GEMINI_CONNECT_TIMEOUT', _client_settings['connect_timeout']),
+        'max_connections': app.config.get('GEMINI_MAX_CONNECTIONS', _client_settings['max_connections']),
+        'keepalive_expiry': app.config.get('GEMINI_KEEPALIVE_EXPIRY', _client_settings['keepalive_expiry']),
+        'backend': app.config.get('GEMINI_BACKEND') or _client_settings['backend'],
+    })
+    if _client_settings['backend'] == 'fake':
+        from gemini_fake import init_app as init_fake
+        init_fake(app)
+        logger.warning("Gemini calls are answered by the offline fake backend (GEMINI_BACKEND=fake)")
+    init_response_cache(app)
+    init_governor(app)
+    single_flight.configure(
+        timeout=app.config.get('GEMINI_SINGLEFLIGHT_TIMEOUT') or _client_settings['timeout'],
+        lock_dir=app.config.get('GEMINI_SINGLEFLIGHT_LOCK_DIR') or None,
+    )
+    api_key = app.config.get('GEMINI_API_KEY')
+    if app.config.get('GEMINI_WARMUP') and api_key:
+        # In the background so a slow network never holds up worker boot
+        threading.Thread(target=warm_up, args=(api_key,), name='gemini-warmup', daemon=True).start()
+
 class GeminiChat:
     """Client for interacting with Google's Gemini API."""
     
@@ -42,7 +146,7 @@ class GeminiChat:
         if api_key is None:
             api_key = os.getenv("GEMINI_API_KEY")
             
-        if not api_key:
+        if not api_key and _client_settings['backend'] != 'fake':
             logger.error("GEMINI_API_KEY environment variable is not set")
             raise ValueError("GEMINI_API_KEY environment variable is not set")
             
@@ -50,9 +154,9 @@ class GeminiChat:
             # Initialize the Gemini client
             logger.debug("Initializing Gemini client...")
             
-            # Initialize the Gemini client using the new google.genai API
-            self.client = genai.Client(api_key=api_key)
-            self.model_name = 'gemini-2.5-flash'
+            # Shared, pooled client (see get_client)
+            self.client = get_client(api_key)
+            self.model_name = DEFAULT_MODEL
             
             # Skip connection test to avoid quota limits on free tier
             logger.info("Gemini client initialized (connection test skipped to preserve quota)")
@@ -61,172 +165,60 @@ class GeminiChat:
             logger.error(f"Failed to initialize Gemini client: {str(e)}")
             raise
             
-    def extract_search_params(self, message: str) -> Dict[str, str]:
-        """Extract search parameters from the user's message."""
-        params = {}
-        
-        # Look for category in the message
-        category_patterns = [
-            r"category[:\s]+(\w+)",
-            r"in the (\w+) category",
-            r"related to (\w+)",
-            r"about (\w+)"
-        ]
-        for pattern in category_patterns:
-            match = re.search(pattern, message.lower())
-            if match:
-                params["category"] = match.group(1)
-                break
-
-        # Look for location in the message
-        location_patterns = [
-            r"in\s+(\w+(?:\s+\w+)*(?:\s+City)?)",
-            r"at\s+(\w+(?:\s+\w+)*(?:\s+City)?)",
-            r"near\s+(\w+(?:\s+\w+)*(?:\s+City)?)",
-            r"around\s+(\w+(?:\s+\w+)*(?:\s+City)?)"
-        ]
-        for pattern in location_patterns:
-            match = re.search(pattern, message)
-            if match:
-                params["location"] = match.group(1)
-                break
-                
-        # Use the rest as a general search query
-        # Remove found category and location if any
-        query = message
-        if "category" in params:
-            query = re.sub(r"category[:\s]+" + params["category"], "", query, flags=re.IGNORECASE)
-        if "location" in params:
-            query = re.sub(r"in\s+" + params["location"], "", query, flags=re.IGNORECASE)
-            
-        params["query"] = query.strip()
-        return params
+    def extract_search_params(self, message: str) -> Dict[str, Any]:
+        """Extract search parameters from the user's message (see query_parser)."""
+        return parse_query(message)
 
     def _get_relevant_data(self, message: str) -> Optional[str]:
         """Get relevant data from database based on user query."""
         try:
-            # Extract search parameters from message
             params = self.extract_search_params(message)
-            query = params.get("query", "")
-            category = params.get("category")
-            location = params.get("location")
-            
-            context_parts = []
-            db = get_neo4j_db()
-            
-            with db.session() as session:
-                # Search for jobs
-                jobs_query = """
-                MATCH (j:JobOffer)
-                WHERE j.is_active = true 
-                AND (toLower(j.title) CONTAINS toLower($query)
-                OR toLower(j.description) CONTAINS toLower($query)
-                OR toLower(j.requirements) CONTAINS toLower($query))
-                """
-                
-                if location:
-                    jobs_query += "AND toLower(j.location) CONTAINS toLower($location) "
-                if category:
-                    jobs_query += "AND toLower(j.category) CONTAINS toLower($category) "
-                    
-                jobs_query += "RETURN j LIMIT 3"
-                
-                jobs = session.run(jobs_query, 
-                                 query=query,
-                                 location=location,
-                                 category=category).data()
-                
-                if jobs:
-                    context_parts.append("Relevant Jobs:")
-                    for job_data in jobs:
-                        job = job_data['j']
-                        context_parts.append(f"- {job.get('title')} at {job.get('company_name', 'N/A')}")
-                        context_parts.append(f"  Location: {job.get('location', 'N/A')}")
-                        if job.get('salary'):
-                            context_parts.append(f"  Salary: ₱{job['salary']}")
-                        if job.get('description'):
-                            desc = job['description']
-                            if len(desc) > 200:
-                                desc = desc[:200] + "..."
-                            context_parts.append(f"  Description: {desc}")
-
-                # Search for services (Service nodes may not exist in this system)
-                try:
-                    services_query = """
-                    MATCH (s:Service)
-                    WHERE s.is_active = true 
-                    AND (toLower(s.title) CONTAINS toLower($query)
-                    OR toLower(s.description) CONTAINS toLower($query))
-                    """
-                    
-                    if location:
-                        services_query += "AND toLower(s.location) CONTAINS toLower($location) "
-                    if category:
-                        services_query += "AND toLower(s.category) CONTAINS toLower($category) "
-                        
-                    services_query += "RETURN s LIMIT 3"
-                    
-                    services = session.run(services_query,
-                                         query=query,
-                                         location=location,
-                                         category=category).data()
-                    
-                    if services:
-                        context_parts.append("\nRelevant Services:")
-                        for service_data in services:
-                            service = service_data['s']
-                            context_parts.append(f"- {service.get('title', 'N/A')}")
-                            context_parts.append(f"  Location: {service.get('location', 'N/A')}")
-                            context_parts.append(f"  Category: {service.get('category', 'N/A')}")
-                            if service.get('description'):
-                                desc = service['description']
-                                if len(desc) > 200:
-                                    desc = desc[:200] + "..."
-                                context_parts.append(f"  Description: {desc}")
-                except Exception:
-                    # Service nodes don't exist in this system, skip
-                    pass
-
-                # Search for businesses
-                businesses_query = """
-                MATCH (b:Business)
-                WHERE b.is_active = true 
-                AND (toLower(b.name) CONTAINS toLower($query)
-                OR toLower(b.description) CONTAINS toLower($query))
-                """
-                
-                if location:
-                    businesses_query += "AND toLower(b.location) CONTAINS toLower($location) "
-                if category:
-                    businesses_query += "AND toLower(b.category) CONTAINS toLower($category) "
-                    
-                businesses_query += "RETURN b LIMIT 3"
-                
-                businesses = session.run(businesses_query,
-                                       query=query,
-                                       location=location,
-                                       category=category).data()
-                
-                if businesses:
-                    context_parts.append("\nRelevant Businesses:")
-                    for business_data in businesses:
-                        business = business_data['b']
-                        context_parts.append(f"- {business.get('name', 'N/A')}")
-                        context_parts.append(f"  Location: {business.get('location', 'N/A')}")
-                        context_parts.append(f"  Category: {business.get('category', 'N/A')}")
-                        if business.get('description'):
-                            desc = business['description']
-                            if len(desc) > 200:
-                                desc = desc[:200] + "..."
-                            context_parts.append(f"  Description: {desc}")
+            if not has_filters(params):
+                return None
+            kinds = search_kinds(params)
             
-            return "\n".join(context_parts) if context_parts else None
+            indexed = search_context(params['query'], location=params['location'],
+                                     categories=params['categories'], kinds=kinds)
+            if indexed is None:
+                # Index still building: look the filters up in the graph
+                indexed = _graph_context(params, kinds or ['job', 'service', 'business'])
+            return _format_context(indexed)
             
         except Exception as e:
             logger.error(f"Error retrieving context: {str(e)}")
             return None
 
-    def send_message(self, message: str, context: str = None, history: List[Dict[str, str]] = None) -> str:
+    @staticmethod
+    def _build_prompt(message: str, context: str = None, history: List[Dict[str, str]] = None,
+                      summary: str = None) -> str:
+        """Assemble the assistant prompt from context, history and the new message.
+
+        history is used as given; callers bound it (see chat_history.context()).
+        """
+        prompt = "You are the CatanduanesConnect AI assistant. "
+        prompt += "Your role is to help users find jobs, businesses, and services in Catanduanes. "
+        prompt += "Please be friendly and helpful.\n\n"
+        
+        # Add context if available
+        if context:
+            prompt += f"Here is some relevant information:\n{context}\n\n"
+        
+        # Earlier turns that no longer fit, summarised
+        if summary:
+            prompt += f"Summary of the conversation so far:\n{summary}\n\n"
+        
+        # Add chat history if provided
+        if history:
+            for msg in history:
+                role = msg["role"].capitalize()
+                prompt += f"{role}: {msg['content']}\n"
+        
+        # Add current message
+        prompt += f"User: {message}\nAssistant:"
+        return prompt
+
+    def send_message(self, message: str, context: str = None, history: List[Dict[str, str]] = None,
+                     summary: str = None) -> str:
         """
         Send a message to the Gemini model and get the response.
         
@@ -234,32 +226,19 @@ class GeminiChat:
             message: The user's message
             context: Optional relevant context from the database
             history: Optional chat history as a list of role/content dicts
+            summary: Optional summary of the turns before `history`
             
         Returns:
             The model's response text
         """
         try:
-            # Build the complete prompt
-            prompt = "You are the CatanduanesConnect AI assistant. "
-            prompt += "Your role is to help users find jobs, businesses, and services in Catanduanes. "
-            prompt += "Please be friendly and helpful.\n\n"
-            
-            # Add context if available
-            if context:
-                prompt += f"Here is some relevant information:\n{context}\n\n"
-            
-            # Add chat history if provided
-            if history:
-                for msg in history[-5:]:  # Only use last 5 messages
-                    role = msg["role"].capitalize()
-                    prompt += f"{role}: {msg['content']}\n"
-            
-            # Add current message
-            prompt += f"User: {message}\nAssistant:"
+            prompt = self._build_prompt(message, context, history, summary)
             
             # Get response from model with retry logic
             max_retries = 3
             for attempt in range(max_retries):
+                if not governor.try_acquire(PRIORITY_INTERACTIVE):
+                    return "The AI assistant is busy right now. Please try again in a few moments."
                 try:
                     response = self.client.models.generate_content(
                         model=self.model_name,
@@ -271,6 +250,7 @@ class GeminiChat:
                             "max_output_tokens": 2048,
                         }
                     )
+                    governor.record_success()
             
                     if response and hasattr(response, 'text') and response.text:
                         # Clean and format the response
@@ -280,8 +260,13 @@ class GeminiChat:
                     
                 except Exception as e:
                     error_str = str(e)
+                    if is_quota_error(error_str):
+                        # Retrying into a quota error only extends the lockout
+                        governor.record_failure(error_str)
+                        raise
                     # Check if it's a service availability error that might be retried
-                    if "503" in error_str or "UNAVAILABLE" in error_str:
+                    if is_overload_error(error_str):
+                        governor.record_failure(error_str)
                         if attempt < max_retries - 1:
                             logger.warning(f"Attempt {attempt + 1} failed due to service unavailability: {error_str}")
                             continue
@@ -314,73 +299,333 @@ class GeminiChat:
                 return "I apologize, but I'm having trouble processing your request right now. Please try again later."
 
 
+    def stream_message(self, message: str, context: str = None,
+                       history: List[Dict[str, str]] = None, summary: str = None) -> Iterator[str]:
+        """
+        Like send_message(), but yields the reply as it is generated.
+        
+        Raises GeminiError (with a message fit for the user) if generation
+        fails. Closing the generator early closes the upstream stream.
+        """
+        prompt = self._build_prompt(message, context, history, summary)
+        yield from _format_chunks(_stream(self.client, self.model_name, prompt, 0.7, PRIORITY_INTERACTIVE))
+
+
+# Context lookups for when the retrieval index is not built yet. Keywords go
+# through the full-text indexes, location is a substring of the canonical
+# municipality name, and listings in the named categories rank first.
+_CONTEXT_QUERIES = {
+    'job': ("""
+        CALL db.index.fulltext.queryNodes('job_text', $ft_query) YIELD node AS j, score
+        WHERE j.is_active = true {filters}
+    """, """
+        MATCH (j:Job) WHERE j.is_active = true {filters}
+        WITH j, j.created_at AS score
+    """, """
+        OPTIONAL MATCH (j)-[:POSTED_BY]->(b:Business)
+        RETURN j.title AS title, b.name AS company_name, j.location AS location, j.category AS category,
+               j.salary_min AS salary_min, j.salary_max AS salary_max, j.description AS description
+        ORDER BY coalesce(j.category IN $categories, false) DESC, score DESC LIMIT 3
+    """, 'j'),
+    'business': ("""
+        CALL db.index.fulltext.queryNodes('business_name_text', $ft_query) YIELD node AS b, score
+        WHERE b.is_active = true {filters}
+    """, """
+        MATCH (b:Business) WHERE b.is_active = true {filters}
+        WITH b, b.created_at AS score
+    """, """
+        RETURN b.name AS name, coalesce(b.location, b.address) AS location, b.category AS category,
+               b.description AS description
+        ORDER BY coalesce(b.category IN $categories, false) DESC, score DESC LIMIT 3
+    """, 'b'),
+    'service': ("""
+        MATCH (s:Service) WHERE s.is_active = true {filters}
+          AND any(term IN $terms WHERE toLower(s.title) CONTAINS term
+                  OR toLower(coalesce(s.description, '')) CONTAINS term)
+        WITH s, s.created_at AS score
+    """, """
+        MATCH (s:Service) WHERE s.is_active = true {filters}
+        WITH s, s.created_at AS score
+    """, """
+        RETURN s.title AS title, s.location AS location, s.category AS category, s.description AS description
+        ORDER BY coalesce(s.category IN $categories, false) DESC, score DESC LIMIT 3
+    """, 's'),
+}
+
+
+def _graph_context(params: Dict[str, Any], kinds: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """search_context()-shaped results straight from Neo4j"""
+    query_params = {
+        'ft_query': ' OR '.join(params['keywords']),
+        'terms': params['keywords'],
+        'categories': params['categories'] or [],
+        'location': params['location'],
+    }
+    results = {}
+    with get_neo4j_db().session() as session:
+        for kind in kinds:
+            by_keywords, by_filters, returns, var = _CONTEXT_QUERIES[kind]
+            filters = ''
+            if params['location']:
+                location = f"coalesce({var}.location, {var}.address)" if kind == 'business' else f"{var}.location"
+                filters += f" AND toLower({location}) CONTAINS toLower($location)"
+            match = by_keywords if params['keywords'] else by_filters
+            try:
+                results[kind] = safe_run(session, match.format(filters=filters) + returns, query_params)
+            except Exception as e:
+                # Service nodes don't exist in every deployment
+                logger.debug(f"Context lookup for {kind} skipped: {e}")
+    return results
+
+
+def _format_context(results: Dict[str, List[Dict[str, Any]]]) -> Optional[str]:
+    """Render retrieval_index.search_context() results as prompt context"""
+    def description(item):
+        desc = item.get('description') or ''
+        return desc[:200] + "..." if len(desc) >= 200 else desc
+
+    context_parts = []
+    if results.get('job'):
+        context_parts.append("Relevant Jobs:")
+        for job in results['job']:
+            context_parts.append(f"- {job.get('title')} at {job.get('company_name') or 'N/A'}")
+            context_parts.append(f"  Location: {job.get('location') or 'N/A'}")
+            if job.get('salary_min') or job.get('salary_max'):
+                salary = ' - '.join(f"₱{v}" for v in (job.get('salary_min'), job.get('salary_max')) if v)
+                context_parts.append(f"  Salary: {salary}")
+            if job.get('description'):
+                context_parts.append(f"  Description: {description(job)}")
+    for kind, heading, name in (('service', 'Relevant Services', 'title'),
+                                ('business', 'Relevant Businesses', 'name')):
+        if results.get(kind):
+            context_parts.append(f"\n{heading}:")
+            for item in results[kind]:
+                context_parts.append(f"- {item.get(name) or 'N/A'}")
+                context_parts.append(f"  Location: {item.get('location') or 'N/A'}")
+                context_parts.append(f"  Category: {item.get('category') or 'N/A'}")
+                if item.get('description'):
+                    context_parts.append(f"  Description: {description(item)}")
+    return "\n".join(context_parts) if context_parts else None
+
+
 # Global chat instance
 _chat_instance = None
 
 
-def get_gemini_response(prompt: str, temperature: float = 0.7) -> str:
+def get_gemini_response(prompt: str, temperature: float = 0.7, use_cache: bool = True,
+                        priority: str = PRIORITY_STANDARD) -> str:
     """
     Get a simple response from Gemini API without conversation history.
     
     Args:
         prompt: The prompt to send to Gemini
         temperature: Temperature for response generation (0.0-1.0)
+        use_cache: Answer identical prompts from the response cache; pass
+            False for creative prompts that should vary between calls
+        priority: gemini_governor priority; background calls are refused
+            first when the request budget runs low
     
     Returns:
         str: The response from Gemini
     """
+    if not (use_cache and response_cache.enabled):
+        response_cache.bypass()
+        return _generate(prompt, temperature, priority)[0]
+    
+    key = cache_key(prompt, DEFAULT_MODEL, temperature)
+    cached = response_cache.get(key)
+    if cached is not None:
+        return cached
+    
+    def generate_and_store():
+        text, ok = _generate(prompt, temperature, priority)
+        if ok:
+            response_cache.set(key, text)
+        return text
+    
+    # Concurrent identical prompts (e.g. an autocomplete burst) share one API call
+    return single_flight.do(key, generate_and_store, recheck=lambda: response_cache.get(key))
+
+
+def summarize_conversation(summary: str, turns: List[Dict[str, str]], max_words: int = 150) -> Optional[str]:
+    """Fold chat turns into the running summary; None if no summary could be made"""
+    transcript = "\n".join(f"{turn['role'].capitalize()}: {turn['content']}" for turn in turns)
+    prompt = (
+        "Update the summary of a conversation between a user and the CatanduanesConnect assistant.\n"
+        f"Keep what the user is looking for (jobs, businesses, services, places, skills) and any facts "
+        f"or listings the assistant gave. Write at most {max_words} words, in the language of the "
+        "conversation, with no preamble.\n\n"
+        f"Current summary:\n{summary or '(none)'}\n\n"
+        f"New turns:\n{transcript}\n\nUpdated summary:"
+    )
+    text, ok = _generate(prompt, 0.2, PRIORITY_BACKGROUND)
+    return text if ok else None
+
+
+def get_gemini_json(prompt: str, schema: Dict[str, Any], temperature: float = 0.7,
+                    priority: str = PRIORITY_STANDARD, max_output_tokens: int = 2048) -> Dict[str, Any]:
+    """
+    One structured-output call: the reply is constrained to `schema` (an
+    OpenAPI-style object schema) and returned parsed. Not cached here; callers
+    know better what the answer depends on (see resume_ai).
+    
+    Raises GeminiError, with a message fit for the user, if no valid JSON came back.
+    """
+    text, ok = _generate(prompt, temperature, priority, response_schema=schema,
+                         max_output_tokens=max_output_tokens)
+    if not ok:
+        raise GeminiError(text)
     try:
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
-            raise ValueError("GEMINI_API_KEY environment variable is not set")
-        
-        client = genai.Client(api_key=api_key)
-        model_name = 'gemini-2.5-flash'
+        return json.loads(text)
+    except ValueError:
+        logger.warning(f"Gemini structured reply was not valid JSON: {text[:200]}")
+        raise GeminiError("The AI returned an incomplete answer. Please try again.")
+
+
+def _generate(prompt: str, temperature: float, priority: str, **config) -> Tuple[str, bool]:
+    """Call the API; returns (text, ok) where ok means text is a real answer.
+    
+    Extra keyword arguments go to _generation_config().
+    """
+    if not governor.try_acquire(priority):
+        logger.info(f"Gemini call refused by governor (priority={priority})")
+        return "Too many requests. Please try again in a few moments.", False
+    try:
+        client = get_client()
         
         response = client.models.generate_content(
-            model=model_name,
+            model=DEFAULT_MODEL,
             contents=prompt,
-            config={
-                "temperature": temperature,
-                "top_p": 0.8,
-                "top_k": 40,
-                "max_output_tokens": 2048,
-            }
+            config=_generation_config(temperature, **config)
         )
+        governor.record_success()
         
         # Safely try to access response.text
         try:
             if response and response.text:
-                return response.text.strip()
+                return response.text.strip(), True
         except ValueError as ve:
             # Handle case where response is blocked by safety filters
             logger.warning(f"Gemini response blocked by safety filters: {str(ve)}")
-            return "I apologize, but I'm unable to generate a response to that request. Please try rephrasing it."
+            return "I apologize, but I'm unable to generate a response to that request. Please try rephrasing it.", False
         
-        return "Unable to generate response"
+        return "Unable to generate response", False
         
     except Exception as e:
-        error_str = str(e)
-        
-        # Handle specific API errors gracefully
-        if "503" in error_str or "UNAVAILABLE" in error_str or "overloaded" in error_str.lower():
-            logger.warning(f"Gemini API is temporarily unavailable: {error_str}")
-            return "The AI service is temporarily unavailable. Please try again in a few moments."
-        elif "401" in error_str or "UNAUTHENTICATED" in error_str:
-            logger.error(f"Gemini API authentication failed: {error_str}")
-            return "API authentication failed. Please check your configuration."
-        elif "429" in error_str or "RESOURCE_EXHAUSTED" in error_str:
-            logger.warning(f"Gemini API rate limit exceeded: {error_str}")
-            # Create a flag file to disable AI search across all requests
-            try:
-                QUOTA_DISABLED_FLAG.touch()
-                logger.warning(f"Created quota disabled flag at: {QUOTA_DISABLED_FLAG}")
-            except Exception as flag_error:
-                logger.error(f"Failed to create quota disabled flag: {flag_error}")
-            return "Too many requests. Please try again in a few moments."
-        elif "400" in error_str or "INVALID_ARGUMENT" in error_str:
-            logger.error(f"Invalid request to Gemini API: {error_str}")
-            return "Unable to process your request. Please try rephrasing it."
-        else:
-            logger.error(f"Error getting response from Gemini: {error_str}")
-            return "An error occurred while processing your request. Please try again."
\ No newline at end of file
+        return _api_error_message(str(e)), False
+
+
+def _generation_config(temperature: float, response_schema: Dict[str, Any] = None,
+                       max_output_tokens: int = 2048) -> Dict[str, Any]:
+    config = {
+        "temperature": temperature,
+        "top_p": 0.8,
+        "top_k": 40,
+        "max_output_tokens": max_output_tokens,
+    }
+    if response_schema is not None:
+        config["response_mime_type"] = "application/json"
+        config["response_schema"] = response_schema
+    return config
+
+
+def _api_error_message(error_str: str) -> str:
+    """Log an API error, report throttling to the governor and return a user-facing message"""
+    if is_overload_error(error_str):
+        governor.record_failure(error_str)
+        logger.warning(f"Gemini API is temporarily unavailable: {error_str}")
+        return "The AI service is temporarily unavailable. Please try again in a few moments."
+    elif "401" in error_str or "UNAUTHENTICATED" in error_str:
+        logger.error(f"Gemini API authentication failed: {error_str}")
+        return "API authentication failed. Please check your configuration."
+    elif is_quota_error(error_str):
+        logger.warning(f"Gemini API rate limit exceeded: {error_str}")
+        # Opens the circuit breaker; it recovers by itself via a half-open probe
+        governor.record_failure(error_str)
+        return "Too many requests. Please try again in a few moments."
+    elif "400" in error_str or "INVALID_ARGUMENT" in error_str:
+        logger.error(f"Invalid request to Gemini API: {error_str}")
+        return "Unable to process your request. Please try rephrasing it."
+    else:
+        logger.error(f"Error getting response from Gemini: {error_str}")
+        return "An error occurred while processing your request. Please try again."
+
+
+class GeminiError(Exception):
+    """A failed generation; str(error) is safe to show to the user"""
+
+
+def _stream(client, model: str, prompt: str, temperature: float, priority: str) -> Iterator[str]:
+    """Yield text chunks from the streaming API, governed like any other call"""
+    if not governor.try_acquire(priority):
+        raise GeminiError("Too many requests. Please try again in a few moments.")
+    stream = None
+    started = False
+    try:
+        stream = client.models.generate_content_stream(
+            model=model,
+            contents=prompt,
+            config=_generation_config(temperature)
+        )
+        for chunk in stream:
+            if not started:
+                started = True
+                governor.record_success()
+            text = chunk.text if chunk else None
+            if text:
+                yield text
+    except GeminiError:
+        raise
+    except Exception as e:
+        raise GeminiError(_api_error_message(str(e))) from e
+    finally:
+        # Also runs when the consumer stops early (client went away):
+        # closing the SDK generator releases the pooled connection
+        if stream is not None:
+            stream.close()
+
+
+def _format_chunks(chunks: Iterator[str]) -> Iterator[str]:
+    """Apply the chat reply formatting (** dropped, * as bullets) to a stream.
+
+    Trailing asterisks are held back so a '**' split across chunks is still
+    recognised.
+    """
+    pending = ''
+    first = True
+    for chunk in chunks:
+        text = pending + chunk
+        if first:
+            text = text.lstrip()
+        body = text.rstrip('*')
+        pending = text[len(body):]
+        if body:
+            first = False
+            yield body.replace("**", "").replace("*", "• ")
+    if pending:
+        yield pending.replace("**", "").replace("*", "• ")
+
+
+def stream_gemini_response(prompt: str, temperature: float = 0.7, use_cache: bool = True,
+                           priority: str = PRIORITY_STANDARD) -> Iterator[str]:
+    """
+    Streaming counterpart of get_gemini_response(): yields text as it arrives.
+    
+    A cached answer is yielded in one piece; a completed stream is cached.
+    Raises GeminiError if generation fails.
+    """
+    key = cache_key(prompt, DEFAULT_MODEL, temperature) if use_cache and response_cache.enabled else None
+    if key is None:
+        response_cache.bypass()
+    else:
+        cached = response_cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+    
+    parts = []
+    for text in _stream(get_client(), DEFAULT_MODEL, prompt, temperature, priority):
+        parts.append(text)
+        yield text
+    if key is not None and parts:
+        response_cache.set(key, ''.join(parts).strip())
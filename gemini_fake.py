@@ -0,0 +1,210 @@
+"""
+Offline stand-in for the Gemini API.
+
+With GEMINI_BACKEND=fake, gemini_client.get_client() hands out a
+FakeGeminiClient instead of a genai.Client, so the AI endpoints can be run,
+load-tested and demoed without an API key or quota. Everything above the
+client (response cache, single-flight, rate governor, retries) runs as usual.
+
+A call is answered with, in order of preference:
+
+* the reply of the first GEMINI_FAKE_REPLIES entry whose "match" occurs in the
+  prompt (JSON file: [{"match": "...", "reply": "text" or {...}}]);
+* JSON shaped by the response schema, for structured-output calls;
+* a short text templated from the start of the prompt.
+
+Each call waits GEMINI_FAKE_LATENCY_MS plus up to GEMINI_FAKE_JITTER_MS
+(streams spread that over their chunks), and fails with probability
+GEMINI_FAKE_ERROR_429 (quota, with a retryDelay), GEMINI_FAKE_ERROR_503
+(overloaded) or GEMINI_FAKE_SAFETY_BLOCK (a reply whose .text raises, as a
+safety-blocked one does).
+"""
+
+import json
+import logging
+import random
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+from google.genai import errors
+
+logger = logging.getLogger(__name__)
+
+
+class _Response:
+    """The parts of a GenerateContentResponse gemini_client reads"""
+
+    def __init__(self, text: Optional[str], blocked: bool = False):
+        self._text = text
+        self._blocked = blocked
+
+    @property
+    def text(self) -> Optional[str]:
+        if self._blocked:
+            raise ValueError("Response was blocked due to SAFETY")
+        return self._text
+
+
+class _Stream:
+    """Iterator of response chunks with the close() the SDK generator has"""
+
+    def __init__(self, chunks: Iterator[_Response]):
+        self._chunks = chunks
+
+    def __iter__(self):
+        return self._chunks
+
+    def close(self):
+        self._chunks.close()
+
+
+def _from_schema(schema: Dict[str, Any], seed: str) -> Any:
+    """A value that satisfies an OpenAPI-style schema"""
+    kind = (schema.get('type') or 'STRING').upper()
+    if kind == 'OBJECT':
+        return {name: _from_schema(prop, name) for name, prop in (schema.get('properties') or {}).items()}
+    if kind == 'ARRAY':
+        return [_from_schema(schema.get('items') or {}, f"{seed} {i}") for i in (1, 2, 3)]
+    if kind == 'INTEGER':
+        return 75
+    if kind == 'NUMBER':
+        return 0.75
+    if kind == 'BOOLEAN':
+        return True
+    return f"Sample {seed}".strip()
+
+
+class FakeModels:
+    """client.models: generate_content, generate_content_stream and get"""
+
+    def __init__(self, fake: 'FakeGeminiClient'):
+        self._fake = fake
+
+    def get(self, model: str = None, **kwargs):
+        return {'name': model}
+
+    def generate_content(self, model: str = None, contents: Any = None, config: Dict[str, Any] = None):
+        fake = self._fake
+        outcome = fake._start_call()
+        time.sleep(fake._latency())
+        if outcome == 'blocked':
+            return _Response(None, blocked=True)
+        return _Response(fake.reply(str(contents), config or {}))
+
+    def generate_content_stream(self, model: str = None, contents: Any = None, config: Dict[str, Any] = None):
+        fake = self._fake
+        outcome = fake._start_call()
+
+        def chunks():
+            latency = fake._latency()
+            if outcome == 'blocked':
+                time.sleep(latency)
+                yield _Response(None)
+                return
+            words = fake.reply(str(contents), config or {}).split(' ')
+            parts = [' '.join(words[i:i + fake.chunk_words]) + ' '
+                     for i in range(0, len(words), fake.chunk_words)]
+            for part in parts:
+                time.sleep(latency / len(parts))
+                yield _Response(part)
+
+        return _Stream(chunks())
+
+
+class FakeGeminiClient:
+    """Drop-in for genai.Client with scripted replies, latency and failures"""
+
+    def __init__(self, **settings):
+        self._lock = threading.Lock()
+        self.models = FakeModels(self)
+        self.configure(**settings)
+
+    def configure(self, latency_ms: float = 300, jitter_ms: float = 200, error_429: float = 0.0,
+                  error_503: float = 0.0, safety_block: float = 0.0, retry_delay: float = 5,
+                  replies: List[Dict[str, Any]] = None, replies_path: str = None,
+                  chunk_words: int = 8, seed: int = None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_429 = error_429
+        self.error_503 = error_503
+        self.safety_block = safety_block
+        self.retry_delay = retry_delay
+        self.chunk_words = max(1, chunk_words)
+        self.replies = list(replies or [])
+        if replies_path:
+            try:
+                with open(replies_path, encoding='utf-8') as f:
+                    self.replies.extend(json.load(f))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Fake Gemini replies not loaded ({replies_path}): {e}")
+        self._random = random.Random(seed)
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._counts = {'calls': 0, 'errors_429': 0, 'errors_503': 0, 'blocked': 0}
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
+    def _latency(self) -> float:
+        with self._lock:
+            jitter = self._random.random() * self.jitter_ms
+        return (self.latency_ms + jitter) / 1000
+
+    def _start_call(self) -> str:
+        """Count the call and draw its outcome; raises for injected API errors"""
+        with self._lock:
+            self._counts['calls'] += 1
+            roll = self._random.random()
+            if roll < self.error_429:
+                self._counts['errors_429'] += 1
+                outcome = '429'
+            elif roll < self.error_429 + self.error_503:
+                self._counts['errors_503'] += 1
+                outcome = '503'
+            elif roll < self.error_429 + self.error_503 + self.safety_block:
+                self._counts['blocked'] += 1
+                outcome = 'blocked'
+            else:
+                outcome = 'ok'
+        if outcome == '429':
+            raise errors.ClientError(429, {'error': {
+                'code': 429, 'status': 'RESOURCE_EXHAUSTED',
+                'message': 'You exceeded your current quota, please check your plan and billing details.',
+                'details': [{'@type': 'type.googleapis.com/google.rpc.RetryInfo',
+                             'retryDelay': f"{self.retry_delay:g}s"}]}})
+        if outcome == '503':
+            raise errors.ServerError(503, {'error': {
+                'code': 503, 'status': 'UNAVAILABLE',
+                'message': 'The model is overloaded. Please try again later.'}})
+        return outcome
+
+    def reply(self, prompt: str, config: Dict[str, Any]) -> str:
+        for entry in self.replies:
+            if entry.get('match', '') in prompt:
+                reply = entry.get('reply', '')
+                return reply if isinstance(reply, str) else json.dumps(reply)
+        if config.get('response_schema'):
+            return json.dumps(_from_schema(config['response_schema'], 'answer'))
+        subject = ' '.join(prompt.split()[:12])
+        return (f"This is an offline sample answer. You asked about: {subject}. "
+                "• First suggestion\n• Second suggestion\n• Third suggestion")
+
+
+fake_client = FakeGeminiClient()
+
+
+def init_app(app):
+    """Configure the process-wide fake from GEMINI_FAKE_* settings"""
+    fake_client.configure(
+        latency_ms=app.config.get('GEMINI_FAKE_LATENCY_MS', 300),
+        jitter_ms=app.config.get('GEMINI_FAKE_JITTER_MS', 200),
+        error_429=app.config.get('GEMINI_FAKE_ERROR_429', 0.0),
+        error_503=app.config.get('GEMINI_FAKE_ERROR_503', 0.0),
+        safety_block=app.config.get('GEMINI_FAKE_SAFETY_BLOCK', 0.0),
+        replies_path=app.config.get('GEMINI_FAKE_REPLIES') or None,
+        seed=app.config.get('GEMINI_FAKE_SEED'),
+    )
@@ -0,0 +1,332 @@
+"""
+Rate governor and circuit breaker for Gemini traffic.
+
+Every API call first asks the governor for a token:
+
+* A token bucket (GEMINI_RATE_PER_MINUTE, bursting to GEMINI_RATE_BURST) keeps
+  us under the project quota. Priorities reserve the tail of the bucket: a
+  background call is refused while less than half the burst is left, so
+  autocomplete bursts cannot starve interactive chat.
+* A circuit breaker opens on a 429, or after GEMINI_BREAKER_THRESHOLD
+  consecutive 503s. While open every call is refused
+  without touching the network; after the cool-down (the server's retryDelay
+  when it sends one, otherwise doubling from GEMINI_BREAKER_COOLDOWN) one
+  half-open probe is let through, and its outcome closes or re-opens the
+  circuit. Recovery is automatic - there is no flag to clear by hand.
+
+State lives in Redis when GEMINI_GOVERNOR_REDIS_URL (by default the
+CACHE_REDIS_URL) is set, so all workers share one budget and one breaker.
+Without Redis - or while it is unreachable - the workers on a host share a
+SQLite file (GEMINI_GOVERNOR_DB) instead, so N workers still get one quota
+rather than N. Only when neither is usable does each worker govern itself.
+A backend that fails is skipped for BACKEND_RETRY_SECONDS before it is tried
+again, so an outage costs one warning, not one per call.
+"""
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_INTERACTIVE = 'interactive'
+PRIORITY_STANDARD = 'standard'
+PRIORITY_BACKGROUND = 'background'
+
+# Share of the burst that must remain for a priority to be admitted
+PRIORITY_RESERVE = {
+    PRIORITY_INTERACTIVE: 0.0,
+    PRIORITY_STANDARD: 0.2,
+    PRIORITY_BACKGROUND: 0.5,
+}
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+# How long a failed shared backend is bypassed before it is tried again
+BACKEND_RETRY_SECONDS = 30.0
+
+_RETRY_DELAY_RE = re.compile(r"retryDelay['\"]?\s*:\s*['\"]?(\d+(?:\.\d+)?)s")
+
+
+def is_quota_error(error_str: str) -> bool:
+    return '429' in error_str or 'RESOURCE_EXHAUSTED' in error_str
+
+
+def is_overload_error(error_str: str) -> bool:
+    return '503' in error_str or 'UNAVAILABLE' in error_str or 'overloaded' in error_str.lower()
+
+
+def retry_after_seconds(error_str: str) -> Optional[float]:
+    """The retryDelay Google includes in 429 error details, if any"""
+    match = _RETRY_DELAY_RE.search(error_str)
+    return float(match.group(1)) if match else None
+
+
+class _LocalBackend:
+    """Governor state for this worker only"""
+
+    name = 'worker'
+
+    def __init__(self):
+        self._state: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def transact(self, fn: Callable[[Dict[str, Any]], Any]) -> Any:
+        with self._lock:
+            return fn(self._state)
+
+
+class _SQLiteBackend:
+    """Governor state in a SQLite file shared by the workers on this host"""
+
+    name = 'host'
+
+    def __init__(self, path: str, key: str = 'gemini:governor'):
+        self.path = path
+        self.key = key
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS gemini_governor (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            )
+        """)
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per thread (and per process, keyed by pid); autocommit
+        # so transact() can take the write lock up front with BEGIN IMMEDIATE
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=1, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def transact(self, fn: Callable[[Dict[str, Any]], Any]) -> Any:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT value FROM gemini_governor WHERE key = ?", (self.key,)).fetchone()
+            state = json.loads(row[0]) if row else {}
+            value = fn(state)
+            conn.execute("INSERT OR REPLACE INTO gemini_governor (key, value) VALUES (?, ?)",
+                         (self.key, json.dumps(state)))
+            conn.execute("COMMIT")
+            return value
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+
+class _RedisBackend:
+    """Governor state in one Redis key, updated with optimistic transactions"""
+
+    name = 'redis'
+
+    def __init__(self, url: str, key: str = 'gemini:governor'):
+        import redis
+        self.client = redis.Redis.from_url(url, socket_timeout=1, socket_connect_timeout=1)
+        self.key = key
+
+    def transact(self, fn: Callable[[Dict[str, Any]], Any]) -> Any:
+        result = {}
+
+        def update(pipe):
+            raw = pipe.get(self.key)
+            state = json.loads(raw) if raw else {}
+            result['value'] = fn(state)
+            pipe.multi()
+            pipe.set(self.key, json.dumps(state))
+
+        self.client.transaction(update, self.key)
+        return result['value']
+
+
+class GeminiGovernor:
+    """Token bucket plus circuit breaker, shared through a state backend"""
+
+    def __init__(self, rate_per_minute: float = 30, burst: int = 10, cooldown: float = 30,
+                 max_cooldown: float = 600, threshold: int = 3, probe_timeout: float = 60):
+        self._local = _LocalBackend()
+        self.configure(rate_per_minute, burst, cooldown, max_cooldown, threshold, probe_timeout)
+
+    def configure(self, rate_per_minute: float = 30, burst: int = 10, cooldown: float = 30,
+                  max_cooldown: float = 600, threshold: int = 3, probe_timeout: float = 60,
+                  redis_url: str = None, db_path: str = None):
+        self.rate = rate_per_minute / 60.0
+        self.burst = burst
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.probe_timeout = probe_timeout
+        # Tried in order; the per-worker state always answers
+        self._backends = []
+        self._down_until: Dict[str, float] = {}
+        if redis_url:
+            try:
+                self._backends.append(_RedisBackend(redis_url))
+            except Exception as e:
+                logger.warning(f"Gemini governor not using Redis: {e}")
+        if db_path:
+            try:
+                self._backends.append(_SQLiteBackend(db_path))
+            except Exception as e:
+                logger.warning(f"Gemini governor not using host state ({db_path}): {e}")
+        self._backends.append(self._local)
+        self._backend = self._backends[0]
+
+    def _transact(self, fn):
+        for backend in self._backends[:-1]:
+            if time.monotonic() < self._down_until.get(backend.name, 0):
+                continue
+            try:
+                result = backend.transact(fn)
+            except Exception as e:
+                # An outage must not take AI features down with it, nor flood the log
+                self._down_until[backend.name] = time.monotonic() + BACKEND_RETRY_SECONDS
+                logger.warning(f"Gemini governor {backend.name} state unavailable, "
+                               f"skipping it for {BACKEND_RETRY_SECONDS:.0f}s: {e}")
+                continue
+            if self._down_until.pop(backend.name, None) is not None:
+                logger.info(f"Gemini governor {backend.name} state available again")
+            self._backend = backend
+            return result
+        self._backend = self._backends[-1]
+        return self._backend.transact(fn)
+
+    def _refill(self, state: Dict[str, Any], now: float):
+        tokens = state.get('tokens', float(self.burst))
+        updated = state.get('updated', now)
+        state['tokens'] = min(float(self.burst), tokens + max(0.0, now - updated) * self.rate)
+        state['updated'] = now
+
+    def try_acquire(self, priority: str = PRIORITY_STANDARD) -> bool:
+        """Take a token for one API call; False means don't call the API now"""
+        reserve = PRIORITY_RESERVE.get(priority, PRIORITY_RESERVE[PRIORITY_STANDARD]) * self.burst
+
+        def acquire(state):
+            now = time.time()
+            self._refill(state, now)
+            circuit = state.get('circuit', CLOSED)
+            if circuit == OPEN:
+                if now < state.get('open_until', 0):
+                    return self._reject(state, priority, 'circuit')
+                state['circuit'] = circuit = HALF_OPEN
+            if circuit == HALF_OPEN:
+                # One probe at a time; a probe that never reports back expires
+                if now < state.get('probe_until', 0):
+                    return self._reject(state, priority, 'circuit')
+                state['probe_until'] = now + self.probe_timeout
+            elif state['tokens'] - 1 < reserve:
+                return self._reject(state, priority, 'budget')
+            state['tokens'] = max(0.0, state['tokens'] - 1)
+            admitted = state.setdefault('admitted', {})
+            admitted[priority] = admitted.get(priority, 0) + 1
+            return True
+
+        return self._transact(acquire)
+
+    @staticmethod
+    def _reject(state, priority: str, reason: str) -> bool:
+        rejects = state.setdefault('rejects', {})
+        key = f"{priority}:{reason}"
+        rejects[key] = rejects.get(key, 0) + 1
+        return False
+
+    def record_success(self):
+        def close(state):
+            if state.get('circuit', CLOSED) != CLOSED:
+                logger.info("Gemini circuit closed after a successful probe")
+            state.update(circuit=CLOSED, trips=0, failures=0, probe_until=0)
+
+        self._transact(close)
+
+    def record_failure(self, error: str) -> bool:
+        """Count a 429/503; returns True when it opened the circuit"""
+        retry_after = retry_after_seconds(error)
+
+        def trip(state):
+            now = time.time()
+            state['failures'] = failures = state.get('failures', 0) + 1
+            # Quota errors and failed probes open at once; overloads after a streak
+            if not (is_quota_error(error) or state.get('circuit', CLOSED) != CLOSED
+                    or failures >= self.threshold):
+                return None
+            trips = state.get('trips', 0)
+            delay = retry_after or min(self.cooldown * (2 ** trips), self.max_cooldown)
+            state.update(circuit=OPEN, open_until=now + delay, trips=trips + 1, failures=0,
+                         probe_until=0, last_error=error[:200], last_trip_at=now)
+            # Whatever budget we thought we had, the server disagrees
+            state['tokens'] = 0.0
+            state['updated'] = now
+            return delay
+
+        delay = self._transact(trip)
+        if delay is None:
+            return False
+        logger.warning(f"Gemini circuit open for {delay:.0f}s")
+        return True
+
+    def available(self, priority: str = PRIORITY_STANDARD) -> bool:
+        """Would a call at this priority be admitted right now? (takes no token)"""
+        snapshot = self.snapshot()
+        if snapshot['circuit'] == OPEN:
+            return False
+        reserve = PRIORITY_RESERVE.get(priority, PRIORITY_RESERVE[PRIORITY_STANDARD]) * self.burst
+        return snapshot['circuit'] == HALF_OPEN or snapshot['tokens'] - 1 >= reserve
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Budget, breaker state, rejects and time to recovery"""
+        def read(state):
+            now = time.time()
+            self._refill(state, now)
+            circuit = state.get('circuit', CLOSED)
+            open_until = state.get('open_until', 0)
+            if circuit == OPEN and now >= open_until:
+                circuit = HALF_OPEN
+            return {
+                'circuit': circuit,
+                'tokens': round(state['tokens'], 2),
+                'burst': self.burst,
+                'rate_per_minute': self.rate * 60,
+                'recovers_in_seconds': round(max(0.0, open_until - now), 1) if circuit == OPEN else 0,
+                'trips': state.get('trips', 0),
+                'consecutive_failures': state.get('failures', 0),
+                'last_error': state.get('last_error'),
+                'admitted': dict(state.get('admitted', {})),
+                'rejects': dict(state.get('rejects', {})),
+            }
+
+        snapshot = self._transact(read)
+        # Whichever backend just answered
+        snapshot.update(backend=self._backend.name, shared=self._backend is not self._local)
+        return snapshot
+
+    def reset(self):
+        self._transact(lambda state: state.clear())
+
+
+governor = GeminiGovernor()
+
+
+def init_app(app):
+    """Configure the process-wide governor from GEMINI_RATE_* / GEMINI_BREAKER_* settings"""
+    governor.configure(
+        rate_per_minute=app.config.get('GEMINI_RATE_PER_MINUTE', 30),
+        burst=app.config.get('GEMINI_RATE_BURST', 10),
+        cooldown=app.config.get('GEMINI_BREAKER_COOLDOWN', 30),
+        max_cooldown=app.config.get('GEMINI_BREAKER_MAX_COOLDOWN', 600),
+        threshold=app.config.get('GEMINI_BREAKER_THRESHOLD', 3),
+        redis_url=app.config.get('GEMINI_GOVERNOR_REDIS_URL'),
+        db_path=app.config.get('GEMINI_GOVERNOR_DB') or None,
+    )
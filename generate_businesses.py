@@ -624,6 +624,7 @@ def generate_businesses():
                     # Create business node
                     safe_run(session, """
                         CREATE (b:Business $business_data)
+                        SET b.position = point({latitude: b.latitude, longitude: b.longitude})
                     """, {'business_data': business_data})
                     created_count += 1
                     print(f"[OK] Created: {business_data['name']}")
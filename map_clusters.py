@@ -0,0 +1,110 @@
+"""
+Viewport-bounded, zoom-aware map points.
+
+Map endpoints take the visible bounding box and zoom level. Only nodes inside
+the box are matched (a point.withinBBox() predicate served by the
+business_position POINT index, see migrations.py), and the server snaps them to
+a lat/lng grid whose cells shrink as the zoom grows. Each cell comes back as a
+single cluster with a count and centroid; cells with few enough members come
+back as their individual points. The payload is therefore bounded by the number
+of grid cells on screen, not by the number of listings.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+# Grid cells per 256px map tile edge: 4 gives roughly 64px cells on screen
+CELLS_PER_TILE = 4
+# At or beyond this zoom each cell is sent as its points (up to MAX_LEAF_POINTS)
+MAX_CLUSTER_ZOOM = 16
+# A cell with at most this many points is sent as individual points
+LEAF_SIZE = 1
+# Points sent per cell once clustering stops
+MAX_LEAF_POINTS = 50
+
+DEFAULT_ZOOM = 10
+# Catanduanes with some margin; used when a client sends no bbox
+DEFAULT_BBOX = (123.9, 13.4, 124.5, 14.2)
+
+
+def parse_bbox(value: str) -> Optional[Tuple[float, float, float, float]]:
+    """Parse Leaflet's toBBoxString() form 'west,south,east,north'"""
+    if not value:
+        return None
+    try:
+        west, south, east, north = (float(part) for part in value.split(','))
+    except ValueError:
+        return None
+    if not (-180 <= west <= 180 and -180 <= east <= 180 and -90 <= south <= north <= 90):
+        return None
+    return west, south, east, north
+
+
+def parse_zoom(value, default: int = DEFAULT_ZOOM) -> int:
+    try:
+        return max(0, min(int(value), 22))
+    except (TypeError, ValueError):
+        return default
+
+
+def cell_size(zoom: int) -> float:
+    """Grid cell edge in degrees for a zoom level"""
+    return 360.0 / (2 ** zoom) / CELLS_PER_TILE
+
+
+def bbox_condition(point_expr: str) -> str:
+    """Cypher predicate restricting point_expr to the $bbox_* parameters"""
+    return (f"point.withinBBox({point_expr}, "
+            f"point({{longitude: $bbox_west, latitude: $bbox_south}}), "
+            f"point({{longitude: $bbox_east, latitude: $bbox_north}}))")
+
+
+def bbox_params(bbox: Tuple[float, float, float, float]) -> Dict[str, float]:
+    west, south, east, north = bbox
+    return {'bbox_west': west, 'bbox_south': south, 'bbox_east': east, 'bbox_north': north}
+
+
+def cluster_query(match: str, point_expr: str, item_expr: str) -> str:
+    """Wrap a MATCH ... WHERE clause (already bbox-bounded) in the grid aggregation.
+
+    item_expr is a map projection of the fields a single point needs.
+    """
+    return f"""
+        {match}
+        WITH {point_expr} AS p, {item_expr} AS item
+        WITH toInteger(floor(p.longitude / $cell)) AS cx,
+             toInteger(floor(p.latitude / $cell)) AS cy, p, item
+        WITH cx, cy, count(*) AS count,
+             avg(p.latitude) AS lat, avg(p.longitude) AS lng,
+             collect(item)[0..$leaf_points] AS items
+        RETURN count, lat, lng, items
+    """
+
+
+def cluster_params(bbox: Tuple[float, float, float, float], zoom: int) -> Dict[str, Any]:
+    leaf_points = MAX_LEAF_POINTS if zoom >= MAX_CLUSTER_ZOOM else LEAF_SIZE
+    return {**bbox_params(bbox), 'cell': cell_size(zoom), 'leaf_points': leaf_points}
+
+
+def split_cells(rows, zoom: int) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Split aggregated cells into (clusters, points)"""
+    leaf_size = MAX_LEAF_POINTS if zoom >= MAX_CLUSTER_ZOOM else LEAF_SIZE
+    clusters, points = [], []
+    for row in rows:
+        if row['count'] <= leaf_size:
+            points.extend(row['items'])
+        else:
+            clusters.append({
+                'count': row['count'],
+                'lat': round(row['lat'], 6),
+                'lng': round(row['lng'], 6),
+                # Two levels in, the cell splits into sixteen smaller ones
+                'expansion_zoom': min(zoom + 2, MAX_CLUSTER_ZOOM),
+            })
+    return clusters, points
+
+
+def request_viewport(args) -> Tuple[Tuple[float, float, float, float], int]:
+    """(bbox, zoom) from request args; accepts ?bbox= or the older ?bounds="""
+    bbox = parse_bbox(args.get('bbox') or args.get('bounds') or '') or DEFAULT_BBOX
+    return bbox, parse_zoom(args.get('zoom'))
+
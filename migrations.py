@@ -0,0 +1,219 @@
+"""
+Versioned Neo4j schema migrations.
+
+Each migration is a list of idempotent schema statements (constraints and
+indexes). The highest applied version is stored on a (:SchemaVersion) node and
+every applied step is recorded as a (:SchemaMigration) node, so startup only
+runs what is missing.
+
+REPEATABLE statements are idempotent data fixes that run on every migrate,
+after the versioned steps, for nodes written outside the routes that keep them
+up to date (seed scripts, imports).
+
+Run automatically from create_app() when NEO4J_AUTO_MIGRATE is set, or by hand:
+    flask --app app migrate-schema [--status]
+"""
+
+import logging
+from collections import namedtuple
+from datetime import datetime
+
+import click
+
+logger = logging.getLogger(__name__)
+
+Migration = namedtuple('Migration', ['version', 'description', 'statements'])
+
+MIGRATIONS = [
+    Migration(1, 'Baseline uniqueness constraints', [
+        "CREATE CONSTRAINT schema_version_id_unique IF NOT EXISTS FOR (s:SchemaVersion) REQUIRE s.id IS UNIQUE",
+        "CREATE CONSTRAINT user_email_unique IF NOT EXISTS FOR (u:User) REQUIRE u.email IS UNIQUE",
+        "CREATE CONSTRAINT business_name_unique IF NOT EXISTS FOR (b:Business) REQUIRE b.name IS UNIQUE",
+        "CREATE CONSTRAINT job_id_unique IF NOT EXISTS FOR (j:Job) REQUIRE j.id IS UNIQUE",
+        "CREATE CONSTRAINT service_id_unique IF NOT EXISTS FOR (s:Service) REQUIRE s.id IS UNIQUE",
+    ]),
+    Migration(2, 'Uniqueness constraints on id lookups', [
+        "CREATE CONSTRAINT user_id_unique IF NOT EXISTS FOR (u:User) REQUIRE u.id IS UNIQUE",
+        "CREATE CONSTRAINT business_id_unique IF NOT EXISTS FOR (b:Business) REQUIRE b.id IS UNIQUE",
+        "CREATE CONSTRAINT job_application_id_unique IF NOT EXISTS FOR (a:JobApplication) REQUIRE a.id IS UNIQUE",
+        "CREATE CONSTRAINT interview_id_unique IF NOT EXISTS FOR (i:Interview) REQUIRE i.id IS UNIQUE",
+        "CREATE CONSTRAINT notification_id_unique IF NOT EXISTS FOR (n:Notification) REQUIRE n.id IS UNIQUE",
+        "CREATE CONSTRAINT user_message_id_unique IF NOT EXISTS FOR (m:UserMessage) REQUIRE m.id IS UNIQUE",
+        "CREATE CONSTRAINT verification_id_unique IF NOT EXISTS FOR (v:Verification) REQUIRE v.id IS UNIQUE",
+        "CREATE CONSTRAINT review_id_unique IF NOT EXISTS FOR (r:Review) REQUIRE r.id IS UNIQUE",
+    ]),
+    Migration(3, 'Range indexes on filter and sort properties', [
+        "CREATE INDEX notification_user_id IF NOT EXISTS FOR (n:Notification) ON (n.user_id)",
+        "CREATE INDEX notification_created_at IF NOT EXISTS FOR (n:Notification) ON (n.created_at)",
+        "CREATE INDEX user_message_sender_id IF NOT EXISTS FOR (m:UserMessage) ON (m.sender_id)",
+        "CREATE INDEX user_message_recipient_id IF NOT EXISTS FOR (m:UserMessage) ON (m.recipient_id)",
+        "CREATE INDEX user_message_timestamp IF NOT EXISTS FOR (m:UserMessage) ON (m.timestamp)",
+        "CREATE INDEX job_is_active IF NOT EXISTS FOR (j:Job) ON (j.is_active)",
+        "CREATE INDEX job_created_at IF NOT EXISTS FOR (j:Job) ON (j.created_at)",
+        "CREATE INDEX business_created_at IF NOT EXISTS FOR (b:Business) ON (b.created_at)",
+        "CREATE INDEX business_is_verified IF NOT EXISTS FOR (b:Business) ON (b.is_verified)",
+        "CREATE INDEX user_role IF NOT EXISTS FOR (u:User) ON (u.role)",
+        "CREATE INDEX user_created_at IF NOT EXISTS FOR (u:User) ON (u.created_at)",
+        "CREATE INDEX user_verification_token IF NOT EXISTS FOR (u:User) ON (u.verification_token)",
+        "CREATE INDEX user_reset_token IF NOT EXISTS FOR (u:User) ON (u.reset_token)",
+        "CREATE INDEX chat_conversation_user_id IF NOT EXISTS FOR (c:ChatConversation) ON (c.user_id)",
+    ]),
+    Migration(4, 'Composite indexes for listings and inbox lookups', [
+        "CREATE INDEX job_active_created_at IF NOT EXISTS FOR (j:Job) ON (j.is_active, j.created_at)",
+        "CREATE INDEX user_message_pair IF NOT EXISTS FOR (m:UserMessage) ON (m.sender_id, m.recipient_id)",
+        "CREATE INDEX notification_user_read IF NOT EXISTS FOR (n:Notification) ON (n.user_id, n.is_read)",
+    ]),
+    Migration(5, 'Full-text indexes for job search', [
+        "CREATE FULLTEXT INDEX job_text IF NOT EXISTS FOR (j:Job) ON EACH [j.title, j.description, j.requirements]",
+        "CREATE FULLTEXT INDEX business_name_text IF NOT EXISTS FOR (b:Business) ON EACH [b.name]",
+    ]),
+    Migration(6, 'Range indexes for keyset pagination sort keys', [
+        "CREATE INDEX verification_created_at IF NOT EXISTS FOR (v:Verification) ON (v.created_at)",
+        "CREATE INDEX user_username IF NOT EXISTS FOR (u:User) ON (u.username)",
+        "CREATE INDEX job_title IF NOT EXISTS FOR (j:Job) ON (j.title)",
+    ]),
+    Migration(7, 'Business position point and POINT index for map viewports', [
+        "CREATE POINT INDEX business_position IF NOT EXISTS FOR (b:Business) ON (b.position)",
+        """
+        MATCH (b:Business)
+        WHERE b.latitude IS NOT NULL AND b.longitude IS NOT NULL AND b.position IS NULL
+        SET b.position = point({latitude: toFloat(b.latitude), longitude: toFloat(b.longitude)})
+        """,
+    ]),
+    Migration(8, 'Composite indexes for the single-query inbox', [
+        "CREATE INDEX user_message_sender_timestamp IF NOT EXISTS FOR (m:UserMessage) ON (m.sender_id, m.timestamp)",
+        "CREATE INDEX user_message_recipient_timestamp IF NOT EXISTS "
+        "FOR (m:UserMessage) ON (m.recipient_id, m.timestamp)",
+    ]),
+    Migration(9, 'Conversation nodes with last message and unread counts', [
+        "CREATE CONSTRAINT conversation_id_unique IF NOT EXISTS FOR (c:Conversation) REQUIRE c.id IS UNIQUE",
+        "CREATE INDEX user_message_conversation_timestamp IF NOT EXISTS "
+        "FOR (m:UserMessage) ON (m.conversation_id, m.timestamp)",
+        # conversation_id is the two user ids sorted and joined with ':'
+        # (blueprints.chat.routes.conversation_id)
+        """
+        MATCH (m:UserMessage)
+        WHERE m.conversation_id IS NULL AND m.sender_id IS NOT NULL AND m.recipient_id IS NOT NULL
+        CALL {
+            WITH m
+            SET m.conversation_id = CASE WHEN m.sender_id <= m.recipient_id
+                                         THEN m.sender_id + ':' + m.recipient_id
+                                         ELSE m.recipient_id + ':' + m.sender_id END
+        } IN TRANSACTIONS OF 1000 ROWS
+        """,
+        # One pass over the messages per conversation; previews are cut at
+        # the inbox's 80 characters
+        """
+        MATCH (m:UserMessage)
+        WHERE m.conversation_id IS NOT NULL
+        WITH m.conversation_id AS cid, split(m.conversation_id, ':') AS ids, m
+        WITH cid, ids, max(m.timestamp) AS last_at,
+             sum(CASE WHEN m.read = false AND m.sender_id <> m.recipient_id AND m.recipient_id = ids[0]
+                      THEN 1 ELSE 0 END) AS unread_0,
+             sum(CASE WHEN m.read = false AND m.sender_id <> m.recipient_id AND m.recipient_id = ids[1]
+                      THEN 1 ELSE 0 END) AS unread_1
+        CALL {
+            WITH cid, ids, last_at, unread_0, unread_1
+            MATCH (last:UserMessage)
+            WHERE last.conversation_id = cid AND last.timestamp = last_at
+            WITH cid, ids, last_at, unread_0, unread_1, last
+            ORDER BY last.id DESC
+            LIMIT 1
+            MATCH (a:User {id: ids[0]}), (b:User {id: ids[1]})
+            MERGE (c:Conversation {id: cid})
+            ON CREATE SET c.participant_ids = ids, c.created_at = last_at
+            SET c.last_message_at = last_at,
+                c.last_message_id = last.id,
+                c.last_message_preview = left(last.text, 80),
+                c.last_sender_id = last.sender_id
+            MERGE (a)-[pa:PARTICIPATES_IN]->(c)
+            SET pa.unread_count = unread_0
+            MERGE (b)-[pb:PARTICIPATES_IN]->(c)
+            SET pb.unread_count = unread_1
+        } IN TRANSACTIONS OF 500 ROWS
+        """,
+        # The inbox and threads now read Conversation / conversation_id, so the
+        # migration 8 composites back no query; sender_id and recipient_id
+        # keep their single-property indexes
+        "DROP INDEX user_message_sender_timestamp IF EXISTS",
+        "DROP INDEX user_message_recipient_timestamp IF EXISTS",
+    ]),
+]
+
+
+REPEATABLE = [
+    # Businesses only appear on the viewport maps through position (migration 7)
+    """
+    MATCH (b:Business)
+    WHERE b.latitude IS NOT NULL AND b.longitude IS NOT NULL AND b.position IS NULL
+    SET b.position = point({latitude: toFloat(b.latitude), longitude: toFloat(b.longitude)})
+    """,
+]
+
+
+def get_schema_version(session) -> int:
+    """Return the highest applied migration version (0 for a fresh graph)"""
+    record = session.run(
+        "MATCH (s:SchemaVersion {id: 'schema'}) RETURN s.version as version"
+    ).single()
+    return record['version'] if record and record['version'] is not None else 0
+
+
+def run_migrations(db=None, target: int = None) -> list:
+    """Apply pending migrations up to target (default: latest).
+
+    Returns the versions applied. Stops at the first failing migration so the
+    recorded version never runs ahead of the real schema.
+    """
+    if db is None:
+        from database import get_neo4j_db
+        db = get_neo4j_db()
+
+    applied = []
+    with db.session() as session:
+        current = get_schema_version(session)
+        for migration in MIGRATIONS:
+            if migration.version <= current or (target is not None and migration.version > target):
+                continue
+            logger.info(f"Applying schema migration {migration.version}: {migration.description}")
+            try:
+                for statement in migration.statements:
+                    session.run(statement).consume()
+            except Exception as e:
+                logger.error(f"Schema migration {migration.version} failed: {e}")
+                break
+            session.run("""
+                MERGE (s:SchemaVersion {id: 'schema'})
+                SET s.version = CASE WHEN coalesce(s.version, 0) < $version THEN $version ELSE s.version END,
+                    s.updated_at = $applied_at
+                MERGE (m:SchemaMigration {version: $version})
+                ON CREATE SET m.description = $description, m.applied_at = $applied_at
+            """, {
+                'version': migration.version,
+                'description': migration.description,
+                'applied_at': datetime.utcnow().isoformat()
+            }).consume()
+            applied.append(migration.version)
+        if target is None:
+            for statement in REPEATABLE:
+                session.run(statement).consume()
+    return applied
+
+
+def register_cli(app):
+    """Register `flask migrate-schema` on the app"""
+
+    @app.cli.command('migrate-schema')
+    @click.option('--status', is_flag=True, help='Show the applied version and exit.')
+    @click.option('--target', type=int, default=None, help='Stop after this version.')
+    def migrate_schema(status, target):
+        """Create the constraints and indexes the routes rely on."""
+        from database import get_neo4j_db
+        db = get_neo4j_db()
+        if status:
+            with db.session() as session:
+                current = get_schema_version(session)
+            click.echo(f"Schema version {current} (latest {MIGRATIONS[-1].version})")
+            return
+        applied = run_migrations(db, target)
+        click.echo(f"Applied migrations: {applied}" if applied else "Schema is up to date")
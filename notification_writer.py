@@ -0,0 +1,197 @@
+"""
+Batched writer for in-app notifications.
+
+create_notification_task used to start a thread per notification, which
+opened two sessions (user check, then CREATE). A fan-out such as a job
+approval or a burst of applicants multiplied both. Now callers put the
+notification on a bounded queue and return; one writer thread per worker
+creates whatever has queued up with a single UNWIND, once
+NOTIFICATION_BATCH_SIZE are waiting or NOTIFICATION_FLUSH_SECONDS after the
+first one arrived. Each notification is attached to its user with
+(:User)-[:HAS_NOTIFICATION]->(:Notification) and keeps its user_id property
+for the existing indexed lookups; rows for unknown users are skipped by the
+MATCH. After a batch is written its notifications are pushed to open pages
+(realtime.publish).
+
+When the queue is full, submit() blocks for up to NOTIFICATION_PUT_TIMEOUT
+and then writes that notification itself, so a burst slows its producers
+down instead of growing memory or losing notifications. On shutdown the
+queue is drained before the process exits.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from realtime import publish
+
+logger = logging.getLogger(__name__)
+
+# Neo4j properties cannot hold maps, so `data` is stored as a JSON string
+_CREATE_NOTIFICATIONS = """
+    UNWIND $rows AS row
+    MATCH (u:User {id: row.user_id})
+    CREATE (n:Notification {
+        id: row.id,
+        user_id: row.user_id,
+        type: row.type,
+        title: row.title,
+        message: row.message,
+        data: row.data,
+        is_read: false,
+        created_at: row.created_at
+    })
+    CREATE (u)-[:HAS_NOTIFICATION]->(n)
+    RETURN n.id AS id
+"""
+
+_STOP = object()
+
+
+def decode_data(value) -> Dict[str, Any]:
+    """A notification's data as a dict (it is stored as JSON)"""
+    if isinstance(value, dict):
+        return value
+    try:
+        return json.loads(value) if value else {}
+    except (TypeError, ValueError):
+        return {}
+
+
+def _write_batch(config: Dict[str, Any], rows: List[Dict[str, Any]]) -> List[str]:
+    """Create the notifications in one statement; returns the ids written"""
+    from database import get_shared_connection, safe_run
+    with get_shared_connection(config).session() as session:
+        records = safe_run(session, _CREATE_NOTIFICATIONS, {
+            'rows': [{**row, 'data': json.dumps(row.get('data') or {}, default=str)} for row in rows],
+        })
+    return [record['id'] for record in records]
+
+
+class NotificationWriter:
+    """Bounded queue drained in batches by one background thread"""
+
+    def __init__(self, write: Callable[[Dict[str, Any], List[Dict[str, Any]]], List[str]] = None):
+        self._write = write or _write_batch
+        self._config: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._counts = {'queued': 0, 'written': 0, 'skipped': 0, 'failed': 0, 'inline': 0, 'batches': 0}
+        self.configure()
+
+    def configure(self, max_queue: int = 1000, batch_size: int = 100, flush_seconds: float = 0.5,
+                  put_timeout: float = 1.0, config: Dict[str, Any] = None):
+        # Write out what the previous queue holds before replacing it
+        self.close()
+        self.batch_size = max(1, batch_size)
+        self.flush_seconds = flush_seconds
+        self.put_timeout = put_timeout
+        if config is not None:
+            self._config = config
+        self._queue = queue.Queue(maxsize=max_queue)
+
+    def _ensure_started(self):
+        """Start the writer; lazily, and again after a fork, which threads don't survive"""
+        if self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid != os.getpid() or not self._thread.is_alive():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name='notification-writer', daemon=True)
+                self._thread.start()
+
+    def submit(self, notification: Dict[str, Any]) -> bool:
+        """Queue a notification (a dict with id and user_id); False if it cannot be written"""
+        if self._config is None:
+            logger.warning(f"Notification writer not configured; dropped {notification.get('title')!r}")
+            return False
+        self._ensure_started()
+        try:
+            self._queue.put(notification, timeout=self.put_timeout)
+        except queue.Full:
+            # Backpressure: the writer is behind, so this caller writes its own
+            self._count('inline')
+            return self._flush([notification])
+        self._count('queued')
+        return True
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            batch = [first]
+            deadline = time.monotonic() + self.flush_seconds
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            self._flush(batch)
+            if stop:
+                return
+
+    def _flush(self, batch: List[Dict[str, Any]]) -> bool:
+        try:
+            written = set(self._write(self._config, batch))
+        except Exception as e:
+            logger.error(f"Failed to write {len(batch)} notifications: {e}")
+            self._count('failed', len(batch))
+            return False
+        self._count('batches')
+        self._count('written', len(written))
+        if len(written) < len(batch):
+            self._count('skipped', len(batch) - len(written))
+            logger.warning(f"Skipped {len(batch) - len(written)} notifications for users that do not exist")
+        for row in batch:
+            if row['id'] in written:
+                publish(row['user_id'], 'notification', row)
+        return bool(written)
+
+    def _count(self, name: str, n: int = 1):
+        with self._lock:
+            self._counts[name] += n
+
+    def close(self, timeout: float = 10.0):
+        """Write everything still queued, then stop the writer thread"""
+        thread = getattr(self, '_thread', None)
+        if thread is None or self._pid != os.getpid() or not thread.is_alive():
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logger.warning("Notification queue still full at shutdown; some notifications were not written")
+            return
+        thread.join(timeout)
+        if thread.is_alive():
+            logger.warning("Notification writer did not finish draining before shutdown")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._counts, 'pending': self._queue.qsize()}
+
+
+notification_writer = NotificationWriter()
+atexit.register(notification_writer.close)
+
+
+def init_app(app):
+    """Configure the process-wide writer from NOTIFICATION_* settings"""
+    notification_writer.configure(
+        max_queue=app.config.get('NOTIFICATION_QUEUE_SIZE', 1000),
+        batch_size=app.config.get('NOTIFICATION_BATCH_SIZE', 100),
+        flush_seconds=app.config.get('NOTIFICATION_FLUSH_SECONDS', 0.5),
+        put_timeout=app.config.get('NOTIFICATION_PUT_TIMEOUT', 1.0),
+        config=dict(app.config),
+    )
@@ -0,0 +1,213 @@
+"""
+Keyset (cursor) pagination for Cypher listings.
+
+Listings order by a sort key that ends in a unique tiebreaker (normally
+``(created_at, id)``). Instead of ``SKIP n`` - which makes the server walk and
+discard every earlier row - the next page starts strictly after the last row
+shown, so any page costs the same as the first one and can be served straight
+from the matching range index.
+
+Cursors are opaque url-safe tokens holding the boundary row's sort key and a
+direction. Temporal key values keep their type (a Neo4j DateTime compared with
+its string form is null, which would end the listing early). The first PAGINATION_MAX_OFFSET_PAGES pages can still be reached by
+page number (plain SKIP, which is cheap that close to the start); further pages
+are only reachable through next/previous cursors.
+"""
+
+import base64
+import datetime
+import json
+import logging
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from flask import current_app, request
+from neo4j.time import Date, DateTime, Time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_OFFSET_PAGES = 10
+
+# Tagged JSON form of temporal key values: {"$t": tag, "v": iso string}
+_TEMPORAL_TAGS = {'datetime': DateTime, 'date': Date, 'time': Time}
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, (DateTime, datetime.datetime)):
+        tag = 'datetime'
+    elif isinstance(value, (Date, datetime.date)):
+        tag = 'date'
+    elif isinstance(value, (Time, datetime.time)):
+        tag = 'time'
+    else:
+        return str(value)
+    text = value.iso_format() if hasattr(value, 'iso_format') else value.isoformat()
+    return {'$t': tag, 'v': text}
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        return _TEMPORAL_TAGS[value['$t']].from_iso_format(value['v'])
+    return value
+
+
+def encode_cursor(values: Sequence[Any], direction: str = 'next') -> str:
+    """Pack a sort key into an opaque url-safe cursor token"""
+    payload = json.dumps({'k': list(values), 'd': direction}, separators=(',', ':'), default=_encode_value)
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token: str, size: int) -> Optional[Tuple[List[Any], str]]:
+    """Unpack a cursor token; returns None for malformed or foreign tokens"""
+    if not token:
+        return None
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        values, direction = payload['k'], payload.get('d', 'next')
+        if not isinstance(values, list) or len(values) != size or direction not in ('next', 'prev'):
+            return None
+        values = [_decode_value(value) for value in values]
+    except (ValueError, TypeError, KeyError, AttributeError) as e:
+        logger.debug(f"Ignoring invalid pagination cursor: {e}")
+        return None
+    return values, direction
+
+
+def keyset_condition(keys: Sequence[Tuple[str, str]], prefix: str = 'cursor',
+                     nulls: Sequence[int] = ()) -> str:
+    """Cypher predicate matching rows that sort after the $<prefix>_<i> key.
+
+    keys is a list of (expression, 'ASC'|'DESC'); for [(a, DESC), (b, DESC)]
+    this yields a <= $cursor_0 AND ((a < $cursor_0) OR (a = $cursor_0 AND b < $cursor_1)).
+    The leading bound on its own lets the planner seek the range index on a.
+
+    nulls lists the positions whose cursor value is null. Neo4j sorts null
+    last ascending and first descending, so a null boundary is followed by
+    the other nulls (tie-broken on the later keys) and, descending, by every
+    non-null value. Rows with a null key after a non-null ascending boundary
+    are not reached; coalesce ascending keys that can be null.
+    """
+    def equal(j):
+        return f"{keys[j][0]} IS NULL" if j in nulls else f"{keys[j][0]} = ${prefix}_{j}"
+
+    clauses = []
+    for i, (expr, direction) in enumerate(keys):
+        if i in nulls:
+            if direction == 'ASC':
+                continue
+            after = f"{expr} IS NOT NULL"
+        else:
+            after = f"{expr} {'>' if direction == 'ASC' else '<'} ${prefix}_{i}"
+        clauses.append('(' + ' AND '.join([equal(j) for j in range(i)] + [after]) + ')')
+    condition = ' OR '.join(clauses) or 'false'
+    first, first_direction = keys[0]
+    if 0 in nulls:
+        if first_direction == 'DESC':
+            return f"({condition})"
+        bound = f"{first} IS NULL"
+    else:
+        bound = f"{first} {'>=' if first_direction == 'ASC' else '<='} ${prefix}_0"
+    return f"({bound} AND ({condition}))"
+
+
+class KeysetPager:
+    """Builds the ORDER BY / cursor / LIMIT parts of one paginated listing.
+
+    Typical use:
+        pager = KeysetPager.from_request([('j.created_at', 'DESC'), ('j.id', 'DESC')], per_page=20)
+        rows = safe_run(session, query + pager.where_and() + " RETURN j" + pager.key_column()
+                        + pager.order_by() + pager.limit_clause(), {**params, **pager.params})
+        rows = pager.paginate(rows)
+    """
+
+    def __init__(self, keys: Sequence[Tuple[str, str]], per_page: int, page: int = 1,
+                 cursor: str = None, max_offset_pages: int = DEFAULT_MAX_OFFSET_PAGES):
+        self.keys = [(expr, direction.upper()) for expr, direction in keys]
+        self.per_page = per_page
+        self.max_offset_pages = max_offset_pages
+        decoded = decode_cursor(cursor, len(self.keys))
+        self.after, self.direction = decoded if decoded else (None, 'next')
+        page = max(page or 1, 1)
+        # Without a cursor only the first max_offset_pages are served by offset
+        self.page = page if self.after is not None else min(page, max_offset_pages)
+        self.has_next = False
+        self.has_prev = self.page > 1
+        self.next_cursor = None
+        self.prev_cursor = None
+
+    @classmethod
+    def from_request(cls, keys: Sequence[Tuple[str, str]], per_page: int) -> 'KeysetPager':
+        """Read ?page= and ?cursor= from the current request"""
+        return cls(keys, per_page,
+                   page=request.args.get('page', 1, type=int),
+                   cursor=request.args.get('cursor', ''),
+                   max_offset_pages=current_app.config.get('PAGINATION_MAX_OFFSET_PAGES',
+                                                           DEFAULT_MAX_OFFSET_PAGES))
+
+    def _scan_keys(self, exprs: Sequence[str] = None) -> List[Tuple[str, str]]:
+        """Keys in scan order: reversed when walking back from a prev cursor"""
+        exprs = exprs or [expr for expr, _ in self.keys]
+        flip = {'ASC': 'DESC', 'DESC': 'ASC'}
+        return [(expr, flip[direction] if self.direction == 'prev' else direction)
+                for expr, (_, direction) in zip(exprs, self.keys)]
+
+    def where(self, exprs: Sequence[str] = None) -> str:
+        """Cursor predicate, or '' when paginating by offset.
+
+        exprs overrides the key expressions, e.g. to test keys stored on a row map.
+        """
+        if self.after is None:
+            return ''
+        nulls = [i for i, value in enumerate(self.after) if value is None]
+        return keyset_condition(self._scan_keys(exprs), nulls=nulls)
+
+    def where_and(self, exprs: Sequence[str] = None) -> str:
+        condition = self.where(exprs)
+        return f" AND {condition}" if condition else ''
+
+    def order_by(self) -> str:
+        return " ORDER BY " + ', '.join(f"{expr} {direction}" for expr, direction in self._scan_keys())
+
+    def key_list(self) -> str:
+        """Cypher list literal of the sort key, used to build the next cursor"""
+        return '[' + ', '.join(expr for expr, _ in self.keys) + ']'
+
+    def key_column(self) -> str:
+        return f", {self.key_list()} AS _keys"
+
+    def limit_clause(self) -> str:
+        return " SKIP $skip LIMIT $limit"
+
+    @property
+    def skip(self) -> int:
+        return 0 if self.after is not None else (self.page - 1) * self.per_page
+
+    @property
+    def params(self) -> Dict[str, Any]:
+        """Cursor values plus $skip/$limit; one extra row is fetched to detect a next page"""
+        params = {'skip': self.skip, 'limit': self.per_page + 1}
+        for i, value in enumerate(self.after or []):
+            params[f'cursor_{i}'] = value
+        return params
+
+    def paginate(self, rows: List[Any], keys_of: Callable[[Any], Sequence[Any]] = None) -> List[Any]:
+        """Trim the look-ahead row, restore display order and set the cursors"""
+        keys_of = keys_of or (lambda row: row['_keys'])
+        rows = list(rows)
+        more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if self.direction == 'prev':
+            rows.reverse()
+            self.has_prev = more
+            self.has_next = True
+        else:
+            self.has_next = more
+        if rows and self.has_next:
+            self.next_cursor = encode_cursor(keys_of(rows[-1]), 'next')
+        if rows and self.has_prev:
+            self.prev_cursor = encode_cursor(keys_of(rows[0]), 'prev')
+        return rows
+
+    def offset_pages(self, total_pages: int) -> int:
+        """Highest page number that may be linked to directly"""
+        return min(total_pages, self.max_offset_pages)
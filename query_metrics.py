@@ -0,0 +1,187 @@
+"""
+In-process Cypher query metrics.
+
+Every query run through database.stream_run()/safe_run() is normalised to a
+fingerprint (literals and whitespace stripped) and timed. Per fingerprint we
+keep a fixed-bucket latency histogram plus the server-side
+result_available_after / result_consumed_after timings. Queries slower than
+the configured threshold are logged, and the first time a fingerprint is slow
+its plan is logged too.
+"""
+
+import hashlib
+import logging
+import re
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds in milliseconds; the last bucket is +Inf
+BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+_COMMENT_RE = re.compile(r'//[^\n]*|/\*.*?\*/', re.S)
+_STRING_RE = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMBER_RE = re.compile(r'(?<![\w$])-?\d+(?:\.\d+)?\b')
+_LIST_RE = re.compile(r'\[\s*\?(?:\s*,\s*\?)*\s*\]')
+_SPACE_RE = re.compile(r'\s+')
+# Whole clause keywords only: created_at, settings and setup are not writes
+_WRITE_RE = re.compile(r'\b(?:CREATE|MERGE|SET|DELETE|REMOVE|DETACH|LOAD\s+CSV|FOREACH)\b|\bCALL\s*\{', re.I)
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(query: str):
+    """Return (fingerprint_id, normalised_query) for a Cypher string"""
+    text = _COMMENT_RE.sub(' ', query)
+    text = _STRING_RE.sub('?', text)
+    text = _NUMBER_RE.sub('?', text)
+    text = _LIST_RE.sub('[?]', text)
+    text = _SPACE_RE.sub(' ', text).strip()
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:12], text
+
+
+class _QueryStat:
+    """Latency histogram and counters for one fingerprint"""
+
+    __slots__ = ('query', 'count', 'errors', 'total_ms', 'max_ms', 'buckets',
+                 'server_samples', 'available_after_ms', 'consumed_after_ms', 'plan_logged')
+
+    def __init__(self, query: str):
+        self.query = query
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.server_samples = 0
+        self.available_after_ms = 0
+        self.consumed_after_ms = 0
+        self.plan_logged = False
+
+    def observe(self, elapsed_ms: float, error: bool, summary):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        if error:
+            self.errors += 1
+        for i, bound in enumerate(BUCKETS_MS):
+            if elapsed_ms <= bound:
+                self.buckets[i] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+        if summary is not None:
+            available = getattr(summary, 'result_available_after', None)
+            consumed = getattr(summary, 'result_consumed_after', None)
+            if available is not None and consumed is not None:
+                self.server_samples += 1
+                self.available_after_ms += available
+                self.consumed_after_ms += consumed
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Upper bucket bound holding the q-th quantile (None means > last bound)"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for i, hits in enumerate(self.buckets):
+            seen += hits
+            if seen >= target:
+                return BUCKETS_MS[i] if i < len(BUCKETS_MS) else None
+        return None
+
+    def to_dict(self, fingerprint_id: str) -> Dict[str, Any]:
+        samples = self.server_samples or 1
+        return {
+            'fingerprint': fingerprint_id,
+            'query': self.query[:500],
+            'count': self.count,
+            'errors': self.errors,
+            'total_ms': round(self.total_ms, 2),
+            'mean_ms': round(self.total_ms / self.count, 2) if self.count else 0.0,
+            'max_ms': round(self.max_ms, 2),
+            'p50_ms': self.percentile(0.50),
+            'p95_ms': self.percentile(0.95),
+            'p99_ms': self.percentile(0.99),
+            'server_available_after_ms': round(self.available_after_ms / samples, 2),
+            'server_consumed_after_ms': round(self.consumed_after_ms / samples, 2),
+            'histogram': {
+                **{f'le_{bound}': hits for bound, hits in zip(BUCKETS_MS, self.buckets)},
+                'le_inf': self.buckets[-1],
+            },
+        }
+
+
+class QueryMetrics:
+    """Thread-safe registry of per-fingerprint query stats"""
+
+    def __init__(self, slow_query_ms: float = 500.0, plan_mode: str = 'explain'):
+        self.slow_query_ms = slow_query_ms
+        self.plan_mode = plan_mode
+        self._stats: Dict[str, _QueryStat] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, slow_query_ms: float = None, plan_mode: str = None):
+        if slow_query_ms is not None:
+            self.slow_query_ms = float(slow_query_ms)
+        if plan_mode is not None:
+            self.plan_mode = plan_mode.lower()
+
+    def record(self, query: str, elapsed_ms: float, summary=None, error: bool = False,
+               session=None, params: Dict[str, Any] = None):
+        """Record one execution; logs the plan the first time a fingerprint is slow"""
+        fingerprint_id, normalised = fingerprint(query)
+        with self._lock:
+            stat = self._stats.get(fingerprint_id)
+            if stat is None:
+                stat = self._stats[fingerprint_id] = _QueryStat(normalised)
+            stat.observe(elapsed_ms, error, summary)
+            slow = self.slow_query_ms and elapsed_ms >= self.slow_query_ms
+            log_plan = slow and not stat.plan_logged and session is not None
+            if log_plan:
+                stat.plan_logged = True
+        if slow:
+            logger.warning(f"Slow query {fingerprint_id} took {elapsed_ms:.1f} ms: {normalised[:300]}")
+        if log_plan:
+            self._log_plan(fingerprint_id, query, session, params)
+
+    def _log_plan(self, fingerprint_id: str, query: str, session, params):
+        # PROFILE executes the query again, so only allow it for read-only queries
+        prefix = 'PROFILE' if self.plan_mode == 'profile' and not _WRITE_RE.search(query) else 'EXPLAIN'
+        try:
+            summary = session.run(f"{prefix} {query}", params or {}).consume()
+            plan = summary.profile if prefix == 'PROFILE' else summary.plan
+            logger.warning(f"{prefix} plan for slow query {fingerprint_id}: {_format_plan(plan)}")
+        except Exception as e:
+            logger.warning(f"Could not capture plan for slow query {fingerprint_id}: {e}")
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Per-fingerprint stats, most total time first"""
+        with self._lock:
+            items = [stat.to_dict(fid) for fid, stat in self._stats.items()]
+        return sorted(items, key=lambda item: item['total_ms'], reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+def _format_plan(plan, depth: int = 0) -> str:
+    """Render a plan/profile dict as an indented operator tree"""
+    if not plan:
+        return 'n/a'
+    operator = plan.get('operatorType', '?')
+    args = plan.get('args', {})
+    details = args.get('Details') or args.get('details') or ''
+    rows = plan.get('rows')
+    line = '\n' + '  ' * depth + operator
+    if details:
+        line += f" ({details})"
+    if rows is not None:
+        line += f" rows={rows}"
+    return line + ''.join(_format_plan(child, depth + 1) for child in plan.get('children', []))
+
+
+# Process-wide registry used by database.stream_run()
+query_metrics = QueryMetrics()
@@ -0,0 +1,196 @@
+"""
+Vocabulary-driven parser for chatbot search messages.
+
+Turns a chat message into structured filters for context retrieval:
+
+    >>> parse_query("May trabaho ba para sa nars sa San Andres?")
+    {'location': 'San Andres', 'categories': None, 'kind': 'job',
+     'keywords': ['nurse', 'nars'], 'query': 'nurse nars'}
+
+The message is matched in one pass of a compiled regex against the
+municipality gazetteer (location_search.CATANDUANES_LOCATIONS), the listing
+category vocabularies and English/Tagalog/Bicol keywords. Locations come back
+as the canonical municipality, usable as a filter. A category word comes back
+as the categories actually stored on Job/Business nodes for it, which only
+boost ranking: the stored values are not a closed vocabulary, so the word
+itself also stays a keyword. Tagalog/Bicol words are translated to the English
+term listings use, and the remaining content words form the query.
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from retrieval_index import BUSINESS, JOB, SERVICE, STOPWORDS, tokenize
+
+# Category a message can name -> words that name it. Only words that name the
+# category itself: occupations stay keywords, so "nurse" ranks healthcare jobs
+# first without hiding a nurse job filed elsewhere.
+CATEGORY_TERMS = {
+    'restaurant': ('restaurant', 'restaurants', 'restawran', 'kainan', 'karinderya', 'carinderia', 'kakanan',
+                   'eatery', 'food'),
+    'retail': ('retail', 'tindahan', 'sari-sari', 'sari sari', 'grocery'),
+    'manufacturing': ('manufacturing', 'factory', 'factories', 'pabrika'),
+    'healthcare': ('healthcare', 'health care', 'medical', 'hospital', 'ospital', 'clinic', 'klinika', 'kalusugan'),
+    'education': ('education', 'edukasyon', 'school', 'schools', 'paaralan', 'eskwelahan', 'eskwela'),
+    'technology': ('technology', 'tech', 'information technology', 'software', 'computer', 'kompyuter'),
+    'hospitality': ('hospitality', 'hotel', 'hotels', 'resort', 'resorts', 'lodging'),
+    'tourism': ('tourism', 'turismo', 'tour', 'tours'),
+    'construction': ('construction', 'konstruksyon', 'konstruksiyon'),
+    'fishing': ('fishing', 'fishery', 'fisheries', 'seafood', 'pangingisda'),
+    'agriculture': ('agriculture', 'agrikultura', 'farming', 'farm', 'farms', 'sakahan', 'abaca', 'copra'),
+    'logistics': ('logistics', 'delivery', 'trucking', 'shipping'),
+    'crafts': ('crafts', 'handicraft', 'handicrafts', 'arts and crafts', 'pasalubong'),
+    'repair': ('repair', 'repairs', 'talyer'),
+}
+
+# Category named in a message -> the values stored on Job/Business nodes for
+# it (forms, seed data and imports don't share one vocabulary). 'services' is
+# what a request for services (KIND_TERMS) boosts.
+STORED_CATEGORIES = {
+    'restaurant': ('restaurant', 'food_beverage', 'food_and_beverage'),
+    'retail': ('retail',),
+    'manufacturing': ('manufacturing',),
+    'healthcare': ('healthcare', 'health_wellness'),
+    'education': ('education', 'education_training'),
+    'technology': ('technology',),
+    'hospitality': ('hospitality', 'tourism'),
+    'tourism': ('tourism', 'hospitality'),
+    'construction': ('construction',),
+    'fishing': ('fishing', 'seafood'),
+    'agriculture': ('agriculture',),
+    'logistics': ('logistics',),
+    'crafts': ('arts_and_crafts', 'arts_crafts', 'handicrafts'),
+    'repair': ('repair', 'automotive', 'home_services'),
+    'services': ('services', 'professional_services', 'personal_services', 'home_services', 'repair'),
+}
+
+# English keyword -> Tagalog/Bicol words for the same occupation
+OCCUPATION_TERMS = {
+    'teacher': ('guro', 'maestra', 'maestro', 'titser'),
+    'nurse': ('nars',),
+    'cook': ('kusinero', 'kusinera', 'tagaluto'),
+    'driver': ('drayber', 'tsuper'),
+    'cashier': ('kahera', 'kahero'),
+    'sales': ('tindera', 'tindero'),
+    'carpenter': ('karpintero', 'anluwage'),
+    'fisherman': ('mangingisda', 'parasira'),
+    'farmer': ('magsasaka', 'paraoma'),
+    'mechanic': ('mekaniko',),
+    'electrician': ('elektrisyan',),
+    'baker': ('panadero', 'panadera'),
+    'guard': ('gwardiya', 'guwardiya', 'bantay'),
+    'housekeeper': ('kasambahay', 'tagalinis'),
+}
+
+# What the user is looking for. A job word wins over the others ("companies
+# hiring in Virac" asks for jobs), and service requests also get businesses.
+KIND_TERMS = {
+    JOB: ('job', 'jobs', 'work', 'hiring', 'vacancy', 'vacancies', 'opening', 'openings', 'career', 'careers',
+          'position', 'positions', 'employment', 'trabaho', 'hanapbuhay', 'empleyo', 'bakante', 'raket'),
+    BUSINESS: ('business', 'businesses', 'negosyo', 'company', 'companies', 'kompanya', 'establishment',
+               'establishments'),
+    SERVICE: ('service', 'services', 'serbisyo'),
+}
+
+# Conversational words in the three languages that never help a lookup
+FILLER_WORDS = frozenset("""
+hello hi hey thanks thank salamat kumusta musta good morning afternoon evening tell about know give list
+available near around nearby area place places province catanduanes island could would like get
+ano saan may mayroon meron igwa hain diin para nin kan an ka mo ba lang naman dito duman digdi kaini iyo
+dae bako gusto muya hanap naghahanap maghanap hinahanap nagahanap hanapon malapit harani lugar
+daw raw din rin po pong bang yung iyong ung kung pwede puwede category kategorya bilang kayo paano mag
+anong walang aram nangangailangan apply need offers
+""".split()) | STOPWORDS
+
+_BOUNDARY = r"(?<![0-9a-zñ]){}(?![0-9a-zñ])"
+
+# "IT" only means information technology in capitals; lowercased it is a stopword
+_IT_RE = re.compile(r"\bI\.?T\b")
+
+
+def _phrase_pattern(phrase: str) -> str:
+    return r'[\s_-]+'.join(re.escape(part) for part in re.split(r'[\s_-]+', phrase))
+
+
+def _canonical(phrase: str) -> str:
+    return ' '.join(re.split(r'[\s_-]+', phrase))
+
+
+@lru_cache(maxsize=None)
+def _vocabulary():
+    """Compile the phrase table once; the gazetteer is imported lazily because
+    location_search itself imports gemini_client."""
+    from blueprints.api.location_search import CATANDUANES_LOCATIONS
+
+    lookup = {}
+    for key, town in CATANDUANES_LOCATIONS.items():
+        lookup[_canonical(key)] = ('location', town)
+        lookup.setdefault(_canonical(town.lower()), ('location', town))
+    for category, words in CATEGORY_TERMS.items():
+        for word in words + (category,):
+            lookup.setdefault(_canonical(word), ('category', category))
+    for english, words in OCCUPATION_TERMS.items():
+        for word in words:
+            lookup.setdefault(word, ('occupation', english))
+    for kind, words in KIND_TERMS.items():
+        for word in words:
+            lookup.setdefault(word, ('kind', kind))
+    # Longest first, so "san andres" wins over a shorter entry inside it
+    phrases = sorted(lookup, key=len, reverse=True)
+    pattern = re.compile(_BOUNDARY.format('(?:' + '|'.join(_phrase_pattern(p) for p in phrases) + ')'))
+    return pattern, lookup
+
+
+def parse_query(message: str) -> Dict[str, Any]:
+    """Structured search filters for one chat message.
+
+    Returns query (space-joined keywords), keywords, location (canonical
+    municipality), categories (stored category values to rank first) and kind
+    (job, business, service); filters the message doesn't mention are None.
+    """
+    pattern, lookup = _vocabulary()
+    text = (message or '').lower()
+    result: Dict[str, Any] = {'location': None, 'categories': None, 'kind': None}
+    keywords: List[str] = []
+    categories: List[str] = []
+    rest = []
+    last = 0
+    for match in pattern.finditer(text):
+        rest.append(text[last:match.start()])
+        last = match.end()
+        field, value = lookup[_canonical(match.group())]
+        if field == 'occupation':
+            keywords.extend((value, match.group()))
+        elif field == 'category':
+            categories.extend(STORED_CATEGORIES[value])
+            keywords.extend((value, match.group()))
+        elif field == 'kind':
+            if result['kind'] is None or value == JOB:
+                result['kind'] = value
+            if value == SERVICE:
+                categories.extend(STORED_CATEGORIES['services'])
+        else:
+            result[field] = result[field] or value
+    rest.append(text[last:])
+    if 'technology' not in categories and _IT_RE.search(message or ''):
+        categories.extend(STORED_CATEGORIES['technology'])
+        keywords.append('technology')
+    keywords.extend(t for t in tokenize(' '.join(rest)) if t not in FILLER_WORDS)
+    result['categories'] = list(dict.fromkeys(categories)) or None
+    result['keywords'] = list(dict.fromkeys(keywords))
+    result['query'] = ' '.join(result['keywords'])
+    return result
+
+
+def has_filters(parsed: Dict[str, Any]) -> bool:
+    """False when the message gave nothing to look up (greetings, thanks...)"""
+    return bool(parsed['keywords'] or parsed['location'] or parsed['categories'])
+
+
+
+def search_kinds(parsed: Dict[str, Any]) -> Optional[List[str]]:
+    """The listing kinds worth searching, or None for all of them"""
+    if parsed['kind'] == SERVICE:
+        return [SERVICE, BUSINESS]
+    return [parsed['kind']] if parsed['kind'] else None
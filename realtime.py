@@ -0,0 +1,366 @@
+"""
+Push channel for chat messages and notifications.
+
+Publishers (send_user_message, notification_writer) call
+publish(user_id, event, data). Browsers hold one Server-Sent Events stream
+(GET /api/events) and receive the event as soon as it is published, so an idle
+page costs no database reads instead of one query per poll.
+
+Events fan out through a broker:
+
+* in-process (default): publish delivers straight to this worker's streams;
+* Redis (REALTIME_REDIS_URL, defaulting to CACHE_REDIS_URL): publish goes to a
+  pub/sub channel and every worker's listener thread delivers it to its own
+  streams, so a message sent through one gunicorn worker reaches a browser
+  connected to another. Event ids come from one Redis counter, so every
+  worker sees the same ordered ids.
+
+Each worker keeps the last REALTIME_REPLAY_SIZE events per user. A browser
+that reconnects sends Last-Event-ID and gets what it missed replayed; when the
+gap is older than the buffer it gets one `resync` event and reloads instead.
+Streams send a heartbeat comment every REALTIME_HEARTBEAT_SECONDS so proxies
+keep them open, and end after REALTIME_MAX_STREAM_SECONDS (the browser
+reconnects on its own), so a worker thread is never held indefinitely. Each
+stream does hold a thread while open: the app needs threaded workers, at most
+REALTIME_MAX_STREAMS are served per worker, and REALTIME_ENABLED=false turns
+streaming off (pages fall back to polling).
+"""
+
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict, deque, namedtuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from sse import format_event
+
+logger = logging.getLogger(__name__)
+
+Event = namedtuple('Event', ['id', 'user_id', 'event', 'data'])
+
+# Browser reconnect delay after a stream ends or drops, in milliseconds
+RECONNECT_MS = 3000
+
+
+def parse_event_id(value) -> Optional[int]:
+    """The last event id a client sent back, or None when missing or malformed"""
+    try:
+        return int(value) if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+class _LocalBroker:
+    """Delivers events within this process only.
+
+    Ids start from the clock so they keep increasing across restarts, and a
+    browser reconnecting with an id from before the restart is told to resync.
+    """
+
+    def __init__(self, deliver: Callable[[Event], None]):
+        self._deliver = deliver
+        self._lock = threading.Lock()
+        self._next = int(time.time() * 1000)
+        self.horizon = self._next - 1
+
+    def ensure(self):
+        pass
+
+    def next_id(self) -> int:
+        with self._lock:
+            self._next += 1
+            return self._next
+
+    def publish(self, event: Event):
+        self._deliver(event)
+
+    def close(self):
+        pass
+
+
+class _RedisBroker:
+    """Fans events out to every worker through one Redis pub/sub channel"""
+
+    def __init__(self, url: str, deliver: Callable[[Event], None], channel: str = 'realtime:events'):
+        import redis
+        self.client = redis.Redis.from_url(url, socket_connect_timeout=1, health_check_interval=30)
+        self.client.ping()
+        self.channel = channel
+        self._deliver = deliver
+        self._pid = None
+        self._stopped = False
+        self._lock = threading.Lock()
+        # Ids up to here were published before this worker listened
+        self.horizon = 0
+
+    def ensure(self):
+        """Start listening; lazily, and again after a fork, which threads don't survive"""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                self.horizon = int(self.client.get(f"{self.channel}:seq") or 0)
+                threading.Thread(target=self._listen, args=(pubsub,), name='realtime-listener',
+                                 daemon=True).start()
+
+    def _listen(self, pubsub):
+        while not self._stopped:
+            try:
+                if pubsub is None:
+                    pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                    pubsub.subscribe(self.channel)
+                for message in pubsub.listen():
+                    if self._stopped:
+                        break
+                    self._deliver(Event(**json.loads(message['data'])))
+            except Exception as e:
+                logger.warning(f"Realtime listener lost Redis, reconnecting: {e}")
+                pubsub = None
+                time.sleep(1)
+
+    def next_id(self) -> int:
+        self.ensure()
+        return int(self.client.incr(f"{self.channel}:seq"))
+
+    def publish(self, event: Event):
+        self.ensure()
+        self.client.publish(self.channel, json.dumps(event._asdict(), default=str))
+
+    def close(self):
+        self._stopped = True
+
+
+class Subscription:
+    """One open stream: buffered live events for a user"""
+
+    def __init__(self, user_id, size: int = 100):
+        self.user_id = user_id
+        self.overflowed = False
+        self._queue = queue.Queue(maxsize=size)
+
+    def put(self, event: Event):
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            # A stalled client; it resyncs instead of holding events forever
+            self.overflowed = True
+
+    def get(self, timeout: float) -> Optional[Event]:
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class EventBus:
+    """Per-user publish/subscribe with replay, over a local or Redis broker"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: Dict[Any, List[Subscription]] = {}
+        self._replay: 'OrderedDict[Any, deque]' = OrderedDict()
+        self._evicted_upto: Dict[Any, int] = {}
+        self._last_id = 0
+        self._broker = None
+        self.configure()
+
+    def configure(self, replay_size: int = 50, max_users: int = 10000, heartbeat: float = 25,
+                  max_stream_seconds: float = 300, max_streams: int = None, redis_url: str = None):
+        self.replay_size = replay_size
+        self.max_streams = max_streams
+        self.max_users = max_users
+        self.heartbeat = heartbeat
+        self.max_stream_seconds = max_stream_seconds
+        if self._broker is not None:
+            self._broker.close()
+        self._broker = _LocalBroker(self._deliver)
+        if redis_url:
+            try:
+                self._broker = _RedisBroker(redis_url, self._deliver)
+            except Exception as e:
+                logger.warning(f"Realtime events limited to this worker (Redis unavailable): {e}")
+
+    def publish(self, user_id, event: str, data: Dict[str, Any]) -> Optional[int]:
+        """Push an event to the user's open streams on every worker; returns its id"""
+        if not user_id:
+            return None
+        try:
+            item = Event(self._broker.next_id(), str(user_id), event, data)
+            self._broker.publish(item)
+        except Exception as e:
+            # Redis outage: still reach the streams held by this worker. Without
+            # an id the event is not replayable, but ids stay in one sequence
+            logger.warning(f"Realtime publish fell back to this worker: {e}")
+            item = Event(None, str(user_id), event, data)
+            self._deliver(item)
+        return item.id
+
+    def _deliver(self, item: Event):
+        with self._lock:
+            subscribers = list(self._subscribers.get(item.user_id, ()))
+            if item.id is not None:
+                self._remember(item)
+        for subscription in subscribers:
+            subscription.put(item)
+
+    def _remember(self, item: Event):
+        """Add to the user's replay buffer (caller holds the lock)"""
+        self._last_id = max(self._last_id, item.id)
+        buffer = self._replay.get(item.user_id)
+        if buffer is None:
+            buffer = self._replay[item.user_id] = deque(maxlen=self.replay_size)
+            while len(self._replay) > self.max_users:
+                user_id, dropped = self._replay.popitem(last=False)
+                if dropped:
+                    self._evicted_upto[user_id] = dropped[-1].id
+        else:
+            self._replay.move_to_end(item.user_id)
+        if len(buffer) == buffer.maxlen:
+            self._evicted_upto[item.user_id] = buffer[0].id
+        buffer.append(item)
+
+    @property
+    def last_id(self) -> int:
+        """Id a resynced client resumes from: nothing before it is replayable here"""
+        return max(self._last_id, self._broker.horizon)
+
+    def subscribe(self, user_id, last_event_id: int = None) -> Tuple[Subscription, List[Event], bool]:
+        """(subscription, events to replay, whether the client must resync)"""
+        user_id = str(user_id)
+        subscription = Subscription(user_id)
+        try:
+            self._broker.ensure()
+        except Exception as e:
+            logger.warning(f"Realtime listener could not start: {e}")
+        with self._lock:
+            self._subscribers.setdefault(user_id, []).append(subscription)
+            if last_event_id is None:
+                return subscription, [], False
+            buffer = list(self._replay.get(user_id, ()))
+            missed = [item for item in buffer if item.id > last_event_id]
+            # Missed events fell out of the buffer, or predate this worker listening
+            gap = (self._evicted_upto.get(user_id, 0) > last_event_id
+                   or last_event_id < self._broker.horizon)
+        return subscription, missed, gap
+
+    def has_capacity(self) -> bool:
+        """Whether this worker may open another stream (threads are left for requests)"""
+        if self.max_streams is None:
+            return True
+        with self._lock:
+            return sum(len(subs) for subs in self._subscribers.values()) < self.max_streams
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.user_id, [])
+            if subscription in subscribers:
+                subscribers.remove(subscription)
+            if not subscribers:
+                self._subscribers.pop(subscription.user_id, None)
+
+    def follow(self, subscription: Subscription, missed: List[Event], gap: bool) -> Iterator[Optional[Event]]:
+        """A subscriber's events until max_stream_seconds: replay, then live; None is a heartbeat
+
+        Ends early with a `resync` event when the subscriber falls behind. The
+        caller formats the events for its transport and unsubscribes afterwards.
+        """
+        if gap:
+            yield self._resync(subscription.user_id)
+        yield from missed
+        deadline = time.monotonic() + self.max_stream_seconds
+        while time.monotonic() < deadline:
+            item = subscription.get(timeout=min(self.heartbeat, max(0.0, deadline - time.monotonic())))
+            if subscription.overflowed:
+                yield self._resync(subscription.user_id)
+                return
+            yield item
+
+    def _resync(self, user_id) -> Event:
+        return Event(self.last_id, user_id, 'resync', {})
+
+    def stream(self, user_id, last_event_id: str = None) -> Iterator[str]:
+        """Formatted SSE for one client: replay, then live events and heartbeats"""
+        subscription, missed, gap = self.subscribe(user_id, parse_event_id(last_event_id))
+        try:
+            yield f"retry: {RECONNECT_MS}\n\n"
+            for item in self.follow(subscription, missed, gap):
+                yield ': ping\n\n' if item is None else _format(item)
+        finally:
+            self.unsubscribe(subscription)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'streams': sum(len(subs) for subs in self._subscribers.values()),
+                'users_buffered': len(self._replay),
+                'last_event_id': self._last_id,
+                'shared': isinstance(self._broker, _RedisBroker),
+            }
+
+
+def _format(item: Event) -> str:
+    return format_event(item.data, event=item.event, event_id=str(item.id) if item.id is not None else None)
+
+
+bus = EventBus()
+
+
+def publish(user_id, event: str, data: Dict[str, Any]) -> Optional[int]:
+    """Push an event to a user's open pages; never raises"""
+    try:
+        return bus.publish(user_id, event, data)
+    except Exception as e:
+        logger.warning(f"Realtime publish failed: {e}")
+        return None
+
+
+def init_app(app):
+    """Configure the process-wide bus from REALTIME_* settings"""
+    bus.configure(
+        replay_size=app.config.get('REALTIME_REPLAY_SIZE', 50),
+        heartbeat=app.config.get('REALTIME_HEARTBEAT_SECONDS', 25),
+        max_stream_seconds=app.config.get('REALTIME_MAX_STREAM_SECONDS', 300),
+        max_streams=app.config.get('REALTIME_MAX_STREAMS'),
+        redis_url=app.config.get('REALTIME_REDIS_URL'),
+    )
+    if app.config.get('REALTIME_ENABLED', True) and app.config.get('REALTIME_WEBSOCKET'):
+        _register_websocket(app)
+
+
+def _register_websocket(app):
+    """Same events over a WebSocket at /api/events/ws, when flask-sock is installed"""
+    try:
+        from flask_sock import Sock
+    except ImportError:
+        logger.warning("REALTIME_WEBSOCKET is set but flask-sock is not installed; using SSE only")
+        return
+    from flask import request
+    from flask_login import current_user
+
+    sock = Sock(app)
+
+    @sock.route('/api/events/ws')
+    def event_socket(ws):
+        if not current_user.is_authenticated:
+            ws.close(reason=1008, message='Login required')
+            return
+        if not bus.has_capacity():
+            # 1013 Try Again Later; like the SSE route, leave the threads to requests
+            ws.close(reason=1013, message='Too many open event streams')
+            return
+        subscription, missed, gap = bus.subscribe(current_user.id, parse_event_id(request.args.get('last_event_id')))
+        try:
+            # Closed after REALTIME_MAX_STREAM_SECONDS; the client reconnects with its last id
+            for item in bus.follow(subscription, missed, gap):
+                if item is None:
+                    ws.send(json.dumps({'event': 'ping'}))
+                else:
+                    ws.send(json.dumps({'event': item.event, 'id': item.id, 'data': item.data}, default=str))
+        finally:
+            bus.unsubscribe(subscription)
@@ -0,0 +1,166 @@
+"""
+Batched AI analyses for the resume and job application tools.
+
+The resume page used to send the same resume text to Gemini once per tool
+(analysis, suggestions, completion check), and the application page did the
+same with the cover letter. run_batch() takes each document once and answers
+every requested analysis that reads it in a single structured-output call;
+the resume and the application groups, which read different documents, run
+in parallel when both are asked for.
+
+Each analysis result is cached in the shared response cache under a hash of
+the content it read (normalised text, job title, language), so reopening a
+page with an unchanged resume makes no API call at all.
+"""
+
+import hashlib
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+from gemini_cache import normalize_prompt, response_cache
+from gemini_client import DEFAULT_MODEL, GeminiError, get_gemini_json
+
+logger = logging.getLogger(__name__)
+
+RESUME, APPLICATION = 'resume', 'application'
+
+LANGUAGE_INSTRUCTIONS = {
+    'English': 'Respond in English.',
+    'Tagalog': 'Sumagot sa Tagalog. Gumamit ng natural at propesyonal na wika.',
+    'Bicol': 'Tumugon sa Bicol (Catandunganon). Gumamit ng natural at propesyonal na wika.',
+}
+
+_STRINGS = {'type': 'ARRAY', 'items': {'type': 'STRING'}}
+
+# name -> (document group, response schema, what to write)
+ANALYSES = {
+    'analysis': (RESUME, {'type': 'STRING'},
+                 "A detailed review with the section headers Overall Assessment (quality score 0-100 "
+                 "and a brief summary), Strengths (3-4 points), Areas for Improvement and "
+                 "Recommendations (3-5 specific, actionable items)."),
+    'suggestions': (RESUME, _STRINGS,
+                    "5-8 specific, immediately actionable improvement suggestions, 1-2 per section "
+                    "that has content (Personal Info, Skills, Education, Experience, Interests, "
+                    "Activities), focused on clarity, impact and completeness."),
+    'completion': (RESUME, {'type': 'OBJECT', 'properties': {'score': {'type': 'INTEGER'}, 'issues': _STRINGS},
+                            'required': ['score', 'issues']},
+                   "Completeness score 0-100 (personal information, skills, education, work experience, "
+                   "content quality) and the specific sections that are missing or need work."),
+    'improvements': (APPLICATION, {'type': 'STRING'},
+                     "How to improve the application letter: suggestions to strengthen it, what works "
+                     "well currently, and tips to make it stand out."),
+    'tips': (APPLICATION, {'type': 'STRING'},
+             "Tips for applying to the position: important skills to highlight, key points to "
+             "emphasise in the application, and how to stand out from other applicants."),
+    'review': (APPLICATION, {'type': 'OBJECT', 'properties': {
+                   'score': {'type': 'INTEGER'}, 'strengths': _STRINGS, 'improvements': _STRINGS,
+                   'ready': {'type': 'BOOLEAN'}, 'notes': {'type': 'STRING'}},
+                   'required': ['score', 'strengths', 'improvements', 'ready', 'notes']},
+               "Review of the application letter: score 0-100, strengths, improvements, ready "
+               "(true if score >= 70) and overall notes."),
+}
+
+# Analyses that read the cover letter (tips only need the job title)
+NEEDS_COVER_LETTER = ('improvements', 'review')
+
+
+def content_hash(*parts: str) -> str:
+    """Hash of the content an analysis reads; whitespace differences don't count"""
+    normalised = '\x00'.join(normalize_prompt(part or '') for part in parts)
+    return hashlib.sha256(normalised.encode('utf-8')).hexdigest()
+
+
+def _cache_key(name: str, digest: str, language: str) -> str:
+    return f"resume-ai:{DEFAULT_MODEL}:{name}:{language}:{digest}"
+
+
+def _normalise(name: str, value: Any) -> Any:
+    """Shape results like the single-analysis endpoints return them"""
+    if name == 'review' and isinstance(value, dict):
+        return {
+            'overallScore': value.get('score'),
+            'strengths': value.get('strengths', []),
+            'improvements': value.get('improvements', []),
+            'readyToSubmit': value.get('ready'),
+            'recommendations': value.get('notes', ''),
+        }
+    if isinstance(value, str):
+        return value.strip()
+    return value
+
+
+def _prompt(group: str, names: List[str], resume: str, cover_letter: str, job_title: str,
+            language: str) -> str:
+    if group == RESUME:
+        prompt = f"You are a professional resume reviewer. Analyze this resume carefully:\n\n{resume}\n\n"
+    else:
+        prompt = f"You are a career advisor helping with an application for a {job_title} position.\n\n"
+        if any(name in NEEDS_COVER_LETTER for name in names):
+            prompt += f"Application letter:\n{cover_letter}\n\n"
+    prompt += "Fill in each field of the JSON response:\n"
+    prompt += ''.join(f"- {name}: {ANALYSES[name][2]}\n" for name in names)
+    return prompt + f"\n{LANGUAGE_INSTRUCTIONS.get(language, LANGUAGE_INSTRUCTIONS['English'])}"
+
+
+def _run_group(group: str, names: List[str], resume: str, cover_letter: str, job_title: str,
+               language: str) -> Dict[str, Any]:
+    schema = {
+        'type': 'OBJECT',
+        'properties': {name: ANALYSES[name][1] for name in names},
+        'required': names,
+    }
+    # Long-form fields share one reply, so give it room
+    max_tokens = 2048 * max(1, sum(ANALYSES[name][1]['type'] == 'STRING' for name in names))
+    prompt = _prompt(group, names, resume, cover_letter, job_title, language)
+    logger.info(f"Calling Gemini API for {group} analyses {names} in {language}")
+    return get_gemini_json(prompt, schema, max_output_tokens=max_tokens)
+
+
+def run_batch(names: List[str], resume: str = '', cover_letter: str = '', job_title: str = '',
+              language: str = 'English') -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """Run the named analyses; returns (results, errors), both keyed by name"""
+    job_title = (job_title or 'this position')[:50]
+    keys = {}
+    for name in dict.fromkeys(names):
+        if ANALYSES[name][0] == RESUME:
+            digest = content_hash(resume)
+        elif name in NEEDS_COVER_LETTER:
+            digest = content_hash(cover_letter, job_title)
+        else:
+            digest = content_hash(job_title)
+        keys[name] = _cache_key(name, digest, language)
+
+    results: Dict[str, Any] = {}
+    missing: Dict[str, List[str]] = {}
+    for name, key in keys.items():
+        cached = response_cache.get(key) if response_cache.enabled else None
+        if cached is not None:
+            results[name] = json.loads(cached)
+        else:
+            missing.setdefault(ANALYSES[name][0], []).append(name)
+
+    errors: Dict[str, str] = {}
+    if not missing:
+        return results, errors
+
+    def run(group):
+        return _run_group(group, missing[group], resume, cover_letter, job_title, language)
+
+    with ThreadPoolExecutor(max_workers=len(missing)) as pool:
+        futures = {group: pool.submit(run, group) for group in missing}
+    for group, future in futures.items():
+        try:
+            reply = future.result()
+        except GeminiError as e:
+            errors.update({name: str(e) for name in missing[group]})
+            continue
+        for name in missing[group]:
+            if name not in reply:
+                errors[name] = "The AI returned an incomplete answer. Please try again."
+                continue
+            results[name] = _normalise(name, reply[name])
+            if response_cache.enabled:
+                response_cache.set(keys[name], json.dumps(results[name]))
+    return results, errors
@@ -0,0 +1,462 @@
+"""
+In-process BM25 index over job, business and service text.
+
+The chatbot needs a few relevant listings per message as context. Instead of
+three CONTAINS label scans in Neo4j per message, each worker keeps an inverted
+index of the active listings and ranks them with BM25. Each term keeps its
+postings as BM25 impacts (idf * tf / (tf + norm)) sorted best first, so a
+top-k lookup reads the lists in step and stops as soon as no unread document
+can beat the k-th best (the threshold algorithm), usually after a few dozen
+entries rather than every document that contains a query term.
+
+The index is built in the background when the app starts. Writes that go
+through this worker update it immediately (index_job / index_business); writes
+in other workers bump the shared 'job:*' / 'business:*' cache tags, and a
+lookup that notices a newer tag version schedules a rebuild (at most once per
+RETRIEVAL_INDEX_MIN_REBUILD_SECONDS).
+"""
+
+import heapq
+import itertools
+import logging
+import math
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[0-9a-zñ]+")
+
+# Common English and Filipino function words that carry no search intent
+STOPWORDS = frozenset("""
+a an and are as at be by can do for from have how i in is it me my of on or
+please show the there to what where which who with you your any some find
+looking look want need jobs job work ang ng sa mga na at ko ako ay po may
+""".split())
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Entries read from each impact list per step of a lookup
+SCAN_BLOCK = 8
+
+# Location-filtered copies of an impact list kept per term (one per town asked for)
+MAX_LOCATION_LISTS = 32
+
+# Impacts are computed against a snapshot of the document count and average
+# length; a write only re-sorts the terms it touches until either statistic
+# drifts by more than this fraction, which refreshes the whole kind
+STATS_DRIFT = 0.1
+
+# Score added to listings in a category the message named, so they rank with
+# keyword matches even when their text doesn't use the user's word
+CATEGORY_BOOST = 1.0
+
+JOB, BUSINESS, SERVICE = 'job', 'business', 'service'
+
+_WRITE_TAGS = ['job:*', 'business:*']
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN_RE.findall((text or '').lower()) if len(t) > 1 and t not in STOPWORDS]
+
+
+def _text(value) -> str:
+    if isinstance(value, (list, tuple)):
+        return ' '.join(str(v) for v in value if v)
+    return str(value) if value else ''
+
+
+class _Doc:
+    __slots__ = ('kind', 'length', 'terms', 'payload', 'location', 'category')
+
+    def __init__(self, kind: str, terms: Counter, payload: Dict[str, Any]):
+        self.kind = kind
+        self.terms = terms
+        self.length = sum(terms.values())
+        self.payload = payload
+        self.location = _text(payload.get('location')).lower()
+        self.category = _text(payload.get('category')).lower()
+
+
+class RetrievalIndex:
+    """BM25 over documents of several kinds, one posting table per kind"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._clear()
+        self.built_at = None
+        self.seen_versions = None
+        self._rebuilding = False
+        self._last_rebuild = 0.0
+
+    def _clear(self):
+        self._docs: Dict[str, _Doc] = {}
+        self._postings: Dict[str, Dict[str, Dict[str, int]]] = defaultdict(lambda: defaultdict(dict))
+        self._total_length: Dict[str, int] = defaultdict(int)
+        self._count: Dict[str, int] = defaultdict(int)
+        # kind -> stored category -> doc ids
+        self._categories: Dict[str, Dict[str, set]] = defaultdict(lambda: defaultdict(set))
+        # kind -> term -> [impacts sorted best first, doc id -> impact,
+        # location -> the sorted impacts of documents there], built lazily
+        self._impacts: Dict[str, Dict[str, list]] = defaultdict(dict)
+        # kind -> (count, average length) the impacts were computed with
+        self._stats: Dict[str, Tuple[int, float]] = {}
+
+    def __len__(self):
+        return len(self._docs)
+
+    def add(self, doc_id: str, kind: str, text: str, payload: Dict[str, Any]):
+        """Insert or replace one document"""
+        terms = Counter(tokenize(text))
+        with self._lock:
+            self.remove(doc_id)
+            doc = _Doc(kind, terms, payload)
+            self._docs[doc_id] = doc
+            postings = self._postings[kind]
+            impacts = self._impacts[kind]
+            for term, tf in terms.items():
+                postings[term][doc_id] = tf
+                impacts.pop(term, None)
+            self._categories[kind][doc.category].add(doc_id)
+            self._total_length[kind] += doc.length
+            self._count[kind] += 1
+
+    def remove(self, doc_id: str):
+        with self._lock:
+            doc = self._docs.pop(doc_id, None)
+            if doc is None:
+                return
+            postings = self._postings[doc.kind]
+            impacts = self._impacts[doc.kind]
+            for term in doc.terms:
+                impacts.pop(term, None)
+                entries = postings.get(term)
+                if entries is not None:
+                    entries.pop(doc_id, None)
+                    if not entries:
+                        del postings[term]
+            members = self._categories[doc.kind].get(doc.category)
+            if members is not None:
+                members.discard(doc_id)
+                if not members:
+                    del self._categories[doc.kind][doc.category]
+            self._total_length[doc.kind] -= doc.length
+            self._count[doc.kind] -= 1
+
+    def _stats_for(self, kind: str) -> Tuple[int, float]:
+        """The (count, average length) impacts use; drops them all once stale"""
+        count = self._count[kind]
+        avg_length = (self._total_length[kind] / count) or 1.0
+        stats = self._stats.get(kind)
+        if (stats is None or abs(count - stats[0]) > STATS_DRIFT * stats[0]
+                or abs(avg_length - stats[1]) > STATS_DRIFT * stats[1]):
+            stats = self._stats[kind] = (count, avg_length)
+            self._impacts[kind].clear()
+        return stats
+
+    def _term_impacts(self, kind: str, term: str, stats: Tuple[int, float], location: str = ''):
+        """(impacts sorted best first, doc id -> impact) for one term, or None.
+
+        With a location, the sorted impacts only hold documents there, so the
+        scan stops as early as an unfiltered one.
+        """
+        impacts = self._impacts[kind].get(term)
+        if impacts is None:
+            entries = self._postings[kind].get(term)
+            if not entries:
+                return None
+            count, avg_length = stats
+            weight = (K1 + 1) * math.log(1 + max(count - len(entries) + 0.5, 0.5) / (len(entries) + 0.5))
+            docs = self._docs
+            by_doc = {
+                doc_id: weight * tf / (tf + K1 * (1 - B + B * docs[doc_id].length / avg_length))
+                for doc_id, tf in entries.items()
+            }
+            ranked = sorted(((impact, doc_id) for doc_id, impact in by_doc.items()), reverse=True)
+            impacts = self._impacts[kind][term] = [ranked, by_doc, {}]
+        ranked, by_doc, by_location = impacts
+        if location:
+            ranked = by_location.get(location)
+            if ranked is None:
+                if len(by_location) >= MAX_LOCATION_LISTS:
+                    by_location.clear()
+                docs = self._docs
+                ranked = by_location[location] = [entry for entry in impacts[0] if location in docs[entry[1]].location]
+        return ranked, by_doc
+
+    def prepare(self):
+        """Compute every term's sorted impacts now rather than on first use"""
+        with self._lock:
+            for kind, postings in self._postings.items():
+                if self._count.get(kind):
+                    stats = self._stats_for(kind)
+                    for term in postings:
+                        self._term_impacts(kind, term, stats)
+
+    def search(self, query: str, kind: str, k: int = 3, location: str = None,
+               categories: Sequence[str] = None) -> List[Dict[str, Any]]:
+        """Top-k payloads of one kind for a free-text query.
+
+        location is a substring filter, as in the Cypher it replaces. Listings
+        stored under one of `categories` get CATEGORY_BOOST (a ranking boost,
+        not a filter). With no query terms, the first documents passing the
+        location filter are returned, those in `categories` first.
+        """
+        terms = set(tokenize(query))
+        location = (location or '').lower()
+        categories = {category.lower() for category in categories or ()}
+        with self._lock:
+            count = self._count.get(kind, 0)
+            if not count:
+                return []
+            docs = self._docs
+            if not terms:
+                # Filters alone ("jobs in Virac"): the first matches in load order
+                if not (location or categories):
+                    return []
+                matches = (doc for doc in docs.values() if doc.kind == kind and location in doc.location)
+                if categories:
+                    matches = heapq.nsmallest(k, matches, key=lambda doc: doc.category not in categories)
+                return [doc.payload for doc in itertools.islice(matches, k)]
+            stats = self._stats_for(kind)
+            lists = [impacts for impacts in (self._term_impacts(kind, term, stats, location) for term in terms)
+                     if impacts]
+            maps = [by_doc for _, by_doc in lists]
+            by_category = self._categories[kind]
+            # Category members are one more list, every entry worth CATEGORY_BOOST
+            boosted = itertools.chain.from_iterable(by_category.get(category, ()) for category in categories)
+            best: List[Tuple[float, str]] = []
+            seen = set()
+
+            def consider(doc_ids):
+                doc_ids = set(doc_ids) - seen
+                seen.update(doc_ids)
+                for doc_id in doc_ids:
+                    score = 0.0
+                    if categories:
+                        # Category members come from outside the location-filtered lists
+                        doc = docs[doc_id]
+                        if location and location not in doc.location:
+                            continue
+                        if doc.category in categories:
+                            score = CATEGORY_BOOST
+                    for by_doc in maps:
+                        score += by_doc.get(doc_id, 0.0)
+                    # Ties go to the larger id, whatever order the block came in
+                    if len(best) < k:
+                        heapq.heappush(best, (score, doc_id))
+                    elif (score, doc_id) > best[0]:
+                        heapq.heapreplace(best, (score, doc_id))
+
+            depth = 0
+            while True:
+                # An unread document scores at most the last impact read from
+                # each list it may still be in
+                end = depth + SCAN_BLOCK
+                bound = 0.0
+                fresh = []
+                more = False
+                for ranked, _ in lists:
+                    block = ranked[depth:end]
+                    fresh.extend(doc_id for _, doc_id in block)
+                    if len(ranked) > end:
+                        bound += block[-1][0]
+                        more = True
+                if boosted is not None:
+                    block = list(itertools.islice(boosted, SCAN_BLOCK))
+                    fresh.extend(block)
+                    if len(block) == SCAN_BLOCK:
+                        bound += CATEGORY_BOOST
+                        more = True
+                    else:
+                        boosted = None
+                consider(fresh)
+                if not more or (len(best) == k and best[0][0] >= bound):
+                    break
+                depth = end
+            return [docs[doc_id].payload for _, doc_id in sorted(best, reverse=True)]
+
+    # ------------------------------------------------------------------
+    # Loading from Neo4j
+    # ------------------------------------------------------------------
+
+    def load(self, session):
+        """Replace the contents with every active job, business and service"""
+        fresh = RetrievalIndex()
+        for record in _stream(session, _JOBS_QUERY):
+            fresh._add_job(record)
+        for record in _stream(session, _BUSINESSES_QUERY):
+            fresh._add_business(record)
+        try:
+            for record in _stream(session, _SERVICES_QUERY):
+                fresh._add_service(record)
+        except Exception:
+            # Service nodes don't exist in every deployment
+            pass
+        fresh.prepare()
+        with self._lock:
+            self._docs, self._postings = fresh._docs, fresh._postings
+            self._total_length, self._count = fresh._total_length, fresh._count
+            self._categories = fresh._categories
+            self._impacts, self._stats = fresh._impacts, fresh._stats
+            self.built_at = time.time()
+        logger.info(f"Retrieval index built: {dict(self._count)}")
+
+    def _add_job(self, r):
+        self.add(f"job:{r['id']}", JOB,
+                 ' '.join([_text(r['title'])] * 2 + [_text(r['description']), _text(r['requirements']),
+                                                     _text(r['category']), _text(r['company_name'])]),
+                 {'title': r['title'], 'company_name': r['company_name'], 'location': r['location'],
+                  'category': r['category'], 'salary_min': r['salary_min'], 'salary_max': r['salary_max'],
+                  'description': _text(r['description'])[:200]})
+
+    def _add_business(self, r):
+        self.add(f"business:{r['id']}", BUSINESS,
+                 ' '.join([_text(r['name'])] * 2 + [_text(r['description']), _text(r['category'])]),
+                 {'name': r['name'], 'location': r['location'], 'category': r['category'],
+                  'description': _text(r['description'])[:200]})
+
+    def _add_service(self, r):
+        self.add(f"service:{r['id']}", SERVICE,
+                 ' '.join([_text(r['title'])] * 2 + [_text(r['description']), _text(r['category'])]),
+                 {'title': r['title'], 'location': r['location'], 'category': r['category'],
+                  'description': _text(r['description'])[:200]})
+
+    def refresh_job(self, session, job_id: str):
+        rows = list(_stream(session, _JOBS_QUERY_ONE, {'id': job_id}))
+        if rows:
+            self._add_job(rows[0])
+        else:
+            self.remove(f"job:{job_id}")
+
+    def refresh_business(self, session, business_id: str):
+        rows = list(_stream(session, _BUSINESSES_QUERY_ONE, {'id': business_id}))
+        if rows:
+            self._add_business(rows[0])
+        else:
+            self.remove(f"business:{business_id}")
+        # Job documents carry the business name
+        for record in _stream(session, _JOBS_OF_BUSINESS_QUERY, {'id': business_id}):
+            self._add_job(record)
+
+
+def _stream(session, query, params=None):
+    from database import stream_run
+    return stream_run(session, query, params)
+
+
+_JOB_FIELDS = """
+    RETURN j.id AS id, j.title AS title, j.description AS description,
+           j.requirements AS requirements, j.category AS category, j.location AS location,
+           j.salary_min AS salary_min, j.salary_max AS salary_max, b.name AS company_name
+"""
+_JOBS_QUERY = ("MATCH (j:Job) WHERE j.is_active = true OPTIONAL MATCH (j)-[:POSTED_BY]->(b:Business)"
+               + _JOB_FIELDS + " ORDER BY j.created_at DESC")
+_JOBS_QUERY_ONE = ("MATCH (j:Job {id: $id}) WHERE j.is_active = true "
+                   "OPTIONAL MATCH (j)-[:POSTED_BY]->(b:Business)" + _JOB_FIELDS)
+_JOBS_OF_BUSINESS_QUERY = ("MATCH (j:Job)-[:POSTED_BY]->(b:Business {id: $id}) "
+                           "WHERE j.is_active = true" + _JOB_FIELDS)
+
+_BUSINESS_FIELDS = """
+    RETURN b.id AS id, b.name AS name, b.description AS description, b.category AS category,
+           coalesce(b.location, b.address) AS location
+"""
+_BUSINESSES_QUERY = "MATCH (b:Business) WHERE b.is_active = true" + _BUSINESS_FIELDS + " ORDER BY b.created_at DESC"
+_BUSINESSES_QUERY_ONE = "MATCH (b:Business {id: $id}) WHERE b.is_active = true" + _BUSINESS_FIELDS
+
+_SERVICES_QUERY = """
+    MATCH (s:Service) WHERE s.is_active = true
+    RETURN s.id AS id, s.title AS title, s.description AS description,
+           s.category AS category, s.location AS location
+"""
+
+
+retrieval_index = RetrievalIndex()
+_app_config: Dict[str, Any] = {}
+
+
+def _rebuild(config):
+    from database import get_shared_connection
+    try:
+        with get_shared_connection(config).session() as session:
+            retrieval_index.load(session)
+    except Exception as e:
+        logger.warning(f"Retrieval index build failed: {e}")
+    finally:
+        retrieval_index._rebuilding = False
+
+
+def _schedule_rebuild(versions: Optional[Sequence[int]] = None):
+    with retrieval_index._lock:
+        if retrieval_index._rebuilding or not _app_config:
+            return
+        min_interval = _app_config.get('RETRIEVAL_INDEX_MIN_REBUILD_SECONDS', 30)
+        if time.time() - retrieval_index._last_rebuild < min_interval and retrieval_index.built_at:
+            return
+        retrieval_index._rebuilding = True
+        retrieval_index._last_rebuild = time.time()
+        if versions is not None:
+            retrieval_index.seen_versions = list(versions)
+    threading.Thread(target=_rebuild, args=(_app_config,), name='retrieval-index', daemon=True).start()
+
+
+def ensure_fresh():
+    """Schedule a rebuild if another worker has written since the last one"""
+    if not _app_config:
+        return
+    try:
+        from cache_tags import tag_versions
+        versions = tag_versions(_WRITE_TAGS)
+    except Exception as e:
+        logger.debug(f"Retrieval index freshness check skipped: {e}")
+        return
+    if retrieval_index.seen_versions is None:
+        retrieval_index.seen_versions = versions
+    elif versions != retrieval_index.seen_versions:
+        _schedule_rebuild(versions)
+
+
+def index_job(job_id: str):
+    """Re-index one job after it was created, edited or closed in this worker"""
+    _refresh(lambda session: retrieval_index.refresh_job(session, job_id))
+
+
+def index_business(business_id: str):
+    """Re-index one business (and its jobs) after a write in this worker"""
+    _refresh(lambda session: retrieval_index.refresh_business(session, business_id))
+
+
+def _refresh(work):
+    if not _app_config:
+        return
+    from database import get_shared_connection
+    try:
+        with get_shared_connection(_app_config).session() as session:
+            work(session)
+    except Exception as e:
+        logger.warning(f"Retrieval index update failed: {e}")
+
+
+def init_app(app):
+    """Build the index in the background once the worker is up"""
+    if not app.config.get('RETRIEVAL_INDEX_ENABLED', True):
+        return
+    _app_config.clear()
+    _app_config.update(app.config)
+    _schedule_rebuild()
+
+
+def search_context(query: str, location: str = None, categories: Sequence[str] = None, k: int = 3,
+                   kinds: Sequence[str] = None) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+    """Top-k jobs, services and businesses (or just `kinds`), or None if the
+    index is not built yet"""
+    if retrieval_index.built_at is None:
+        return None
+    ensure_fresh()
+    return {kind: retrieval_index.search(query, kind, k, location, categories)
+            for kind in (kinds or (JOB, SERVICE, BUSINESS))}
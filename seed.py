@@ -247,6 +247,7 @@ def seed_database():
                             reviews_count: $reviews_count,
                             latitude: $latitude,
                             longitude: $longitude,
+                            position: point({latitude: $latitude, longitude: $longitude}),
                             created_at: $created_at,
                             updated_at: $updated_at,
                             business_hours: $business_hours,
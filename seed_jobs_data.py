@@ -273,6 +273,7 @@ def seed_data():
                         address: $address,
                         latitude: $latitude,
                         longitude: $longitude,
+                        position: point({latitude: $latitude, longitude: $longitude}),
                         phone: $phone,
                         email: $email,
                         website: $website,
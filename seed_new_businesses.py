@@ -576,6 +576,7 @@ def create_new_businesses(db, owner_id=None):
                         address: $address,
                         latitude: $latitude,
                         longitude: $longitude,
+                        position: point({latitude: $latitude, longitude: $longitude}),
                         phone: $phone,
                         email: $email,
                         website: $website,
@@ -62,5 +62,6 @@ CREATE (business:Business {
   permit_number: "PERMIT-" + apoc.text.lpad(toString(pos), 3, "0") + "-2024",
   is_hiring: true
 })
+SET business.position = point({latitude: business.latitude, longitude: business.longitude})
 WITH count(*) as businesses_created
 RETURN "SUCCESS: " + toString(businesses_created) + " businesses created!";
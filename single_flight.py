@@ -0,0 +1,132 @@
+"""
+Single-flight coalescing of identical concurrent calls.
+
+The first caller for a key runs the work; callers arriving while it is in
+flight wait for it and share its result instead of repeating it. Within a
+worker this is an in-memory table of in-flight calls. Across workers it is a
+lock file per key in a shared directory: a worker that finds the file taken
+waits for it to go away and then asks `recheck` (normally a shared cache
+lookup) before doing the work itself.
+
+    flight = SingleFlight(timeout=30, lock_dir='/tmp/gemini-flight')
+    text = flight.do(key, lambda: call_api(prompt), recheck=lambda: cache.get(key))
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+_POLL_SECONDS = 0.05
+
+
+class _Call:
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key"""
+
+    def __init__(self, timeout: float = 60.0, lock_dir: str = None):
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self._counts = {'leaders': 0, 'shared': 0, 'cross_worker_shared': 0, 'timeouts': 0}
+        self.configure(timeout=timeout, lock_dir=lock_dir)
+
+    def configure(self, timeout: float = 60.0, lock_dir: str = None):
+        self.timeout = timeout
+        self.lock_dir = None
+        if lock_dir:
+            try:
+                os.makedirs(lock_dir, exist_ok=True)
+                self.lock_dir = lock_dir
+            except OSError as e:
+                logger.warning(f"Cross-worker single-flight disabled ({lock_dir}): {e}")
+
+    def _count(self, name: str):
+        with self._lock:
+            self._counts[name] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._counts, 'in_flight': len(self._calls), 'cross_worker': self.lock_dir is not None}
+
+    def do(self, key: str, fn: Callable[[], Any], recheck: Callable[[], Optional[Any]] = None) -> Any:
+        """Run fn() once for all concurrent callers with the same key"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._counts['leaders'] += 1
+
+        if not leader:
+            if call.event.wait(self.timeout):
+                self._count('shared')
+                if call.error is not None:
+                    raise call.error
+                return call.result
+            # The leader is stuck; don't hold this request hostage to it
+            self._count('timeouts')
+            return fn()
+
+        try:
+            call.result = self._run_across_workers(key, fn, recheck)
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+    def _lock_path(self, key: str) -> str:
+        return os.path.join(self.lock_dir, f"{key}.lock")
+
+    def _try_lock(self, path: str) -> bool:
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                # A lock older than the timeout belongs to a worker that died
+                if time.time() - os.path.getmtime(path) > self.timeout:
+                    os.unlink(path)
+            except OSError:
+                pass
+            return False
+        os.close(fd)
+        return True
+
+    def _run_across_workers(self, key: str, fn: Callable[[], Any], recheck: Callable[[], Optional[Any]]) -> Any:
+        if self.lock_dir is None:
+            return fn()
+        path = self._lock_path(key)
+        deadline = time.monotonic() + self.timeout
+        waited = False
+        while not self._try_lock(path):
+            if time.monotonic() >= deadline:
+                self._count('timeouts')
+                return fn()
+            waited = True
+            time.sleep(_POLL_SECONDS)
+        try:
+            if waited and recheck is not None:
+                result = recheck()
+                if result is not None:
+                    self._count('cross_worker_shared')
+                    return result
+            return fn()
+        finally:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
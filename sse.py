@@ -0,0 +1,82 @@
+"""
+Server-Sent Events helpers.
+
+AI endpoints can answer with an event stream instead of one JSON body when the
+client asks for it (``?stream=1`` or ``Accept: text/event-stream``). Tokens go
+out as ``token`` events as soon as Gemini produces them, followed by one
+``done`` event carrying the same payload the JSON endpoint would have returned,
+or an ``error`` event.
+
+If the client disconnects, the WSGI server closes the response iterator; the
+generator below is closed with it, which closes the upstream Gemini stream
+and frees the worker thread instead of generating tokens nobody will read.
+"""
+
+import json
+import logging
+from typing import Any, Callable, Dict, Iterable, Iterator
+
+from flask import Response, request, stream_with_context
+
+logger = logging.getLogger(__name__)
+
+
+def wants_event_stream() -> bool:
+    """True when the current request asked for a streamed response"""
+    if request.args.get('stream', '').lower() in ('1', 'true', 'yes'):
+        return True
+    return 'text/event-stream' in request.headers.get('Accept', '')
+
+
+def format_event(data: Any, event: str = None, event_id: str = None) -> str:
+    """Encode one event; data is sent as JSON so newlines survive"""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event:
+        lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, default=str)}")
+    return '\n'.join(lines) + '\n\n'
+
+
+def event_stream_response(events: Iterable[str]) -> Response:
+    """Wrap already formatted events in an unbuffered text/event-stream response"""
+    response = Response(stream_with_context(events), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    # Stop nginx from buffering the stream
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
+GENERIC_ERROR = "An error occurred while processing your request. Please try again."
+
+
+def stream_generation(chunks: Iterator[str], finish: Callable[[str], Dict[str, Any]] = None,
+                      safe_errors: tuple = ()) -> Response:
+    """Stream text chunks as token events, then a done event.
+
+    finish(full_text) builds the done payload (default {'status': 'success',
+    'text': full_text}). A failure becomes an error event; the exception text
+    is shown only for `safe_errors` types, whose messages are meant for users.
+    """
+    def generate():
+        parts = []
+        # Opens the response right away, before the first token
+        yield ': stream open\n\n'
+        try:
+            for text in chunks:
+                parts.append(text)
+                yield format_event({'text': text}, event='token')
+            full_text = ''.join(parts)
+            payload = finish(full_text) if finish else {'status': 'success', 'text': full_text}
+            yield format_event(payload, event='done')
+        except Exception as e:
+            logger.warning(f"Streamed generation failed: {e}")
+            message = str(e) if isinstance(e, safe_errors) else GENERIC_ERROR
+            yield format_event({'status': 'error', 'error': message}, event='error')
+        finally:
+            close = getattr(chunks, 'close', None)
+            if close is not None:
+                close()
+
+    return event_stream_response(generate())
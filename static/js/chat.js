@@ -115,6 +115,7 @@ function addMessageToChat(type, message) {
     
     // Scroll to bottom
     chatMessages.scrollTop = chatMessages.scrollHeight;
+    return messageContent;
 }
 
 function showTypingIndicator() {
@@ -179,28 +180,32 @@ function sendChatMessage() {
     // Show typing indicator
     showTypingIndicator();
     
-    // Send message to server
-    fetch('/chatbot/message', {
-        method: 'POST',
-        headers: {
-            'Content-Type': 'application/json',
+    // Stream the reply into one bubble as it is generated
+    let botBubble = null;
+    let botText = '';
+    postEventStream('/chatbot/message', { message: message }, {}, {
+        token(text) {
+            if (!botBubble) {
+                hideTypingIndicator();
+                botBubble = addMessageToChat('bot', '');
+            }
+            botText += text;
+            botBubble.textContent = botText;
+            const chatMessages = document.getElementById('chat-messages');
+            chatMessages.scrollTop = chatMessages.scrollHeight;
         },
-        body: JSON.stringify({ message: message })
-    })
-    .then(response => response.json())
-    .then(data => {
-        // Hide typing indicator
-        hideTypingIndicator();
-        
-        if (data.error) {
-            addMessageToChat('error', 'Sorry, something went wrong. Please try again.');
-        } else {
-            addMessageToChat('bot', data.response);
+        done(data) {
+            hideTypingIndicator();
+            if (!botBubble) addMessageToChat('bot', data.response);
             
             // Save to chat history if user is logged in
             if (typeof currentUser !== 'undefined' && currentUser) {
                 saveChatMessage(message, data.response);
             }
+        },
+        error(errorMessage) {
+            hideTypingIndicator();
+            addMessageToChat('error', errorMessage || 'Sorry, something went wrong. Please try again.');
         }
     })
     .catch(error => {
@@ -13,11 +13,15 @@ function initializeApp() {
     // Load current user if authenticated
     loadCurrentUser();
     
-    // Load notifications
-    loadNotifications();
-    
-    // Auto-refresh notifications every 30 seconds
-    setInterval(loadNotifications, 30000);
+    // Auto-refresh notifications every 30 seconds, unless they are pushed
+    setInterval(() => {
+        if (!isRealtimeConnected()) loadNotifications();
+    }, 30000);
+    onRealtimeEvent('notification', notification => {
+        notifications.unshift(notification);
+        updateNotificationUI();
+    });
+    onRealtimeEvent('resync', loadNotifications);
     
     // Initialize tooltips and popovers
     initializeTooltips();
@@ -37,9 +41,11 @@ function loadCurrentUser() {
     fetch('/api/current-user')
         .then(response => response.json())
         .then(data => {
-            if (data.user) {
-                currentUser = data.user;
+            if (data.authenticated) {
+                currentUser = data;
                 updateUserInterface();
+                loadNotifications();
+                connectRealtime();
             }
         })
         .catch(error => console.error('Failed to load current user:', error));
@@ -405,6 +411,157 @@ function debounce(func, wait) {
     };
 }
 
+// POST a JSON body and read a Server-Sent Events reply (EventSource only does GET).
+// handlers: { token(text), done(payload), error(message) }
+function postEventStream(url, body, headers, handlers) {
+    return fetch(url + (url.includes('?') ? '&' : '?') + 'stream=1', {
+        method: 'POST',
+        credentials: 'same-origin',
+        headers: Object.assign({ 'Content-Type': 'application/json', 'Accept': 'text/event-stream' }, headers || {}),
+        body: JSON.stringify(body)
+    }).then(response => {
+        const contentType = response.headers.get('Content-Type') || '';
+        if (!response.ok || !response.body || !contentType.startsWith('text/event-stream')) {
+            // Validation errors and the like still come back as JSON
+            return response.json().then(data => handlers.error(data.error || data.message || 'Request failed'));
+        }
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+
+        function dispatch(block) {
+            let event = 'message';
+            const data = [];
+            block.split('\n').forEach(line => {
+                if (line.startsWith('event:')) event = line.slice(6).trim();
+                else if (line.startsWith('data:')) data.push(line.slice(5).trim());
+            });
+            if (!data.length) return;
+            const payload = JSON.parse(data.join('\n'));
+            if (event === 'token') handlers.token(payload.text);
+            else if (event === 'done') handlers.done(payload);
+            else if (event === 'error') handlers.error(payload.error);
+        }
+
+        function pump() {
+            return reader.read().then(({ done, value }) => {
+                if (done) return;
+                buffer += decoder.decode(value, { stream: true });
+                let boundary;
+                while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                    dispatch(buffer.slice(0, boundary));
+                    buffer = buffer.slice(boundary + 2);
+                }
+                return pump();
+            });
+        }
+        return pump();
+    });
+}
+
+// Keeps a chat thread in sync with the paginated conversation API. The first
+// call loads the newest page; later polls ask only for messages after the
+// newest one seen (?since=), and loadOlder() pages back with ?before=.
+// handlers: { reset(messages, hasOlder), append(messages), prepend(messages, hasOlder) }
+function createConversationSync(url, handlers) {
+    let since = null;
+    let before = null;
+    let busy = false;
+    let again = false;
+
+    function get(params) {
+        const query = new URLSearchParams(params).toString();
+        return fetch(url + (query ? (url.includes('?') ? '&' : '?') + query : ''), { credentials: 'same-origin' })
+            .then(response => response.json());
+    }
+
+    const sync = {
+        poll() {
+            if (busy) {
+                // Asked again mid-request (e.g. a pushed message): poll once more after it
+                again = true;
+                return Promise.resolve();
+            }
+            busy = true;
+            const first = since === null;
+            let more = false;
+            return get(first ? {} : { since })
+                .then(data => {
+                    if (first) {
+                        before = data.before;
+                        handlers.reset(data.messages, data.has_older);
+                    } else if (data.messages.length) {
+                        handlers.append(data.messages);
+                    }
+                    since = data.since;
+                    more = Boolean(data.has_newer);
+                })
+                .finally(() => {
+                    busy = false;
+                    // More new messages than one page: fetch the rest now
+                    if (more || again) {
+                        again = false;
+                        sync.poll();
+                    }
+                });
+        },
+        loadOlder() {
+            if (!before || busy) return Promise.resolve();
+            busy = true;
+            return get({ before })
+                .then(data => {
+                    before = data.before;
+                    handlers.prepend(data.messages, data.has_older);
+                })
+                .finally(() => {
+                    busy = false;
+                    if (again) {
+                        again = false;
+                        sync.poll();
+                    }
+                });
+        }
+    };
+    return sync;
+}
+
+// Server push (/api/events): one EventSource per page carries chat messages and
+// notifications. Pages register handlers with onRealtimeEvent(); 'resync' means
+// events were missed and the page should reload its data. The browser
+// reconnects on its own and the server replays what it missed meanwhile.
+const realtimeHandlers = {};
+let realtimeSource = null;
+
+function connectRealtime() {
+    // Off unless the server runs threaded workers (REALTIME_ENABLED)
+    if (realtimeSource || !window.REALTIME_ENABLED || typeof EventSource === 'undefined') return;
+    realtimeSource = new EventSource('/api/events');
+    ['message', 'notification', 'resync'].forEach(type => {
+        realtimeSource.addEventListener(type, event => {
+            let data = {};
+            try {
+                data = JSON.parse(event.data);
+            } catch (e) {
+                return;
+            }
+            (realtimeHandlers[type] || []).forEach(handler => handler(data));
+        });
+    });
+    // Reconnected after a drop: anything the server could not replay is covered by 'resync'
+    realtimeSource.addEventListener('error', () => {
+        if (realtimeSource.readyState === EventSource.CLOSED) realtimeSource = null;
+    });
+}
+
+function onRealtimeEvent(type, handler) {
+    (realtimeHandlers[type] = realtimeHandlers[type] || []).push(handler);
+}
+
+// Pages fall back to polling while this is false
+function isRealtimeConnected() {
+    return Boolean(realtimeSource && realtimeSource.readyState === EventSource.OPEN);
+}
+
 // Export functions for use in other scripts
 window.CatanduanesConnect = {
     formatTimeAgo,
@@ -415,5 +572,9 @@ window.CatanduanesConnect = {
     showConfirmDialog,
     showLoading,
     hideLoading,
-    debounce
+    debounce,
+    postEventStream,
+    createConversationSync,
+    onRealtimeEvent,
+    isRealtimeConnected
 };
\ No newline at end of file
@@ -122,14 +122,25 @@ function loadBusinessesMap(mapId) {
     
     const map = maps[mapId];
     
-    // Clear existing markers
-    clearMapMarkers(mapId);
+    // Markers are fetched per viewport, so reload whenever the view changes
+    if (!map._businessMarkersBound) {
+        map.on('moveend', () => loadBusinessesMap(mapId));
+        map._businessMarkersBound = true;
+    }
+    
+    const params = new URLSearchParams({
+        bbox: map.getBounds().toBBoxString(),
+        zoom: map.getZoom()
+    });
     
     // Fetch business markers from API
-    fetch('/api/businesses/map-markers')
+    fetch(`/api/businesses/map-markers?${params}`)
         .then(response => response.json())
         .then(data => {
             if (data.success && data.markers) {
+                // Clear existing markers only once the new ones have arrived
+                clearMapMarkers(mapId);
+                
                 // Add business markers
                 data.markers.forEach(business => {
                     if (business.latitude && business.longitude) {
@@ -145,11 +156,13 @@ function loadBusinessesMap(mapId) {
                     }
                 });
                 
-                // Fit map to show all markers
-                if (mapMarkers[mapId].length > 0) {
-                    const group = new L.featureGroup(mapMarkers[mapId]);
-                    map.fitBounds(group.getBounds().pad(0.1));
-                }
+                // Dense areas come back as clusters; clicking one zooms in
+                (data.clusters || []).forEach(cluster => {
+                    const marker = createClusterMarker(cluster);
+                    marker.on('click', () => map.setView([cluster.lat, cluster.lng], cluster.expansion_zoom));
+                    marker.addTo(map);
+                    mapMarkers[mapId].push(marker);
+                });
             } else {
                 console.error('Failed to load business markers:', data.error || 'Unknown error');
             }
@@ -159,6 +172,17 @@ function loadBusinessesMap(mapId) {
         });
 }
 
+function createClusterMarker(cluster) {
+    const size = cluster.count < 10 ? 32 : cluster.count < 100 ? 40 : 48;
+    return L.marker([cluster.lat, cluster.lng], {
+        icon: L.divIcon({
+            html: `<div class="flex items-center justify-center rounded-full bg-blue-600 text-white font-bold shadow-lg border-2 border-white" style="width:${size}px;height:${size}px;">${cluster.count}</div>`,
+            className: 'map-cluster-icon',
+            iconSize: [size, size]
+        })
+    });
+}
+
 function createBusinessPopupContent(business) {
     return `
         <div class="business-popup">
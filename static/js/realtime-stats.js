@@ -7,6 +7,8 @@ class RealtimeStatsUpdater {
     constructor(options = {}) {
         this.apiEndpoint = options.apiEndpoint || '/api/realtime/stats';
         this.refreshInterval = options.refreshInterval || 10000; // 10 seconds default
+        // While events are pushed (/api/events) the page refreshes on them instead
+        this.pushedRefreshInterval = options.pushedRefreshInterval || 60000;
         this.statsElements = options.statsElements || {};
         this.isRunning = false;
         this.lastUpdate = null;
@@ -19,7 +21,25 @@ class RealtimeStatsUpdater {
         if (this.isRunning) return;
         this.isRunning = true;
         this.updateStats();
-        this.intervalId = setInterval(() => this.updateStats(), this.refreshInterval);
+        this.intervalId = setInterval(() => this.tick(), this.refreshInterval);
+    }
+
+    /**
+     * Interval refresh; mostly skipped while pushed events arrive
+     */
+    tick() {
+        const pushed = typeof isRealtimeConnected === 'function' && isRealtimeConnected();
+        if (pushed && this.lastUpdate && Date.now() - this.lastUpdate < this.pushedRefreshInterval) return;
+        this.updateStats();
+    }
+
+    /**
+     * Refresh soon after a pushed event, once for a burst of them
+     */
+    refreshSoon() {
+        if (!this.isRunning) return;
+        clearTimeout(this.pushTimer);
+        this.pushTimer = setTimeout(() => this.updateStats(), 1000);
     }
 
     /**
@@ -132,6 +152,11 @@ document.addEventListener('DOMContentLoaded', function() {
     }
 
     window.statsUpdater.start();
+    if (typeof onRealtimeEvent === 'function') {
+        ['message', 'notification', 'resync'].forEach(type => {
+            onRealtimeEvent(type, () => window.statsUpdater.refreshSoon());
+        });
+    }
 
     // Stop updates when page is hidden (tab/window switch)
     document.addEventListener('visibilitychange', () => {
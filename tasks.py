@@ -117,47 +117,28 @@ def send_email_task(to, subject, html_content):
             logging.error(f"Direct SendGrid email failed for {to}: {direct_error}")
             return False
 
-@run_async
 def create_notification_task(user_id=None, type='general', title='', message='', data=None):
-    """Create notification for user"""
+    """Queue a notification for a user; written in batches by notification_writer"""
     try:
-        from database import get_neo4j_db, safe_run
-        
-        # If user_id is provided, verify user exists first
-        if user_id:
-            db = get_neo4j_db()
-            with db.session() as session:
-                user_check = safe_run(session, """
-                    MATCH (u:User {id: $user_id})
-                    RETURN u.id as id
-                """, {'user_id': user_id})
-                
-                if not user_check:
-                    logging.error(f"Cannot create notification: User {user_id} not found in database")
-                    return False
+        from notification_writer import notification_writer
         
-        db = get_neo4j_db()
-        with db.session() as session:
-            notification_id = str(uuid.uuid4())
-            notification_data = {
-                'id': notification_id,
-                'type': type,
-                'title': title,
-                'message': message,
-                'data': data or {},
-                'is_read': False,
-                'created_at': datetime.utcnow().isoformat()
-            }
-            
-            if user_id:
-                notification_data['user_id'] = user_id
-            
-            safe_run(session, """
-                CREATE (n:Notification $notification_data)
-            """, {'notification_data': notification_data})
+        if not user_id:
+            logging.error(f"Cannot create notification without a user: {title}")
+            return False
         
-        logging.info(f"Notification created: {title}")
-        return True
+        queued = notification_writer.submit({
+            'id': str(uuid.uuid4()),
+            'user_id': user_id,
+            'type': type,
+            'title': title,
+            'message': message,
+            'data': data or {},
+            'is_read': False,
+            'created_at': datetime.utcnow().isoformat()
+        })
+        if queued:
+            logging.info(f"Notification queued: {title}")
+        return queued
         
     except Exception as e:
         logging.error(f"Failed to create notification: {e}")
@@ -0,0 +1,76 @@
+"""Integration tests: hot lookups must be served by indexes after migration"""
+
+import pytest
+from blueprints.chat.routes import _CONVERSATIONS_LIST, _MARK_READ
+from migrations import MIGRATIONS, get_schema_version, run_migrations
+
+
+# (name, query, params) for the lookups every page view depends on
+HOT_QUERIES = [
+    ('user_by_id', "MATCH (u:User {id: $id}) RETURN u", {'id': 'x'}),
+    ('user_by_email', "MATCH (u:User {email: $email}) RETURN u", {'email': 'x'}),
+    ('business_by_id', "MATCH (b:Business {id: $id}) RETURN b", {'id': 'x'}),
+    ('job_by_id', "MATCH (j:Job {id: $id}) RETURN j", {'id': 'x'}),
+    ('application_by_id', "MATCH (a:JobApplication {id: $id}) RETURN a", {'id': 'x'}),
+    ('interview_by_id', "MATCH (i:Interview {id: $id}) RETURN i", {'id': 'x'}),
+    ('notifications_for_user', """
+        MATCH (n:Notification) WHERE n.user_id = $user_id
+        RETURN n ORDER BY n.created_at DESC LIMIT 20
+    """, {'user_id': 'x'}),
+    ('messages_sent', "MATCH (m:UserMessage) WHERE m.sender_id = $user_id RETURN m", {'user_id': 'x'}),
+    ('messages_received', "MATCH (m:UserMessage) WHERE m.recipient_id = $user_id RETURN m", {'user_id': 'x'}),
+    ('conversation', """
+        MATCH (m:UserMessage) WHERE m.conversation_id = $conversation_id
+        RETURN m ORDER BY m.timestamp DESC, m.id DESC LIMIT 51
+    """, {'conversation_id': 'x:y'}),
+    ('conversations_list', _CONVERSATIONS_LIST, {'user_id': 'x'}),
+    ('mark_read', _MARK_READ, {'conversation_id': 'x:y', 'user_id': 'x', 'ids': None}),
+    ('active_jobs_latest', """
+        MATCH (j:Job) WHERE j.is_active = true
+        RETURN j ORDER BY j.created_at DESC LIMIT 20
+    """, {}),
+    ('jobs_after_cursor', """
+        MATCH (j:Job)
+        WHERE j.created_at <= $cursor_0
+          AND ((j.created_at < $cursor_0) OR (j.created_at = $cursor_0 AND j.id < $cursor_1))
+        RETURN j ORDER BY j.created_at DESC, j.id DESC LIMIT 21
+    """, {'cursor_0': '2025-01-01T00:00:00', 'cursor_1': 'x'}),
+    ('businesses_in_viewport', """
+        MATCH (b:Business)
+        WHERE point.withinBBox(b.position,
+                               point({longitude: $west, latitude: $south}),
+                               point({longitude: $east, latitude: $north}))
+        RETURN b.id
+    """, {'west': 124.1, 'south': 13.5, 'east': 124.4, 'north': 14.0}),
+]
+
+SCAN_OPERATORS = ('NodeByLabelScan', 'AllNodesScan')
+
+
+def _operators(plan):
+    """Yield every operatorType in a plan tree"""
+    yield plan['operatorType']
+    for child in plan.get('children', []):
+        yield from _operators(child)
+
+
+@pytest.mark.integration
+class TestSchemaMigrations:
+    """Schema migrations and the query plans they enable"""
+
+    def test_migrations_record_latest_version(self, neo4j_db):
+        """Applying migrations stores the latest version and is idempotent"""
+        run_migrations(neo4j_db)
+        with neo4j_db.session() as session:
+            assert get_schema_version(session) == MIGRATIONS[-1].version
+        assert run_migrations(neo4j_db) == []
+
+    @pytest.mark.parametrize('name,query,params', HOT_QUERIES, ids=[q[0] for q in HOT_QUERIES])
+    def test_hot_query_uses_index(self, neo4j_db, name, query, params):
+        """Hot lookups must not regress to label or all-node scans"""
+        run_migrations(neo4j_db)
+        with neo4j_db.session() as session:
+            session.run("CALL db.awaitIndexes(300)").consume()
+            plan = session.run(f"EXPLAIN {query}", params).consume().plan
+        scans = [op for op in _operators(plan) if op.split('@')[0] in SCAN_OPERATORS]
+        assert not scans, f"{name} plans a {scans[0]}"
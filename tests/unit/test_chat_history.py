@@ -0,0 +1,112 @@
+"""Unit tests for the server-side chat history store"""
+
+import threading
+import time
+
+import pytest
+from flask import Flask
+
+from chat_history import ChatHistoryStore, clip, estimate_tokens
+from gemini_client import GeminiChat
+
+
+def _store(summarize=None, **settings):
+    store = ChatHistoryStore(summarize=summarize)
+    store.configure(**settings)
+    return store
+
+
+def _wait_for_summaries(store):
+    deadline = time.time() + 5
+    while store._in_flight and time.time() < deadline:
+        time.sleep(0.01)
+
+
+class TestChatHistory:
+    """Token-budgeted history assembly and summaries"""
+
+    def test_clip_and_estimate(self):
+        assert estimate_tokens('abcd' * 10) == 10
+        clipped = clip('word ' * 100, 10)
+        assert clipped.endswith(' …') and estimate_tokens(clipped) <= 11
+
+    def test_recent_turns_fit_the_budget(self):
+        store = _store(budget_tokens=60, turn_tokens=25)
+        for i in range(10):
+            store.append(1, 'c', f'question {i}', f'answer {i} ' + 'x' * 400)
+        older, recent = store.split(store.load(1, 'c')['turns'])
+        assert sum(estimate_tokens(turn['content']) for turn in recent) <= 60
+        assert recent[-1]['content'].startswith('answer 9')
+        assert len(older) + len(recent) == 20
+
+    def test_storage_is_capped(self):
+        store = _store(max_turns=6)
+        for i in range(10):
+            store.append(1, 'c', f'q{i}', f'a{i}')
+        turns = store.load(1, 'c')['turns']
+        assert [turn['content'] for turn in turns[:2]] == ['q7', 'a7']
+        assert len(turns) == 6
+
+    def test_older_turns_are_summarised_once(self):
+        calls = []
+
+        def summarize(summary, turns, max_tokens):
+            calls.append(len(turns))
+            return f"{summary} +{len(turns)}".strip()
+
+        store = _store(summarize, budget_tokens=20, turn_tokens=10, summary_batch=4)
+        for i in range(6):
+            store.append(1, 'c', f'question number {i}', f'answer number {i}')
+        with Flask(__name__).app_context():
+            store.context(1, 'c')
+            _wait_for_summaries(store)
+            summary, recent = store.context(1, 'c')
+        assert len(calls) == 1 and calls[0] >= 4
+        assert summary == f"+{calls[0]}"
+        assert len(store.load(1, 'c')['turns']) == 12 - calls[0]
+
+    @pytest.mark.parametrize('backend', ['memory', 'sqlite'])
+    def test_concurrent_appends_are_all_kept(self, backend, tmp_path):
+        store = _store(max_turns=500, db_path=str(tmp_path / 'chat.db') if backend == 'sqlite' else None)
+
+        def talk(worker):
+            for i in range(20):
+                store.append(1, 'c', f'w{worker} q{i}', f'w{worker} a{i}')
+
+        threads = [threading.Thread(target=talk, args=(worker,)) for worker in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(store.load(1, 'c')['turns']) == 160
+
+    def test_summary_skipped_when_turns_moved_on(self, tmp_path):
+        store = _store(budget_tokens=20, turn_tokens=10, summary_batch=4, max_turns=12,
+                       db_path=str(tmp_path / 'chat.db'))
+
+        def summarize(summary, turns, max_tokens):
+            # A reply lands (and the cap drops the oldest turns) mid-summary
+            store.append(1, 'c', 'late question', 'late answer')
+            return 'stale'
+
+        store._summarize = summarize
+        for i in range(6):
+            store.append(1, 'c', f'question number {i}', f'answer number {i}')
+        with Flask(__name__).app_context():
+            store.context(1, 'c')
+            _wait_for_summaries(store)
+        record = store.load(1, 'c')
+        assert record['summary'] == ''
+        assert record['turns'][-1]['content'] == 'late answer'
+
+    def test_workers_share_host_file(self, tmp_path):
+        path = str(tmp_path / 'chat.db')
+        _store(db_path=path).append(1, 'c', 'hello', 'hi')
+        # Another worker, same host file
+        assert [turn['content'] for turn in _store(db_path=path).load(1, 'c')['turns']] == ['hello', 'hi']
+
+    def test_prompt_includes_summary_and_all_given_turns(self):
+        history = [{'role': 'user', 'content': f'turn {i}'} for i in range(8)]
+        prompt = GeminiChat._build_prompt('next', history=history, summary='Looking for cook jobs')
+        assert 'Summary of the conversation so far:\nLooking for cook jobs' in prompt
+        assert 'User: turn 0' in prompt
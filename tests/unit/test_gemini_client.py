@@ -0,0 +1,98 @@
+"""Unit tests for the shared Gemini client"""
+
+from types import SimpleNamespace
+
+import pytest
+
+import gemini_cache
+import gemini_client
+from gemini_cache import ResponseCache, cache_key
+from gemini_client import GeminiChat, get_client, get_gemini_response, stream_gemini_response
+
+
+class TestSharedClient:
+    """One pooled client per process and api key"""
+
+    def test_client_is_reused(self, monkeypatch):
+        """GeminiChat and get_gemini_response share the same client"""
+        monkeypatch.setenv('GEMINI_API_KEY', 'test-key')
+        client = get_client()
+        assert get_client() is client
+        assert GeminiChat().client is client
+
+    def test_client_uses_configured_timeout(self, monkeypatch):
+        """The HTTP timeout comes from the client settings"""
+        monkeypatch.setitem(gemini_client._client_settings, 'timeout', 12.5)
+        client = get_client('timeout-test-key')
+        assert client._api_client._http_options.timeout == 12500
+
+    def test_missing_api_key(self, monkeypatch):
+        monkeypatch.delenv('GEMINI_API_KEY', raising=False)
+        with pytest.raises(ValueError):
+            get_client()
+
+
+class TestResponseCache:
+    """Prompt cache tiers, expiry and opt-out"""
+
+    def test_key_ignores_whitespace_but_not_temperature(self):
+        assert cache_key('find  IT\n jobs ', 'm', 0.7) == cache_key('find IT jobs', 'm', 0.7)
+        assert cache_key('find IT jobs', 'm', 0.7) != cache_key('find IT jobs', 'm', 0.2)
+
+    def test_lru_eviction_and_expiry(self, monkeypatch):
+        cache = ResponseCache(maxsize=2, ttl=10)
+        cache.set('a', '1')
+        cache.set('b', '2')
+        cache.get('a')
+        cache.set('c', '3')
+        assert cache.get('b') is None
+        assert cache.get('a') == '1'
+        monkeypatch.setattr(gemini_cache.time, 'time', lambda: 10 ** 12)
+        assert cache.get('a') is None
+
+    def test_disk_tier_is_shared(self, tmp_path):
+        """A second process-local cache on the same file sees stored entries"""
+        path = str(tmp_path / 'gemini.sqlite')
+        ResponseCache(db_path=path).set('k', 'answer')
+        other = ResponseCache(db_path=path)
+        assert other.get('k') == 'answer'
+        assert other.get('k') == 'answer'
+        stats = other.stats()
+        assert (stats['disk_hits'], stats['memory_hits']) == (1, 1)
+
+    def test_identical_prompts_hit_cache_unless_opted_out(self, monkeypatch):
+        calls = []
+
+        class Models:
+            def generate_content(self, **kwargs):
+                calls.append(kwargs)
+                return SimpleNamespace(text=' keywords ')
+
+        monkeypatch.setattr(gemini_client, 'get_client', lambda: SimpleNamespace(models=Models()))
+        monkeypatch.setattr(gemini_client, 'response_cache', ResponseCache())
+        assert get_gemini_response('expand: cook') == 'keywords'
+        assert get_gemini_response('expand:  cook') == 'keywords'
+        assert get_gemini_response('expand: cook', use_cache=False) == 'keywords'
+        assert len(calls) == 2
+
+
+class TestStreaming:
+    """Streamed generation and chat formatting"""
+
+    def test_format_chunks_handles_split_markers(self):
+        chunks = ['  **Jobs', '*', '* near you:\n* Cook']
+        assert ''.join(gemini_client._format_chunks(iter(chunks))) == 'Jobs near you:\n•  Cook'
+
+    def test_stream_is_cached_once_complete(self, monkeypatch):
+        calls = []
+
+        class Models:
+            def generate_content_stream(self, **kwargs):
+                calls.append(kwargs)
+                return (SimpleNamespace(text=text) for text in ['Hello', ' there'])
+
+        monkeypatch.setattr(gemini_client, 'get_client', lambda: SimpleNamespace(models=Models()))
+        monkeypatch.setattr(gemini_client, 'response_cache', ResponseCache())
+        assert list(stream_gemini_response('tips')) == ['Hello', ' there']
+        assert list(stream_gemini_response('tips')) == ['Hello there']
+        assert len(calls) == 1
@@ -0,0 +1,68 @@
+"""Unit tests for the offline Gemini backend"""
+
+import json
+
+import pytest
+
+import gemini_client
+from gemini_fake import FakeGeminiClient, fake_client
+from gemini_governor import is_overload_error, is_quota_error, retry_after_seconds
+
+
+def _fake(**settings):
+    return FakeGeminiClient(latency_ms=0, jitter_ms=0, seed=1, **settings)
+
+
+class TestFakeClient:
+    """Replies, latency and injected failures"""
+
+    def test_templated_and_canned_replies(self):
+        fake = _fake(replies=[{'match': 'registration', 'reply': {'tips': ['Add photos']}}])
+        assert 'Find IT jobs' in fake.models.generate_content(contents='Find IT jobs in Virac').text
+        assert json.loads(fake.models.generate_content(contents='registration tips').text) == {'tips': ['Add photos']}
+
+    def test_schema_shaped_json(self):
+        schema = {'type': 'OBJECT', 'properties': {
+            'score': {'type': 'INTEGER'}, 'issues': {'type': 'ARRAY', 'items': {'type': 'STRING'}}}}
+        reply = _fake().models.generate_content(contents='check', config={'response_schema': schema}).text
+        value = json.loads(reply)
+        assert isinstance(value['score'], int) and len(value['issues']) == 3
+
+    def test_errors_look_like_the_sdk(self):
+        with pytest.raises(Exception) as quota:
+            _fake(error_429=1.0, retry_delay=7).models.generate_content(contents='hi')
+        assert is_quota_error(str(quota.value)) and retry_after_seconds(str(quota.value)) == 7
+        with pytest.raises(Exception) as overload:
+            _fake(error_503=1.0).models.generate_content(contents='hi')
+        assert is_overload_error(str(overload.value))
+
+    def test_safety_block(self):
+        with pytest.raises(ValueError):
+            _fake(safety_block=1.0).models.generate_content(contents='hi').text
+
+    def test_stream_chunks_rebuild_the_reply(self):
+        fake = _fake(chunk_words=2)
+        stream = fake.models.generate_content_stream(contents='Find IT jobs')
+        chunks = [chunk.text for chunk in stream]
+        stream.close()
+        assert len(chunks) > 1
+        assert ''.join(chunks).strip() == fake.reply('Find IT jobs', {})
+        assert fake.stats()['calls'] == 1
+
+
+class TestBackendSelection:
+    """GEMINI_BACKEND=fake routes every call to the fake"""
+
+    def test_get_client_returns_fake_without_key(self, monkeypatch):
+        monkeypatch.setitem(gemini_client._client_settings, 'backend', 'fake')
+        monkeypatch.delenv('GEMINI_API_KEY', raising=False)
+        assert gemini_client.get_client() is fake_client
+        assert gemini_client.GeminiChat().client is fake_client
+
+    def test_generate_reports_safety_block(self, monkeypatch):
+        monkeypatch.setitem(gemini_client._client_settings, 'backend', 'fake')
+        monkeypatch.setattr(fake_client, 'safety_block', 1.0)
+        monkeypatch.setattr(fake_client, 'latency_ms', 0)
+        monkeypatch.setattr(fake_client, 'jitter_ms', 0)
+        text, ok = gemini_client._generate('hello', 0.7, gemini_client.PRIORITY_STANDARD)
+        assert not ok and 'unable to generate' in text
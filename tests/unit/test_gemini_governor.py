@@ -0,0 +1,114 @@
+"""Unit tests for the Gemini rate governor and circuit breaker"""
+
+import pytest
+
+import gemini_governor
+from gemini_governor import (
+    CLOSED, HALF_OPEN, OPEN, PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE,
+    GeminiGovernor, retry_after_seconds,
+)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.time() for the governor"""
+    now = [1000.0]
+    monkeypatch.setattr(gemini_governor.time, 'time', lambda: now[0])
+    return now
+
+
+class TestBudget:
+    """Token bucket with priority reserves"""
+
+    def test_background_stops_before_interactive(self, clock):
+        governor = GeminiGovernor(rate_per_minute=60, burst=4)
+        assert governor.try_acquire(PRIORITY_BACKGROUND)
+        assert governor.try_acquire(PRIORITY_BACKGROUND)
+        assert not governor.try_acquire(PRIORITY_BACKGROUND)
+        assert governor.try_acquire(PRIORITY_INTERACTIVE)
+        assert governor.snapshot()['rejects'] == {'background:budget': 1}
+
+    def test_bucket_refills_over_time(self, clock):
+        governor = GeminiGovernor(rate_per_minute=60, burst=2)
+        assert governor.try_acquire(PRIORITY_INTERACTIVE)
+        assert governor.try_acquire(PRIORITY_INTERACTIVE)
+        assert not governor.try_acquire(PRIORITY_INTERACTIVE)
+        clock[0] += 1
+        assert governor.try_acquire(PRIORITY_INTERACTIVE)
+
+
+class TestCircuitBreaker:
+    """Open on quota errors, recover through a half-open probe"""
+
+    def test_quota_error_opens_until_retry_delay(self, clock):
+        governor = GeminiGovernor(burst=10)
+        assert governor.record_failure("429 RESOURCE_EXHAUSTED {'retryDelay': '20s'}")
+        snapshot = governor.snapshot()
+        assert (snapshot['circuit'], snapshot['recovers_in_seconds']) == (OPEN, 20)
+        assert not governor.try_acquire(PRIORITY_INTERACTIVE)
+
+    def test_overloads_open_after_threshold(self, clock):
+        governor = GeminiGovernor(threshold=3)
+        assert not governor.record_failure('503 UNAVAILABLE')
+        assert not governor.record_failure('503 UNAVAILABLE')
+        assert governor.record_failure('503 UNAVAILABLE')
+
+    def test_half_open_probe_closes_or_reopens(self, clock):
+        governor = GeminiGovernor(rate_per_minute=60, cooldown=30)
+        governor.record_failure('429')
+        clock[0] += 31
+        assert governor.snapshot()['circuit'] == HALF_OPEN
+        assert governor.try_acquire(PRIORITY_BACKGROUND)
+        assert not governor.try_acquire(PRIORITY_INTERACTIVE)  # one probe at a time
+        governor.record_failure('429')
+        assert governor.snapshot()['recovers_in_seconds'] == 60  # doubled
+        clock[0] += 61
+        assert governor.try_acquire(PRIORITY_INTERACTIVE)
+        governor.record_success()
+        assert governor.snapshot()['circuit'] == CLOSED
+
+
+class TestSharedState:
+    """Workers on one host share a budget; a broken backend is skipped quietly"""
+
+    def test_workers_share_host_file(self, clock, tmp_path):
+        path = str(tmp_path / 'governor.db')
+        first = GeminiGovernor(rate_per_minute=60, burst=2)
+        second = GeminiGovernor(rate_per_minute=60, burst=2)
+        first.configure(rate_per_minute=60, burst=2, db_path=path)
+        second.configure(rate_per_minute=60, burst=2, db_path=path)
+        assert first.try_acquire(PRIORITY_INTERACTIVE)
+        assert second.try_acquire(PRIORITY_INTERACTIVE)
+        assert not first.try_acquire(PRIORITY_INTERACTIVE)
+        second.record_failure('429')
+        assert first.snapshot()['circuit'] == OPEN
+        assert first.snapshot()['backend'] == 'host'
+
+    def test_failed_backend_skipped_for_a_while(self, clock, tmp_path, monkeypatch, caplog):
+        governor = GeminiGovernor()
+        governor.configure(db_path=str(tmp_path / 'governor.db'))
+        host = governor._backends[0]
+        healthy = host.transact
+        calls = []
+
+        def flaky(fn):
+            calls.append(fn)
+            if len(calls) == 1:
+                raise gemini_governor.sqlite3.OperationalError('database is locked')
+            return healthy(fn)
+
+        monotonic = [0.0]
+        monkeypatch.setattr(gemini_governor.time, 'monotonic', lambda: monotonic[0])
+        monkeypatch.setattr(host, 'transact', flaky)
+        for _ in range(5):
+            assert governor.try_acquire(PRIORITY_INTERACTIVE)
+        assert len(calls) == 1
+        assert len([r for r in caplog.records if r.levelname == 'WARNING']) == 1
+        assert governor.snapshot()['backend'] == 'worker'
+        monotonic[0] += gemini_governor.BACKEND_RETRY_SECONDS
+        assert governor.snapshot()['backend'] == 'host'
+
+
+def test_retry_delay_parsing():
+    assert retry_after_seconds("'details': [{'retryDelay': '37s'}]") == 37
+    assert retry_after_seconds('503 UNAVAILABLE') is None
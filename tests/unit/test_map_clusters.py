@@ -0,0 +1,39 @@
+"""Unit tests for viewport parsing and grid clustering"""
+
+from map_clusters import DEFAULT_BBOX, cell_size, parse_bbox, request_viewport, split_cells
+
+
+class TestViewport:
+    """bbox/zoom request parsing"""
+
+    def test_parse_leaflet_bbox(self):
+        """Leaflet's toBBoxString() order is west,south,east,north"""
+        assert parse_bbox('124.1,13.5,124.4,14.0') == (124.1, 13.5, 124.4, 14.0)
+
+    def test_invalid_bbox_falls_back_to_island(self):
+        """Garbage or inverted boxes use the default viewport"""
+        assert parse_bbox('1,2,3') is None
+        assert parse_bbox('124,14,125,13') is None
+        assert request_viewport({'bbox': 'nope', 'zoom': 'x'}) == (DEFAULT_BBOX, 10)
+
+    def test_cells_shrink_with_zoom(self):
+        """Each zoom level halves the grid cell"""
+        assert cell_size(11) == cell_size(10) / 2
+
+
+class TestSplitCells:
+    """Aggregated cells to clusters and points"""
+
+    def test_singletons_are_points_and_dense_cells_clusters(self):
+        rows = [
+            {'count': 1, 'lat': 13.6, 'lng': 124.2, 'items': [{'id': 'a'}]},
+            {'count': 7, 'lat': 13.58, 'lng': 124.23, 'items': [{'id': 'b'}]},
+        ]
+        clusters, points = split_cells(rows, zoom=12)
+        assert points == [{'id': 'a'}]
+        assert clusters == [{'count': 7, 'lat': 13.58, 'lng': 124.23, 'expansion_zoom': 14}]
+
+    def test_no_clustering_at_max_zoom(self):
+        rows = [{'count': 3, 'lat': 13.6, 'lng': 124.2, 'items': [{'id': 'a'}, {'id': 'b'}, {'id': 'c'}]}]
+        clusters, points = split_cells(rows, zoom=17)
+        assert clusters == [] and len(points) == 3
@@ -0,0 +1,99 @@
+"""Unit tests for the batched notification writer"""
+
+import threading
+
+import pytest
+
+import notification_writer as module
+from notification_writer import NotificationWriter, decode_data
+
+
+def _row(n, user_id='u1'):
+    return {'id': f"n{n}", 'user_id': user_id, 'title': f"Title {n}", 'data': {'n': n}}
+
+
+@pytest.fixture
+def batches(monkeypatch):
+    """Batches handed to the database; users named 'missing' do not exist"""
+    monkeypatch.setattr(module, 'publish', lambda *args: None)
+    return []
+
+
+def _writer(batches, gate=None, **settings):
+    def write(config, rows):
+        if gate is not None:
+            gate.wait(5)
+        batches.append([row['id'] for row in rows])
+        return [row['id'] for row in rows if row['user_id'] != 'missing']
+
+    writer = NotificationWriter(write=write)
+    writer.configure(config={}, **settings)
+    return writer
+
+
+class TestNotificationWriter:
+    """Batching, backpressure and drain"""
+
+    def test_queued_notifications_share_one_batch(self, batches):
+        gate = threading.Event()
+        writer = _writer(batches, gate, batch_size=10, flush_seconds=5)
+        for n in range(4):
+            assert writer.submit(_row(n))
+        gate.set()
+        writer.close()
+        assert sorted(id for batch in batches for id in batch) == ['n0', 'n1', 'n2', 'n3']
+        assert len(batches) <= 2
+
+    def test_batch_size_triggers_a_flush(self, batches):
+        writer = _writer(batches, batch_size=2, flush_seconds=5)
+        for n in range(4):
+            writer.submit(_row(n))
+        writer.close()
+        assert all(len(batch) <= 2 for batch in batches)
+        assert writer.stats()['written'] == 4
+
+    def test_full_queue_writes_inline(self, batches):
+        gate = threading.Event()
+        writer = _writer(batches, gate, max_queue=1, batch_size=1, put_timeout=0.01)
+        writer.submit(_row(0))
+        threading.Timer(0.2, gate.set).start()
+        for n in range(1, 4):
+            writer.submit(_row(n))
+        writer.close()
+        stats = writer.stats()
+        assert stats['inline'] >= 1
+        assert stats['written'] == 4 and stats['pending'] == 0
+
+    def test_unknown_users_and_failures_are_counted(self, batches):
+        writer = _writer(batches, batch_size=5, flush_seconds=0.01)
+        writer.submit(_row(0, user_id='missing'))
+        writer.submit(_row(1))
+        writer.close()
+        assert writer.stats()['written'] == 1 and writer.stats()['skipped'] == 1
+
+        def fail(config, rows):
+            raise ConnectionError('Neo4j down')
+
+        failing = NotificationWriter(write=fail)
+        failing.configure(config={})
+        failing.submit(_row(2))
+        failing.close()
+        assert failing.stats()['failed'] == 1
+
+    def test_unconfigured_writer_refuses(self):
+        assert NotificationWriter(write=lambda config, rows: []).submit(_row(0)) is False
+
+    def test_published_after_write(self, monkeypatch):
+        published = []
+        monkeypatch.setattr(module, 'publish', lambda user_id, event, data: published.append((user_id, data['id'])))
+        writer = _writer([], batch_size=5, flush_seconds=0.01)
+        writer.submit(_row(0))
+        writer.submit(_row(1, user_id='missing'))
+        writer.close()
+        assert published == [('u1', 'n0')]
+
+
+def test_decode_data():
+    assert decode_data('{"job_id": "j1"}') == {'job_id': 'j1'}
+    assert decode_data({'a': 1}) == {'a': 1}
+    assert decode_data(None) == {} and decode_data('not json') == {}
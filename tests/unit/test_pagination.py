@@ -0,0 +1,69 @@
+"""Unit tests for keyset pagination helpers"""
+
+from datetime import timezone
+
+from neo4j.time import Date, DateTime
+
+from pagination import KeysetPager, decode_cursor, encode_cursor, keyset_condition
+
+KEYS = [('j.created_at', 'DESC'), ('j.id', 'DESC')]
+
+
+class TestCursorTokens:
+    """Cursor encoding"""
+
+    def test_round_trip(self):
+        """A cursor decodes to the values and direction it was built from"""
+        token = encode_cursor(['2025-01-01T00:00:00', 'job-1'], 'prev')
+        assert decode_cursor(token, 2) == (['2025-01-01T00:00:00', 'job-1'], 'prev')
+
+    def test_temporal_keys_keep_their_type(self):
+        """Neo4j DateTime/Date keys come back as the same temporal values"""
+        created = DateTime(2025, 1, 2, 3, 4, 5, 123456789, tzinfo=timezone.utc)
+        values, _ = decode_cursor(encode_cursor([created, Date(2025, 1, 2), 'job-1']), 3)
+        assert values == [created, Date(2025, 1, 2), 'job-1']
+        assert isinstance(values[0], DateTime)
+
+    def test_rejects_garbage_and_foreign_cursors(self):
+        """Malformed tokens or tokens for another sort key are ignored"""
+        assert decode_cursor('not-a-cursor', 2) is None
+        assert decode_cursor(encode_cursor(['a', 'b', 'c']), 2) is None
+
+
+class TestKeysetPager:
+    """Query fragments and page bookkeeping"""
+
+    def test_condition_seeks_on_leading_key(self):
+        """The predicate is bounded on the first key and breaks ties on the second"""
+        assert keyset_condition(KEYS) == (
+            "(j.created_at <= $cursor_0 AND ((j.created_at < $cursor_0) OR "
+            "(j.created_at = $cursor_0 AND j.id < $cursor_1)))"
+        )
+
+    def test_null_boundary_continues_with_the_rest(self):
+        """A null created_at does not end the listing: later nulls, then every dated row"""
+        pager = KeysetPager(KEYS, per_page=20, cursor=encode_cursor([None, 'job-5']))
+        assert pager.where() == "((j.created_at IS NOT NULL) OR (j.created_at IS NULL AND j.id < $cursor_1))"
+
+    def test_offset_pages_are_capped(self):
+        """Without a cursor, deep page numbers are clamped to the offset window"""
+        pager = KeysetPager(KEYS, per_page=20, page=500, max_offset_pages=10)
+        assert pager.page == 10
+        assert pager.where() == ''
+        assert pager.params == {'skip': 180, 'limit': 21}
+
+    def test_next_page_sets_cursors(self):
+        """The look-ahead row is dropped and becomes the next cursor boundary"""
+        pager = KeysetPager(KEYS, per_page=2, page=1)
+        rows = pager.paginate([{'_keys': [3, 'c']}, {'_keys': [2, 'b']}, {'_keys': [1, 'a']}])
+        assert [row['_keys'] for row in rows] == [[3, 'c'], [2, 'b']]
+        assert pager.has_next and not pager.has_prev
+        assert decode_cursor(pager.next_cursor, 2) == ([2, 'b'], 'next')
+
+    def test_prev_cursor_scans_backwards(self):
+        """A prev cursor flips the sort order and restores display order"""
+        pager = KeysetPager(KEYS, per_page=2, page=3, cursor=encode_cursor([2, 'b'], 'prev'))
+        assert pager.order_by() == " ORDER BY j.created_at ASC, j.id ASC"
+        rows = pager.paginate([{'_keys': [3, 'c']}, {'_keys': [4, 'd']}])
+        assert [row['_keys'] for row in rows] == [[4, 'd'], [3, 'c']]
+        assert pager.has_next and not pager.has_prev
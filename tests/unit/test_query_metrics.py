@@ -0,0 +1,48 @@
+"""Unit tests for per-query metrics and slow-query plans"""
+
+from query_metrics import QueryMetrics, fingerprint
+
+
+class _Session:
+    """Records the statements run to capture a plan"""
+
+    def __init__(self):
+        self.queries = []
+
+    def run(self, query, params):
+        self.queries.append(query)
+        return self
+
+    def consume(self):
+        return self
+
+    plan = profile = None
+
+
+def _plan_prefix(query):
+    metrics = QueryMetrics(slow_query_ms=1, plan_mode='profile')
+    session = _Session()
+    metrics.record(query, 5.0, session=session)
+    return session.queries[0].split(' ', 1)[0]
+
+
+class TestQueryMetrics:
+    """Fingerprints, stats and plan capture"""
+
+    def test_literals_share_a_fingerprint(self):
+        assert fingerprint("MATCH (j:Job {id: 'a'}) RETURN j LIMIT 5")[0] == \
+            fingerprint("MATCH (j:Job {id: 'b'}) RETURN j LIMIT 10")[0]
+
+    def test_reads_are_profiled_and_writes_explained(self):
+        assert _plan_prefix("MATCH (j:Job) WHERE j.is_active = true RETURN j ORDER BY j.created_at DESC") == 'PROFILE'
+        assert _plan_prefix("MATCH (s:Settings) RETURN s.setup") == 'PROFILE'
+        assert _plan_prefix("MATCH (j:Job {id: $id}) SET j.views = j.views + 1") == 'EXPLAIN'
+        assert _plan_prefix("MATCH (u:User) CALL { WITH u RETURN u.id AS id } RETURN id") == 'EXPLAIN'
+
+    def test_plan_logged_once_per_fingerprint(self):
+        metrics = QueryMetrics(slow_query_ms=1)
+        session = _Session()
+        for _ in range(3):
+            metrics.record("MATCH (j:Job) RETURN j", 5.0, session=session)
+        assert len(session.queries) == 1
+        assert metrics.snapshot()[0]['count'] == 3
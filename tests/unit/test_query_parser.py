@@ -0,0 +1,44 @@
+"""Unit tests for the chatbot query parser"""
+
+from query_parser import has_filters, parse_query, search_kinds
+
+
+class TestParseQuery:
+    """Gazetteer, category and keyword matching"""
+
+    def test_location_does_not_swallow_the_sentence(self):
+        parsed = parse_query('I need a job as a driver in San Andres please')
+        assert parsed['location'] == 'San Andres'
+        assert parsed['kind'] == 'job'
+        assert parsed['keywords'] == ['driver']
+
+    def test_gazetteer_aliases(self):
+        assert parse_query('hiring sa Payo?')['location'] == 'Panganiban'
+        assert parse_query('restaurants in san_andres')['location'] == 'San Andres'
+
+    def test_tagalog_and_bicol_keywords(self):
+        parsed = parse_query('Igwa daw hiring na kusinero sa Virac?')
+        assert parsed['keywords'] == ['cook', 'kusinero']
+        assert parse_query('May bakante ba para sa nars?')['query'] == 'nurse nars'
+
+    def test_category_words_map_to_stored_categories(self):
+        assert 'healthcare' in parse_query('Igwa bakante sa ospital?')['categories']
+        assert parse_query('Looking for IT jobs')['categories'] == ['technology']
+        assert parse_query('is it open?')['categories'] is None
+        # Values stored by the seed scripts, not just the form choices
+        assert {'fishing', 'seafood'} <= set(parse_query('any fishing jobs?')['categories'])
+        assert 'food_beverage' in parse_query('restaurants in Virac')['categories']
+        assert 'services' in parse_query('repair services in Virac')['categories']
+
+    def test_category_word_stays_a_keyword(self):
+        assert 'fishing' in parse_query('any fishing jobs?')['keywords']
+        assert parse_query('May pangingisda ba?')['keywords'] == ['fishing', 'pangingisda']
+
+    def test_job_intent_wins_and_services_include_businesses(self):
+        assert parse_query('Which companies are hiring?')['kind'] == 'job'
+        assert search_kinds(parse_query('printing services in Virac')) == ['service', 'business']
+        assert search_kinds(parse_query('cafes in Virac')) is None
+
+    def test_small_talk_has_no_filters(self):
+        assert not has_filters(parse_query('Salamat po!'))
+        assert not has_filters(parse_query('Hello, good morning'))
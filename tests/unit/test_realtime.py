@@ -0,0 +1,103 @@
+"""Unit tests for the push event bus"""
+
+import json
+
+import pytest
+
+from realtime import EventBus, parse_event_id
+
+
+@pytest.fixture
+def bus():
+    bus = EventBus()
+    bus.configure(replay_size=3, heartbeat=0.01, max_stream_seconds=0.05)
+    return bus
+
+
+def _events(chunks):
+    """(event, id, data) for each formatted event, skipping retry and pings"""
+    events = []
+    for chunk in chunks:
+        fields = dict(line.split(': ', 1) for line in chunk.strip().splitlines() if not line.startswith(':'))
+        if 'event' in fields:
+            events.append((fields['event'], fields.get('id'), json.loads(fields['data'])))
+    return events
+
+
+class TestEventBus:
+    """Delivery, replay and resync"""
+
+    def test_publish_reaches_only_that_users_streams(self, bus):
+        subscription, missed, gap = bus.subscribe('u1')
+        other, _, _ = bus.subscribe('u2')
+        bus.publish('u1', 'message', {'text': 'Hi'})
+        item = subscription.get(timeout=0)
+        assert (item.event, item.data) == ('message', {'text': 'Hi'})
+        assert other.get(timeout=0) is None
+        assert (missed, gap) == ([], False)
+
+    def test_reconnect_replays_after_last_event_id(self, bus):
+        first = bus.publish('u1', 'message', {'n': 1})
+        bus.publish('u1', 'notification', {'n': 2})
+        _, missed, gap = bus.subscribe('u1', first)
+        assert [item.data for item in missed] == [{'n': 2}]
+        assert not gap
+
+    def test_gap_beyond_the_buffer_asks_for_resync(self, bus):
+        first = bus.publish('u1', 'message', {'n': 1})
+        for n in range(2, 6):
+            bus.publish('u1', 'message', {'n': n})
+        _, missed, gap = bus.subscribe('u1', first)
+        assert gap and len(missed) == 3
+        _, _, gap = bus.subscribe('u1', 1)
+        assert gap
+
+    def test_stream_sends_retry_replay_and_heartbeat(self, bus):
+        first = bus.publish('u1', 'message', {'n': 1})
+        second = bus.publish('u1', 'message', {'n': 2})
+        chunks = list(bus.stream('u1', str(first)))
+        assert chunks[0].startswith('retry: ')
+        assert _events(chunks) == [('message', str(second), {'n': 2})]
+        assert ': ping\n\n' in chunks
+        assert bus.stats()['streams'] == 0
+
+    def test_malformed_last_event_id_is_ignored(self, bus):
+        assert [parse_event_id(value) for value in ('7', '', None, 'abc', '1.5')] == [7, None, None, None, None]
+        bus.publish('u1', 'message', {'n': 1})
+        assert _events(bus.stream('u1', 'not-a-number')) == []
+
+    def test_follow_ends_at_the_deadline(self, bus):
+        first = bus.publish('u1', 'message', {'n': 1})
+        subscription, missed, gap = bus.subscribe('u1', first - 1)
+        items = list(bus.follow(subscription, missed, gap))
+        bus.unsubscribe(subscription)
+        assert items[0].data == {'n': 1} and None in items[1:]
+
+    def test_stalled_stream_is_told_to_resync(self, bus):
+        stream = bus.stream('u1')
+        next(stream)
+        for n in range(101):
+            bus.publish('u1', 'message', {'n': n})
+        events = _events(stream)
+        assert events[-1][0] == 'resync'
+        assert int(events[-1][1]) == bus.last_id
+
+    def test_broker_failure_still_delivers_locally(self, bus, monkeypatch):
+        def fail():
+            raise ConnectionError('Redis down')
+
+        subscription, _, _ = bus.subscribe('u1')
+        monkeypatch.setattr(bus._broker, 'next_id', fail)
+        assert bus.publish('u1', 'notification', {'title': 'Hired'}) is None
+        item = subscription.get(timeout=0)
+        assert item.id is None and item.data == {'title': 'Hired'}
+        _, missed, _ = bus.subscribe('u1', 0)
+        assert missed == []
+
+    def test_streams_beyond_the_cap_are_refused(self, bus):
+        bus.configure(max_streams=1)
+        assert bus.has_capacity()
+        subscription, _, _ = bus.subscribe('u1')
+        assert not bus.has_capacity()
+        bus.unsubscribe(subscription)
+        assert bus.has_capacity()
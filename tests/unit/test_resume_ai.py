@@ -0,0 +1,87 @@
+"""Unit tests for the batched resume/application analyses"""
+
+import pytest
+
+import resume_ai
+from gemini_cache import ResponseCache
+from gemini_client import GeminiError, _generation_config
+from resume_ai import run_batch
+
+RESUME_REPLY = {
+    'analysis': 'Overall Assessment: 80/100',
+    'suggestions': ['Add dates to each role'],
+    'completion': {'score': 80, 'issues': ['Missing summary']},
+}
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Fake get_gemini_json answering from RESUME_REPLY; records each schema"""
+    calls = []
+
+    def fake(prompt, schema, **kwargs):
+        calls.append(schema)
+        names = schema['required']
+        if 'review' in names or 'tips' in names or 'improvements' in names:
+            return {
+                'improvements': 'Lead with your strongest result.',
+                'tips': 'Highlight customer service.',
+                'review': {'score': 75, 'strengths': ['Clear'], 'improvements': ['Shorter'],
+                           'ready': True, 'notes': 'Good to go'},
+            }
+        return {name: RESUME_REPLY[name] for name in names}
+
+    monkeypatch.setattr(resume_ai, 'get_gemini_json', fake)
+    monkeypatch.setattr(resume_ai, 'response_cache', ResponseCache())
+    return calls
+
+
+class TestRunBatch:
+    """One structured call per document, cached by content"""
+
+    def test_resume_analyses_share_one_call(self, calls):
+        results, errors = run_batch(['analysis', 'suggestions', 'completion'], resume='Juan Dela Cruz')
+        assert errors == {}
+        assert results == RESUME_REPLY
+        assert len(calls) == 1
+        assert calls[0]['required'] == ['analysis', 'suggestions', 'completion']
+
+    def test_unchanged_resume_is_cached(self, calls):
+        run_batch(['analysis', 'completion'], resume='Juan Dela Cruz')
+        results, _ = run_batch(['analysis', 'completion'], resume='Juan   Dela Cruz\n')
+        assert len(calls) == 1
+        assert results['completion'] == {'score': 80, 'issues': ['Missing summary']}
+
+    def test_partial_hit_asks_only_for_missing(self, calls):
+        run_batch(['analysis'], resume='Juan Dela Cruz')
+        run_batch(['analysis', 'suggestions'], resume='Juan Dela Cruz')
+        assert [schema['required'] for schema in calls] == [['analysis'], ['suggestions']]
+
+    def test_groups_and_review_shape(self, calls):
+        results, _ = run_batch(['analysis', 'review'], resume='Juan', cover_letter='Dear Sir', job_title='Cook')
+        assert len(calls) == 2
+        assert results['review'] == {'overallScore': 75, 'strengths': ['Clear'], 'improvements': ['Shorter'],
+                                     'readyToSubmit': True, 'recommendations': 'Good to go'}
+
+    def test_tips_ignore_cover_letter(self, calls):
+        run_batch(['tips'], cover_letter='First draft', job_title='Cook')
+        run_batch(['tips'], cover_letter='Second draft', job_title='Cook')
+        assert len(calls) == 1
+
+    def test_errors_are_reported_per_analysis(self, monkeypatch, calls):
+        def fail(prompt, schema, **kwargs):
+            raise GeminiError('The AI service is temporarily unavailable.')
+
+        monkeypatch.setattr(resume_ai, 'get_gemini_json', fail)
+        results, errors = run_batch(['analysis', 'suggestions'], resume='Juan')
+        assert results == {}
+        assert errors == {'analysis': 'The AI service is temporarily unavailable.',
+                          'suggestions': 'The AI service is temporarily unavailable.'}
+
+
+def test_generation_config_requests_json():
+    schema = {'type': 'OBJECT', 'properties': {'tips': {'type': 'STRING'}}}
+    config = _generation_config(0.7, response_schema=schema)
+    assert config['response_mime_type'] == 'application/json'
+    assert config['response_schema'] is schema
+    assert 'response_mime_type' not in _generation_config(0.7)
@@ -0,0 +1,103 @@
+"""Unit tests for the chatbot retrieval index"""
+
+import random
+
+import pytest
+
+import retrieval_index
+from gemini_client import _format_context
+from retrieval_index import RetrievalIndex, search_context, tokenize
+
+
+def _index():
+    index = RetrievalIndex()
+    index.add('job:1', 'job', 'Line Cook line cook kitchen restaurant', {'title': 'Line Cook', 'location': 'Virac'})
+    index.add('job:2', 'job', 'Web Developer python javascript web', {'title': 'Web Developer', 'location': 'Virac'})
+    index.add('job:3', 'job', 'Head Cook cook resort kitchen', {'title': 'Head Cook', 'location': 'Pandan'})
+    return index
+
+
+class TestRetrievalIndex:
+    """BM25 ranking, filters and updates"""
+
+    def test_tokenize_drops_stopwords(self):
+        assert tokenize('Looking for a COOK job in Virac!') == ['cook', 'virac']
+
+    def test_ranks_by_relevance(self):
+        results = _index().search('python developer', 'job')
+        assert [r['title'] for r in results] == ['Web Developer']
+
+    def test_location_filter_and_k(self):
+        index = _index()
+        assert len(index.search('cook kitchen', 'job', k=1)) == 1
+        assert [r['title'] for r in index.search('cook', 'job', location='pandan')] == ['Head Cook']
+
+    def test_filters_without_terms(self):
+        index = _index()
+        assert [r['title'] for r in index.search('', 'job', location='pandan')] == ['Head Cook']
+        assert index.search('', 'job') == []
+
+    def test_replace_and_remove(self):
+        index = _index()
+        index.add('job:2', 'job', 'Baker bread pastry', {'title': 'Baker'})
+        assert index.search('python', 'job') == []
+        assert [r['title'] for r in index.search('bread', 'job')] == ['Baker']
+        index.remove('job:2')
+        assert index.search('bread', 'job') == []
+        assert len(index) == 2
+
+    def test_categories_boost_without_filtering(self):
+        index = RetrievalIndex()
+        index.add('business:1', 'business', 'Marine Fishing Co. fishing boats',
+                  {'name': 'Marine Fishing Co.', 'category': 'fishing', 'location': 'Virac'})
+        index.add('business:2', 'business', 'Local Noodle Shop noodle dishes',
+                  {'name': 'Local Noodle Shop', 'category': 'food_beverage', 'location': 'Virac'})
+        index.add('business:3', 'business', 'Fishing Supplies hooks nets',
+                  {'name': 'Fishing Supplies', 'category': 'retail', 'location': 'Virac'})
+        names = [r['name'] for r in index.search('fishing', 'business', categories=['fishing', 'seafood'])]
+        assert names == ['Marine Fishing Co.', 'Fishing Supplies']
+        names = [r['name'] for r in index.search('restaurants', 'business', categories=['food_beverage'])]
+        assert names == ['Local Noodle Shop']
+        index.remove('business:2')
+        assert index.search('restaurants', 'business', categories=['food_beverage']) == []
+
+    def test_early_exit_matches_full_scoring(self):
+        rng = random.Random(7)
+        words = 'cook baker driver nurse clerk welder guide farmer'.split()
+        index = RetrievalIndex()
+        for n in range(300):
+            text = ' '.join(rng.choices(words, k=rng.randint(2, 12)))
+            index.add(f"job:{n}", 'job', text, {'id': n, 'location': rng.choice(['Virac', 'Bato'])})
+        index.prepare()
+        stats = index._stats_for('job')
+        for query in ('cook', 'cook driver', 'nurse welder guide'):
+            for location in ('', 'bato'):
+                maps = [index._term_impacts('job', term, stats)[1] for term in query.split()]
+                scores = {doc_id: sum(m.get(doc_id, 0.0) for m in maps)
+                          for doc_id, doc in index._docs.items()
+                          if any(doc_id in m for m in maps) and location in doc.location}
+                expected = sorted(scores.values(), reverse=True)[:5]
+                got = [scores[f"job:{r['id']}"] for r in index.search(query, 'job', 5, location)]
+                assert got == pytest.approx(expected)
+
+    def test_kinds_are_separate(self):
+        index = _index()
+        index.add('business:1', 'business', 'Cook Shop', {'name': 'Cook Shop'})
+        assert [r['name'] for r in index.search('cook', 'business')] == ['Cook Shop']
+        assert all('name' not in r for r in index.search('cook', 'job'))
+
+
+class TestSearchContext:
+    """Module-level lookup used by the chatbot"""
+
+    def test_none_until_built(self, monkeypatch):
+        monkeypatch.setattr(retrieval_index, 'retrieval_index', RetrievalIndex())
+        assert search_context('cook') is None
+
+    def test_formats_results(self, monkeypatch):
+        index = _index()
+        index.built_at = 1
+        monkeypatch.setattr(retrieval_index, 'retrieval_index', index)
+        context = _format_context(search_context('cook', location='virac'))
+        assert context.startswith('Relevant Jobs:\n- Line Cook at N/A')
+        assert 'Head Cook' not in context
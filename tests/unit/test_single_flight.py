@@ -0,0 +1,79 @@
+"""Unit tests for single-flight call coalescing"""
+
+import os
+import threading
+import time
+
+import pytest
+
+from single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    """Concurrent identical calls share one execution"""
+
+    def test_concurrent_callers_share_one_call(self):
+        flight = SingleFlight(timeout=5)
+        calls, results = [], []
+        started = threading.Event()
+
+        def work():
+            calls.append(1)
+            started.set()
+            time.sleep(0.2)
+            return 'answer'
+
+        def caller():
+            results.append(flight.do('k', work))
+
+        threads = [threading.Thread(target=caller) for _ in range(8)]
+        threads[0].start()
+        started.wait(1)
+        for thread in threads[1:]:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(calls) == 1
+        assert results == ['answer'] * 8
+        assert flight.stats()['shared'] == 7
+
+    def test_leader_error_reaches_waiters(self):
+        flight = SingleFlight(timeout=5)
+        started = threading.Event()
+        errors = []
+
+        def failing():
+            started.set()
+            time.sleep(0.1)
+            raise RuntimeError('boom')
+
+        def caller():
+            try:
+                flight.do('k', failing)
+            except RuntimeError as e:
+                errors.append(str(e))
+
+        threads = [threading.Thread(target=caller) for _ in range(3)]
+        threads[0].start()
+        started.wait(1)
+        for thread in threads[1:]:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert errors == ['boom'] * 3
+
+    def test_cross_worker_lock_rechecks_shared_result(self, tmp_path):
+        """A worker that waited on another's lock file uses the shared result"""
+        flight = SingleFlight(timeout=5, lock_dir=str(tmp_path))
+        lock = tmp_path / 'k.lock'
+        lock.touch()
+        threading.Timer(0.1, lock.unlink).start()
+        assert flight.do('k', lambda: pytest.fail('should not call'), recheck=lambda: 'shared') == 'shared'
+        assert not os.path.exists(lock)
+
+    def test_stale_lock_is_taken_over(self, tmp_path):
+        flight = SingleFlight(timeout=0.5, lock_dir=str(tmp_path))
+        lock = tmp_path / 'k.lock'
+        lock.touch()
+        os.utime(lock, (time.time() - 60, time.time() - 60))
+        assert flight.do('k', lambda: 'fresh', recheck=lambda: None) == 'fresh'
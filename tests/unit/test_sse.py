@@ -0,0 +1,79 @@
+"""Unit tests for Server-Sent Events streaming"""
+
+import json
+
+from flask import Flask
+
+from sse import GENERIC_ERROR, format_event, stream_generation, wants_event_stream
+
+
+class _UserFacingError(Exception):
+    pass
+
+
+def _events(response):
+    """Parse a streamed response body into (event, data) pairs"""
+    body = b''.join(response.iter_encoded()).decode('utf-8')
+    events = []
+    for block in body.strip().split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in block.split('\n') if not line.startswith(':'))
+        if fields:
+            events.append((fields.get('event'), json.loads(fields['data'])))
+    return events
+
+
+class TestEventStream:
+    """Token, done and error events"""
+
+    def test_format_event_keeps_newlines_in_json(self):
+        assert format_event({'text': 'a\nb'}, event='token') == 'event: token\ndata: {"text": "a\\nb"}\n\n'
+
+    def test_stream_request_detection(self):
+        app = Flask(__name__)
+        with app.test_request_context('/x?stream=1'):
+            assert wants_event_stream()
+        with app.test_request_context('/x', headers={'Accept': 'text/event-stream'}):
+            assert wants_event_stream()
+        with app.test_request_context('/x'):
+            assert not wants_event_stream()
+
+    def test_tokens_then_done_payload(self):
+        app = Flask(__name__)
+        with app.test_request_context('/x'):
+            response = stream_generation(iter(['Hel', 'lo']), finish=lambda text: {'analysis': text})
+            assert response.mimetype == 'text/event-stream'
+            assert _events(response) == [
+                ('token', {'text': 'Hel'}), ('token', {'text': 'lo'}), ('done', {'analysis': 'Hello'})
+            ]
+
+    def test_errors_only_expose_safe_messages(self):
+        def failing(error):
+            yield 'partial'
+            raise error
+
+        app = Flask(__name__)
+        with app.test_request_context('/x'):
+            shown = stream_generation(failing(_UserFacingError('Too many requests')), safe_errors=(_UserFacingError,))
+            hidden = stream_generation(failing(RuntimeError('bolt://internal')), safe_errors=(_UserFacingError,))
+            assert _events(shown)[-1] == ('error', {'status': 'error', 'error': 'Too many requests'})
+            assert _events(hidden)[-1] == ('error', {'status': 'error', 'error': GENERIC_ERROR})
+
+    def test_disconnect_closes_upstream(self):
+        """Closing the response (client went away) closes the chunk generator"""
+        closed = []
+
+        def chunks():
+            try:
+                yield 'a'
+                yield 'b'
+            finally:
+                closed.append(True)
+
+        app = Flask(__name__)
+        with app.test_request_context('/x'):
+            response = stream_generation(chunks())
+            body = iter(response.response)
+            next(body)
+            next(body)
+            response.close()
+        assert closed == [True]